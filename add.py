@@ -1,53 +1,556 @@
 #Imports
 import math
+from functools import lru_cache
+import numpy as np
+
+#@profiled times a function when VECTOR_PROFILE is set, otherwise it does nothing at all (see profiling.py)
+from profiling import profiled
+
+#Trig Lookup
+#The GUI only lets you type whole degrees, so the same 360 angles get their cos and sin worked out over and over.
+#Whole degrees come from a table instead, built with the exact same math, so the answers don't change at all.
+#The batch functions also wrap other whole degrees (like -90 or 720) into the table, which if anything is a tiny bit
+#more accurate. Set USE_TRIG_TABLE to False to always compute cos and sin from scratch.
+#Angles that aren't whole degrees can go through an LRU cache with USE_TRIG_CACHE. It is off by default because in
+#plain Python a cache lookup costs about as much as math.cos + math.sin, so it only pays off when the angles come in
+#as types that are slow to convert (like NumPy scalars) and repeat a lot. trig_cache_info() shows the hits and misses.
+#Batches only use the table from TRIG_TABLE_MIN_SIZE angles up. Checking for whole degrees costs a few passes over
+#the array plus the gather, which is more than small batches save on cos and sin.
+USE_TRIG_TABLE = True
+USE_TRIG_CACHE = False
+TRIG_CACHE_SIZE = 4096
+TRIG_TABLE_MIN_SIZE = 4096
+
+#Whole degree -> (cos, sin). A dict, because 45.0 and 45 (and np.float64(45)) all find the same entry
+_TRIG_TABLE = {degree: (math.cos(degree*(math.pi/180)), math.sin(degree*(math.pi/180))) for degree in range(360)}
+
+#Same table as arrays for the batch functions. Only for float64: NumPy's float32 cos and sin are already so fast that
+#looking them up is slower than computing them
+_COS_ARRAY = np.cos(np.deg2rad(np.arange(360, dtype=np.float64)))
+_SIN_ARRAY = np.sin(np.deg2rad(np.arange(360, dtype=np.float64)))
+
+@lru_cache(maxsize=TRIG_CACHE_SIZE)
+def _cached_cos_sin(angle_degree):
+    angle_radian = angle_degree*(math.pi/180)
+    return math.cos(angle_radian), math.sin(angle_radian)
+
+def _cos_sin(angle_degree):
+    #cos and sin of one angle in degrees
+    try:
+        cos_sin = _TRIG_TABLE.get(angle_degree) if USE_TRIG_TABLE else None
+    except TypeError: # Arrays can't be looked up
+        cos_sin = None
+    if cos_sin is not None:
+        return cos_sin
+    return _work_out_cos_sin(angle_degree)
+
+def _work_out_cos_sin(angle_degree):
+    #Anything that isn't in the table
+    if USE_TRIG_CACHE and isinstance(angle_degree, (int, float, np.floating)):
+        return _cached_cos_sin(angle_degree)
+    angle_radian = angle_degree*(math.pi/180)
+    return math.cos(angle_radian), math.sin(angle_radian)
+
+def _cos_sin_batch(angle_degrees):
+    #cos and sin of a whole float array of angles in degrees
+    if USE_TRIG_TABLE and angle_degrees.dtype == np.float64 and angle_degrees.size >= TRIG_TABLE_MIN_SIZE:
+        #Checking for whole degrees costs a few quick passes, computing cos and sin costs way more.
+        #min/max are NaN if there is a NaN, which fails the range check just like infinity does
+        lowest, highest = angle_degrees.min(), angle_degrees.max()
+        if -2**31 < lowest and highest < 2**31:
+            index = angle_degrees.astype(np.int32)
+            if (index == angle_degrees).all():
+                if lowest < 0 or highest >= 360:
+                    index %= 360
+                return _COS_ARRAY[index], _SIN_ARRAY[index]
+    angle_radians = np.deg2rad(angle_degrees)
+    return np.cos(angle_radians), np.sin(angle_radians)
+
+def trig_cache_info():
+    #Hits, misses, maxsize and currsize of the cache for angles that aren't whole degrees
+    return _cached_cos_sin.cache_info()
+
+def clear_trig_cache():
+    _cached_cos_sin.cache_clear()
 
 #Starting Message
 # print("Welcome to the PhysVEK Calculator")
 # mode_selection= int(input("Select an option by inputting a number\n1. 2-D Vector Addition\n2. Speed Calculation\n3. Quit\n"))
 
 #Vector Addition Functions (hey, that's our main goal here!)
+@profiled
 def vector_fission(angle_degree,initial_vector_magnitude):
     #SOHCAHTOA
-    #Python doesn't like degrees, we must convert it into radians
-    angle_radian = angle_degree*(math.pi/180)
+    #Whole degrees are looked up (see Trig Lookup at the top). This is the hot path, so the lookup is done right here
+    try:
+        cos_sin = _TRIG_TABLE.get(angle_degree) if USE_TRIG_TABLE else None
+    except TypeError: # Arrays can't be looked up
+        cos_sin = None
+    if cos_sin is None:
+        if USE_TRIG_CACHE:
+            cos_sin = _work_out_cos_sin(angle_degree)
+        else:
+            #Python doesn't like degrees, we must convert it into radians
+            angle_radian = angle_degree*(math.pi/180)
+            return math.cos(angle_radian)*initial_vector_magnitude, math.sin(angle_radian)*initial_vector_magnitude
     #Let's find X
-    x_value = math.cos(angle_radian)*initial_vector_magnitude
+    x_value = cos_sin[0]*initial_vector_magnitude
     #Then Y
-    y_value = math.sin(angle_radian)*initial_vector_magnitude
+    y_value = cos_sin[1]*initial_vector_magnitude
     return x_value, y_value
+@profiled
 def vector_addition(x_value_list,y_value_list):
     #To get the X(resultant) and Y(resultant), we need to add all of the x and y values together
     x_value_resultant= sum(x_value_list)
     y_value_resultant= sum(y_value_list)
-    #Arctan
-    resultant_angle_radians= math.atan(y_value_resultant/x_value_resultant)
-    #Angle Adjustment Thingy for Quadrants
-    if x_value_resultant > 0 and y_value_resultant > 0: #Quadrant 1
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)
-    if x_value_resultant < 0 and y_value_resultant > 0: #Quadrant 2
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)+180
-    if x_value_resultant < 0 and y_value_resultant < 0: #Quadrant 3
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)+180
-    if x_value_resultant > 0 and y_value_resultant < 0: #Quadrant 4
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)+360
-    if x_value_resultant > 0 and y_value_resultant == 0: #East Axis
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)
-    if x_value_resultant == 0 and y_value_resultant > 0: #North Axis
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)
-    if x_value_resultant < 0 and y_value_resultant == 0: #West Axis
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)+180
-    if x_value_resultant == 0 and y_value_resultant < 0: #South Axis
-        resultant_angle_degree= resultant_angle_radians*(180/math.pi)+360
-    #Pythagorean Theorem Time!
-    resultant_magnitude= math.sqrt((x_value_resultant**2)+(y_value_resultant**2))
+    #Arctan and Pythagorean Theorem, see resultant_angle_magnitude for how the quadrants are handled
+    return _resultant_scalar(x_value_resultant, y_value_resultant)
+
+#Resultant Engine
+#atan2 looks at the signs of both X and Y, so it already knows the quadrant (and the axes) without any if statements.
+#It returns (-180, 180], we shift that into [0, 360) with a modulo. The second modulo catches tiny negative
+#angles like -1e-20 that round up to exactly 360.
+#The zero vector has no direction, so we define its angle as 0 degrees (magnitude 0). Adding 0.0 turns -0.0 into 0.0,
+#otherwise atan2(-0.0, -0.0) would say 180 degrees.
+def _resultant_scalar(x_value_resultant, y_value_resultant):
+    x_value_resultant = float(x_value_resultant) + 0.0
+    y_value_resultant = float(y_value_resultant) + 0.0
+    resultant_angle_degree = math.degrees(math.atan2(y_value_resultant, x_value_resultant)) % 360.0 % 360.0
+    resultant_magnitude = math.hypot(x_value_resultant, y_value_resultant)
     return resultant_angle_degree, resultant_magnitude
 
+def resultant_angle_magnitude(x_value_resultant, y_value_resultant):
+    #Same as above but elementwise, so it works on whole arrays of resultants at once
+    x_value_resultant = np.asarray(x_value_resultant) + 0.0
+    y_value_resultant = np.asarray(y_value_resultant) + 0.0
+    resultant_angle_degree = np.mod(np.mod(np.rad2deg(np.arctan2(y_value_resultant, x_value_resultant)), 360.0), 360.0)
+    resultant_magnitude = np.hypot(x_value_resultant, y_value_resultant)
+    return resultant_angle_degree, resultant_magnitude
+
+#Batch Vector Functions (same math as above, but NumPy does the looping for us)
+#Useful when there are thousands of vectors, calling the functions above one by one is way too slow
+def _as_float_array(values):
+    #Keeps float32/float64 as they are, everything else (ints, lists) becomes float64
+    array = np.asarray(values)
+    if not np.issubdtype(array.dtype, np.floating):
+        array = array.astype(np.float64)
+    return array
+
+@profiled
+def vector_fission_batch(angle_degrees, magnitudes=None):
+    #Takes an array of angles and an array of magnitudes, or one N x 2 array of (angle, magnitude) rows
+    if magnitudes is None:
+        pairs = _as_float_array(angle_degrees)
+        if pairs.ndim != 2 or pairs.shape[1] != 2:
+            raise ValueError('Expected an N x 2 array of (angle, magnitude) rows')
+        angle_degrees = pairs[:, 0]
+        magnitudes = pairs[:, 1]
+    angle_degrees = _as_float_array(angle_degrees)
+    magnitudes = _as_float_array(magnitudes)
+    if angle_degrees.shape != magnitudes.shape:
+        raise ValueError('Angles and magnitudes must have the same shape')
+    #SOHCAHTOA, for every vector at once
+    cos_values, sin_values = _cos_sin_batch(angle_degrees)
+    x_values = cos_values * magnitudes
+    y_values = sin_values * magnitudes
+    return x_values, y_values
+
+#Summation modes for adding up the components
+#fast: NumPy's pairwise sum. Quick, and good enough unless huge and tiny loads almost cancel out
+#compensated: pairwise sum that also keeps the rounding error of every addition (TwoSum) and adds it back at the end
+#exact: math.fsum, the correctly rounded sum. Slowest, runs in plain Python
+SUMMATION_MODES = ('fast', 'compensated', 'exact')
+
+def _compensated_sum(values):
+    total, error_total = _compensated_sum_parts(values)
+    return float(total + error_total)
+
+def _compensated_sum_parts(values):
+    #The rounded pairwise sum and the rounding error that went missing on the way, kept apart
+    #(ResultantAccumulator puts the error into its own error terms, so nothing gets rounded away)
+    values = np.asarray(values, dtype=np.float64)
+    error_total = 0.0
+    #Add neighbours together level by level, like a tournament bracket
+    while len(values) > 1:
+        paired = len(values) // 2 * 2
+        a = values[0:paired:2]
+        b = values[1:paired:2]
+        leftover = values[paired:] # The odd one out waits for the next level
+        total = a + b
+        #TwoSum: exactly what got rounded away when doing a + b
+        b_virtual = total - a
+        error = (a - (total - b_virtual)) + (b - b_virtual)
+        error_total += np.sum(error)
+        values = np.concatenate((total, leftover))
+    if len(values) == 0:
+        return 0.0, 0.0
+    return float(values[0]), float(error_total)
+
+@profiled
+def component_sum(values, precision='fast'):
+    if precision == 'fast':
+        return np.sum(values)
+    if precision == 'compensated':
+        return _compensated_sum(values)
+    if precision == 'exact':
+        return math.fsum(values)
+    raise ValueError(f'Unknown precision {precision!r}, expected one of {SUMMATION_MODES}')
+
+def _segment_sums(values, offsets, precision='fast'):
+    #Offsets work like CSR offsets: problem i owns values[offsets[i]:offsets[i + 1]]
+    counts = np.diff(offsets)
+    if precision != 'fast':
+        sums = [component_sum(values[start:end], precision) for start, end in zip(offsets[:-1], offsets[1:])]
+        return np.array(sums, dtype=np.float64)
+    sums = np.zeros(len(counts), dtype=values.dtype)
+    nonempty = counts > 0
+    #reduceat can't handle empty segments, so those just stay at 0
+    if nonempty.any():
+        sums[nonempty] = np.add.reduceat(values, offsets[:-1][nonempty])
+    return sums
+
+def _check_offsets(offsets, length):
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if offsets.ndim != 1 or len(offsets) < 1:
+        raise ValueError('Offsets must be a 1-D array with at least one entry')
+    if offsets[0] != 0 or offsets[-1] != length:
+        raise ValueError('Offsets must start at 0 and end at the number of vectors')
+    if np.any(np.diff(offsets) < 0):
+        raise ValueError('Offsets must be non-decreasing')
+    return offsets
+
+@profiled
+def vector_addition_batch(x_values, y_values, offsets=None, precision='fast'):
+    #Without offsets everything is one problem and plain floats come back
+    #With offsets every segment is its own problem and arrays of angles and magnitudes come back
+    #precision picks the summation mode, see SUMMATION_MODES
+    x_values = _as_float_array(x_values)
+    y_values = _as_float_array(y_values)
+    if x_values.shape != y_values.shape or x_values.ndim != 1:
+        raise ValueError('X and Y values must be 1-D arrays of the same length')
+    if offsets is None:
+        return _resultant_scalar(component_sum(x_values, precision), component_sum(y_values, precision))
+    offsets = _check_offsets(offsets, len(x_values))
+    return resultant_angle_magnitude(_segment_sums(x_values, offsets, precision), _segment_sums(y_values, offsets, precision))
+
+@profiled
+def resolve_vectors(angle_degrees, magnitudes=None, offsets=None, precision='fast'):
+    #Fission and addition in one go. Same arguments as vector_fission_batch plus the optional offsets and precision
+    x_values, y_values = vector_fission_batch(angle_degrees, magnitudes)
+    return vector_addition_batch(np.ravel(x_values), np.ravel(y_values), offsets, precision)
+
+#Partial Sums
+#Inputs too big for memory (and the shards of them that other cores add up, see parallel.py) are added a chunk at a
+#time: every chunk turns into one (x, y) partial sum, and the partial sums are added exactly at the end. cli.py,
+#vecfile.py and parallel.py all go through these two functions, so the answer doesn't depend on who added which chunk
+def chunk_partials(chunks, precision='fast', polar=True):
+    #chunks: (angles, magnitudes) column pairs, or (x, y) components when polar is False. Returns a list of (x, y)
+    partials = []
+    for first, second in chunks:
+        if polar:
+            first, second = vector_fission_batch(first, second)
+        partials.append((float(component_sum(first, precision)), float(component_sum(second, precision))))
+    return partials
+
+def combine_partials(partials):
+    #(angle, magnitude) of a list of (x, y) partial sums. There are few of them, so adding them exactly is basically free
+    return vector_addition_batch([x for x, _ in partials], [y for _, y in partials], precision='exact')
+
+#3-D Vectors
+#A 3-D vector is a magnitude plus two angles: the azimuth is the same angle as in 2-D (counterclockwise from +X in the
+#XY plane) and the elevation tilts it up towards +Z (-90 to 90 degrees). With an elevation of 0 everything below gives
+#exactly the 2-D answer with Z = 0, so the 2-D functions above are just the fast special case.
+#Results come back as (azimuth, elevation, magnitude), the 3-D version of (angle, magnitude).
+def vector_fission_3d(azimuth_degree, elevation_degree, magnitude):
+    #Split into the part in the XY plane and the part along Z, then split the XY part like in 2-D
+    cos_elevation, sin_elevation = _cos_sin(elevation_degree)
+    x_value, y_value = vector_fission(azimuth_degree, cos_elevation * magnitude)
+    z_value = sin_elevation * magnitude
+    return x_value, y_value, z_value
+
+def vector_addition_3d(x_value_list, y_value_list, z_value_list):
+    return _resultant_3d_scalar(sum(x_value_list), sum(y_value_list), sum(z_value_list))
+
+def _resultant_3d_scalar(x_value_resultant, y_value_resultant, z_value_resultant):
+    #Azimuth and the length in the XY plane are the 2-D resultant. The elevation is the angle between that and Z,
+    #atan2 keeps it right even for straight up/down vectors. The zero vector gets azimuth and elevation 0
+    azimuth_degree, plane_magnitude = _resultant_scalar(x_value_resultant, y_value_resultant)
+    z_value_resultant = float(z_value_resultant) + 0.0
+    elevation_degree = math.degrees(math.atan2(z_value_resultant, plane_magnitude))
+    return azimuth_degree, elevation_degree, math.hypot(plane_magnitude, z_value_resultant)
+
+def resultant_direction_3d(x_value_resultant, y_value_resultant, z_value_resultant):
+    #Same as above but elementwise
+    azimuth_degrees, plane_magnitudes = resultant_angle_magnitude(x_value_resultant, y_value_resultant)
+    z_value_resultant = np.asarray(z_value_resultant) + 0.0
+    elevation_degrees = np.rad2deg(np.arctan2(z_value_resultant, plane_magnitudes))
+    return azimuth_degrees, elevation_degrees, np.hypot(plane_magnitudes, z_value_resultant)
+
+def direction_angles(x_values, y_values, z_values):
+    #Coordinate direction angles (alpha, beta, gamma): the angle between the vector and the X, Y and Z axes, the way
+    #statics books give a force. Their cosines are the direction cosines. The zero vector gets 90 degrees to every axis
+    x_values, y_values, z_values = (np.asarray(values, dtype=np.float64) for values in (x_values, y_values, z_values))
+    magnitudes = np.hypot(np.hypot(x_values, y_values), z_values)
+    safe_magnitudes = np.where(magnitudes > 0, magnitudes, 1.0)
+    #clip stops rounding (like 1.0000000000000002) from giving arccos a NaN
+    return tuple(np.rad2deg(np.arccos(np.clip(values / safe_magnitudes, -1.0, 1.0))) for values in (x_values, y_values, z_values))
+
+@profiled
+def vector_fission_3d_batch(azimuth_degrees, elevation_degrees=None, magnitudes=None):
+    #Takes arrays of azimuths, elevations and magnitudes, or one N x 3 array of (azimuth, elevation, magnitude) rows
+    if elevation_degrees is None and magnitudes is None:
+        rows = _as_float_array(azimuth_degrees)
+        if rows.ndim != 2 or rows.shape[1] != 3:
+            raise ValueError('Expected an N x 3 array of (azimuth, elevation, magnitude) rows')
+        azimuth_degrees, elevation_degrees, magnitudes = rows[:, 0], rows[:, 1], rows[:, 2]
+    elevation_degrees = _as_float_array(elevation_degrees)
+    magnitudes = _as_float_array(magnitudes)
+    if elevation_degrees.shape != magnitudes.shape:
+        raise ValueError('Azimuths, elevations and magnitudes must have the same shape')
+    cos_elevations, sin_elevations = _cos_sin_batch(elevation_degrees)
+    x_values, y_values = vector_fission_batch(azimuth_degrees, cos_elevations * magnitudes)
+    z_values = sin_elevations * magnitudes
+    return x_values, y_values, z_values
+
+def direction_cosine_fission(direction_cosines, magnitudes):
+    #Components from an N x 3 array of direction cosines (cos alpha, cos beta, cos gamma) and N magnitudes
+    #The rows are normalised first, so any vector pointing the right way works too (like the 3, 4, 12 from a drawing)
+    direction_cosines = _as_float_array(direction_cosines)
+    if direction_cosines.ndim != 2 or direction_cosines.shape[1] != 3:
+        raise ValueError('Expected an N x 3 array of direction cosines')
+    lengths = np.linalg.norm(direction_cosines, axis=1)
+    if np.any(lengths == 0):
+        raise ValueError('A direction of (0, 0, 0) has no direction')
+    magnitudes = _as_float_array(magnitudes)
+    if magnitudes.shape != lengths.shape:
+        raise ValueError('Expected one magnitude per row of direction cosines')
+    components = direction_cosines * (magnitudes / lengths)[:, np.newaxis]
+    return components[:, 0], components[:, 1], components[:, 2]
+
+@profiled
+def vector_addition_3d_batch(x_values, y_values, z_values, offsets=None, precision='fast'):
+    #Like vector_addition_batch with a Z column. Returns (azimuth, elevation, magnitude),
+    #plain floats without offsets and arrays with offsets
+    columns = [_as_float_array(values) for values in (x_values, y_values, z_values)]
+    if any(column.shape != columns[0].shape for column in columns) or columns[0].ndim != 1:
+        raise ValueError('X, Y and Z values must be 1-D arrays of the same length')
+    if offsets is None:
+        return _resultant_3d_scalar(*(component_sum(column, precision) for column in columns))
+    offsets = _check_offsets(offsets, len(columns[0]))
+    return resultant_direction_3d(*(_segment_sums(column, offsets, precision) for column in columns))
+
+@profiled
+def resolve_vectors_3d(azimuth_degrees, elevation_degrees=None, magnitudes=None, offsets=None, precision='fast'):
+    #Fission and addition in one go. Same arguments as vector_fission_3d_batch plus the optional offsets and precision
+    components = vector_fission_3d_batch(azimuth_degrees, elevation_degrees, magnitudes)
+    return vector_addition_3d_batch(*(np.ravel(values) for values in components), offsets, precision)
+
+#Running Resultant
+#Keeps the X and Y sums up to date as vectors come and go, so nothing ever has to be summed again from scratch.
+#Vectors added with a key can later be updated or removed in O(1). Vectors fed through consume/extend are anonymous:
+#only the sums remember them, so an endless stream uses constant memory.
+#The sums are Neumaier compensated, otherwise adding and removing the same vector over and over slowly drifts.
+class ResultantAccumulator:
+    def __init__(self):
+        self.components = {} # key -> (x, y) of the vectors that can still be updated/removed
+        self.count = 0 # every vector in the sum, keyed and anonymous
+        self._next_key = 0
+        self._x_sum = 0.0
+        self._x_error = 0.0
+        self._y_sum = 0.0
+        self._y_error = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def _accumulate(self, x_value, y_value):
+        #Neumaier: keep what rounding throws away in a separate error term
+        total = self._x_sum + x_value
+        if abs(self._x_sum) >= abs(x_value):
+            self._x_error += (self._x_sum - total) + x_value
+        else:
+            self._x_error += (x_value - total) + self._x_sum
+        self._x_sum = total
+
+        total = self._y_sum + y_value
+        if abs(self._y_sum) >= abs(y_value):
+            self._y_error += (self._y_sum - total) + y_value
+        else:
+            self._y_error += (y_value - total) + self._y_sum
+        self._y_sum = total
+
+    def _accumulate_batch(self, x_values, y_values):
+        #A whole array at once. The rounding error of the batch sum goes into the error terms too, so the batch
+        #counts exactly like adding its vectors one by one and a later update/remove of one of them cancels out
+        x_total, x_error = _compensated_sum_parts(x_values)
+        y_total, y_error = _compensated_sum_parts(y_values)
+        self._accumulate(x_total, y_total)
+        self._x_error += x_error
+        self._y_error += y_error
+
+    def add(self, angle_degree, magnitude, key=None):
+        #Returns the key, which is needed to update or remove the vector later
+        if key is None:
+            key = self._next_key
+            self._next_key += 1
+        if key in self.components:
+            raise KeyError(f'Vector {key!r} is already in the accumulator')
+        x_value, y_value = vector_fission(angle_degree, magnitude)
+        self.components[key] = (x_value, y_value)
+        self._accumulate(x_value, y_value)
+        self.count += 1
+        return key
+
+    @profiled
+    def add_many(self, keys, angle_degrees, magnitudes):
+        #Keyed batch: one key per vector. Much faster than calling add in a loop
+        keys = list(keys)
+        x_values, y_values = vector_fission_batch(angle_degrees, magnitudes)
+        if len(keys) != x_values.size:
+            raise ValueError(f'Got {len(keys)} keys for {x_values.size} vectors, add_many needs one key per vector')
+        x_values, y_values = np.ravel(x_values), np.ravel(y_values)
+        new_components = dict(zip(keys, zip(x_values.tolist(), y_values.tolist())))
+        if len(new_components) != len(keys) or not self.components.keys().isdisjoint(new_components):
+            raise KeyError('Keys must be unique and not already in the accumulator')
+        self.components.update(new_components)
+        self._accumulate_batch(x_values, y_values)
+        self.count += len(keys)
+
+    def remove(self, key):
+        x_value, y_value = self.components.pop(key)
+        self._accumulate(-x_value, -y_value)
+        self.count -= 1
+
+    def update(self, key, angle_degree, magnitude):
+        old_x, old_y = self.components[key]
+        x_value, y_value = vector_fission(angle_degree, magnitude)
+        self.components[key] = (x_value, y_value)
+        #Take the old one out and put the new one in as two steps, a single difference would get rounded
+        self._accumulate(-old_x, -old_y)
+        self._accumulate(x_value, y_value)
+
+    def extend(self, angle_degrees, magnitudes=None):
+        #Anonymous batch, same arguments as vector_fission_batch
+        x_values, y_values = vector_fission_batch(angle_degrees, magnitudes)
+        self._accumulate_batch(np.ravel(x_values), np.ravel(y_values))
+        self.count += x_values.size
+
+    def consume(self, vectors):
+        #vectors can be any iterable (even a never ending generator) of (angle, magnitude) pairs or N x 2 chunks
+        for item in vectors:
+            if isinstance(item, np.ndarray) and item.ndim == 2:
+                self.extend(item)
+            else:
+                angle_degree, magnitude = item
+                self._accumulate(*vector_fission(angle_degree, magnitude))
+                self.count += 1
+        return self
+
+    def clear(self):
+        self.__init__()
+
+    def components_sum(self):
+        return self._x_sum + self._x_error, self._y_sum + self._y_error
+
+    def resultant(self):
+        #(angle, magnitude) of everything added so far
+        return _resultant_scalar(*self.components_sum())
+
 #Speed Calculation Function (extra useless features!)
 def speed_calculation(vector_magnitude,starting_time,ending_time):
     deltaT= ending_time-starting_time
     speed= vector_magnitude/deltaT
     return speed
 
+#Time Series Speed
+#Same idea as speed_calculation, but for a whole logged trajectory in one go: N displacement vectors and N + 1
+#timestamps, displacement i happened between timestamps[i] and timestamps[i + 1]. NumPy does every interval at once,
+#so millions of samples are fine. An interval of zero length (two samples with the same timestamp) has no speed, so
+#it gives NaN instead of dividing by zero. Timestamps can be numbers (seconds) or datetime64.
+def _as_seconds(timestamps):
+    timestamps = np.asarray(timestamps)
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        #Seconds since the first sample, so the big epoch numbers never get near the float rounding
+        if len(timestamps) == 0:
+            return np.empty(0)
+        return (timestamps - timestamps[0]) / np.timedelta64(1, 's')
+    return timestamps.astype(np.float64)
+
+def _safe_divide(values, intervals):
+    #values / intervals, NaN wherever the interval is 0
+    return np.divide(values, intervals, out=np.full(len(values), np.nan), where=intervals != 0)
+
+def _sample_velocities(velocities, intervals):
+    #Velocity at every timestamp from the intervals on both sides of it, with the shorter (closer) interval counting
+    #more. That is the same as np.gradient with uneven spacing, except that a zero length interval just gets skipped
+    #instead of making everything around it NaN. The first and last timestamps only have one side
+    samples = np.full(len(velocities) + 1, np.nan)
+    if len(velocities) == 0:
+        return samples
+    left, right = velocities[:-1], velocities[1:]
+    left_intervals, right_intervals = intervals[:-1], intervals[1:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        both = (right_intervals * left + left_intervals * right) / (left_intervals + right_intervals)
+    left_valid = left_intervals != 0
+    samples[1:-1] = np.where(left_valid & (right_intervals != 0), both, np.where(left_valid, left, right))
+    samples[0] = velocities[0]
+    samples[-1] = velocities[-1]
+    return samples
+
+def _motion(x_displacements, y_displacements, timestamps):
+    timestamps = _as_seconds(timestamps)
+    if x_displacements.ndim != 1 or timestamps.shape != (len(x_displacements) + 1,):
+        raise ValueError('Expected N displacements and N + 1 timestamps')
+    intervals = np.diff(timestamps)
+    if np.any(intervals < 0):
+        raise ValueError('Timestamps must not go backwards')
+    distances = np.hypot(x_displacements, y_displacements)
+    velocity_x = _safe_divide(x_displacements, intervals)
+    velocity_y = _safe_divide(y_displacements, intervals)
+    instantaneous_x = _sample_velocities(velocity_x, intervals)
+    instantaneous_y = _sample_velocities(velocity_y, intervals)
+
+    #Averages over the whole trip: distance travelled / time for the speed, and where it ended up / time for the
+    #velocity (so a round trip has an average velocity of 0 but not an average speed of 0)
+    total_time = float(timestamps[-1] - timestamps[0]) if len(intervals) else 0.0
+    net_angle, net_displacement = _resultant_scalar(np.sum(x_displacements), np.sum(y_displacements))
+    if total_time > 0:
+        average_speed = float(np.sum(distances)) / total_time
+        average_velocity = (net_angle, net_displacement / total_time)
+    else:
+        average_speed = math.nan
+        average_velocity = (net_angle, math.nan)
+    return {
+        'intervals': intervals,
+        'distances': distances,
+        'speeds': _safe_divide(distances, intervals),
+        'velocity_x': velocity_x,
+        'velocity_y': velocity_y,
+        'average_speed': average_speed,
+        'average_velocity': average_velocity, # (angle, magnitude)
+        'instantaneous_velocity_x': instantaneous_x, # at every timestamp
+        'instantaneous_velocity_y': instantaneous_y,
+        'instantaneous_speeds': np.hypot(instantaneous_x, instantaneous_y),
+    }
+
+@profiled
+def motion_time_series(angle_degrees, magnitudes, timestamps):
+    #N displacement vectors as (angle, magnitude) and N + 1 timestamps. Returns a dict of NumPy arrays:
+    #per interval (N values): intervals, distances, speeds, velocity_x, velocity_y
+    #per timestamp (N + 1 values): instantaneous_velocity_x, instantaneous_velocity_y, instantaneous_speeds
+    #and average_speed plus average_velocity (angle, magnitude) for the whole thing
+    x_displacements, y_displacements = vector_fission_batch(angle_degrees, magnitudes)
+    return _motion(np.ravel(x_displacements).astype(np.float64), np.ravel(y_displacements).astype(np.float64), timestamps)
+
+@profiled
+def trajectory_time_series(x_positions, y_positions, timestamps):
+    #Same results from a log of N positions and their N timestamps (the displacements are the steps between them)
+    x_positions = np.asarray(x_positions, dtype=np.float64)
+    y_positions = np.asarray(y_positions, dtype=np.float64)
+    if x_positions.shape != y_positions.shape or x_positions.ndim != 1:
+        raise ValueError('X and Y positions must be 1-D arrays of the same length')
+    return _motion(np.diff(x_positions), np.diff(y_positions), timestamps)
+
 #List of X and Y values
 x_value_list= []
 y_value_list= []
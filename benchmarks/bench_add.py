@@ -0,0 +1,177 @@
+# Micro-benchmarks for the math in add.py
+# Every kernel is timed on sizes from 2 up to 10^7 vectors, with float32 and float64 arrays for the NumPy paths and
+# plain Python lists for the original one-vector-at-a-time functions. Throughput is reported in vectors per second.
+#
+# Kernels:
+#   fission   python: vector_fission in a loop                 numpy: vector_fission_batch
+#   addition  python: vector_addition on lists                 numpy: vector_addition_batch
+#   speed     python: speed_calculation in a loop              numpy: speed_calculation on whole arrays
+#   resolve   python: vector_fission loop + vector_addition    numpy: resolve_vectors
+#
+# Run from the repository root:
+#   python benchmarks/bench_add.py                            compare with benchmarks/baselines/add.json
+#   python benchmarks/bench_add.py --max-size 100000 --json -  quick run, JSON on stdout
+#   python benchmarks/bench_add.py --save-baseline            store this run as the new baseline
+# Exits with 1 if the throughput of something dropped by more than --tolerance against the baseline.
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from add import resolve_vectors, speed_calculation, vector_addition, vector_addition_batch, vector_fission, \
+        vector_fission_batch
+from harness import environment, find_regressions, load_baseline, peak_rss_mb, percentile, save_baseline, write_json
+
+BASELINE_NAME = 'add'
+DEFAULT_SIZES = [2, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+DTYPES = {'float32': np.float32, 'float64': np.float64}
+MINIMUM_TIME = 0.2 # Seconds of timed runs per case, small sizes get repeated until they add up to this
+
+
+def make_inputs(size, dtype, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = rng.uniform(0, 360, size).astype(dtype)
+    magnitudes = rng.uniform(0, 1000, size).astype(dtype)
+    starts = rng.uniform(0, 10, size).astype(dtype)
+    ends = (starts + rng.uniform(0.5, 10, size)).astype(dtype)
+    return angles, magnitudes, starts, ends
+
+
+# Each kernel takes the inputs and returns a function that does the work once. Whatever the function doesn't time
+# (converting to lists, splitting components) happens before it is returned
+
+def python_fission(angles, magnitudes, starts, ends):
+    angles, magnitudes = angles.tolist(), magnitudes.tolist()
+    return lambda: [vector_fission(angle, magnitude) for angle, magnitude in zip(angles, magnitudes)]
+
+
+def numpy_fission(angles, magnitudes, starts, ends):
+    return lambda: vector_fission_batch(angles, magnitudes)
+
+
+def python_addition(angles, magnitudes, starts, ends):
+    x_values, y_values = (values.tolist() for values in vector_fission_batch(angles, magnitudes))
+    return lambda: vector_addition(x_values, y_values)
+
+
+def numpy_addition(angles, magnitudes, starts, ends):
+    x_values, y_values = vector_fission_batch(angles, magnitudes)
+    return lambda: vector_addition_batch(x_values, y_values)
+
+
+def python_speed(angles, magnitudes, starts, ends):
+    magnitudes, starts, ends = magnitudes.tolist(), starts.tolist(), ends.tolist()
+    return lambda: [speed_calculation(magnitude, start, end) for magnitude, start, end in zip(magnitudes, starts, ends)]
+
+
+def numpy_speed(angles, magnitudes, starts, ends):
+    return lambda: speed_calculation(magnitudes, starts, ends)
+
+
+def python_resolve(angles, magnitudes, starts, ends):
+    angles, magnitudes = angles.tolist(), magnitudes.tolist()
+    def resolve():
+        components = [vector_fission(angle, magnitude) for angle, magnitude in zip(angles, magnitudes)]
+        return vector_addition([x for x, _ in components], [y for _, y in components])
+    return resolve
+
+
+def numpy_resolve(angles, magnitudes, starts, ends):
+    return lambda: resolve_vectors(angles, magnitudes)
+
+
+KERNELS = {
+    'fission': {'python': python_fission, 'numpy': numpy_fission},
+    'addition': {'python': python_addition, 'numpy': numpy_addition},
+    'speed': {'python': python_speed, 'numpy': numpy_speed},
+    'resolve': {'python': python_resolve, 'numpy': numpy_resolve},
+}
+
+
+# Runs function until at least MINIMUM_TIME has been spent (and at least min_repeats times)
+def time_kernel(function, min_repeats):
+    durations = []
+    total = 0.0
+    while len(durations) < min_repeats or total < MINIMUM_TIME:
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+        total += durations[-1]
+    return durations
+
+
+def run_benchmarks(kernels, paths, dtypes, sizes, python_max_size, min_repeats, log=sys.stdout):
+    results = {}
+    for size in sizes:
+        for dtype_name in dtypes:
+            inputs = make_inputs(size, DTYPES[dtype_name])
+            for kernel in kernels:
+                for path in paths:
+                    # The Python path works on lists of Python floats, so float32 vs float64 makes no difference there
+                    if path == 'python' and (dtype_name != 'float64' or size > python_max_size):
+                        continue
+                    durations = time_kernel(KERNELS[kernel][path](*inputs), min_repeats)
+                    # Throughput comes from the fastest run, like timeit. The slower runs are mostly other things
+                    # happening on the machine, which makes the median of tiny sizes jump around a lot
+                    best = min(durations)
+                    name = f'{kernel}/{path}/{"list" if path == "python" else dtype_name}/{size}'
+                    results[name] = {
+                        'kernel': kernel,
+                        'path': path,
+                        'dtype': 'float' if path == 'python' else dtype_name,
+                        'size': size,
+                        'repeats': len(durations),
+                        'best_s': best,
+                        'median_s': percentile(durations, 0.5),
+                        'vectors_per_sec': size / best,
+                    }
+                    print(f'{name:<36} {best * 1e6:>14.1f} us {size / best:>16,.0f} vectors/s', file=log)
+            del inputs
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for the math in add.py')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='numbers of vectors to time')
+    parser.add_argument('--max-size', type=int, help='skip the sizes above this')
+    parser.add_argument('--python-max-size', type=int, default=1_000_000,
+            help='largest size for the pure Python path, which takes seconds per run at 10^7 (default: 1000000)')
+    parser.add_argument('--kernels', nargs='+', choices=list(KERNELS), default=list(KERNELS))
+    parser.add_argument('--paths', nargs='+', choices=['python', 'numpy'], default=['python', 'numpy'])
+    parser.add_argument('--dtypes', nargs='+', choices=list(DTYPES), default=list(DTYPES))
+    parser.add_argument('--repeats', type=int, default=3, help='fewest timed runs per case (default: 3)')
+    parser.add_argument('--json', help="write the results as JSON to this file ('-' for stdout)")
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed drop in throughput against the baseline (default: 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    # With JSON on stdout the progress table goes to stderr
+    log = sys.stderr if args.json == '-' else sys.stdout
+    sizes = [size for size in args.sizes if args.max_size is None or size <= args.max_size]
+    results = {
+        'suite': BASELINE_NAME,
+        'environment': dict(environment(), numpy=np.__version__),
+        'benchmarks': run_benchmarks(args.kernels, args.paths, args.dtypes, sizes, args.python_max_size, args.repeats,
+                log),
+    }
+    results['peak_rss_mb'] = peak_rss_mb()
+
+    if args.json:
+        write_json(results, args.json)
+    if args.save_baseline:
+        save_baseline(BASELINE_NAME, results)
+        print('Saved as the new baseline', file=sys.stderr)
+        return 0
+
+    regressions = find_regressions(results, load_baseline(BASELINE_NAME), metric='vectors_per_sec',
+            tolerance=args.tolerance, lower_is_better=False)
+    for message in regressions:
+        print(f'SLOWER: {message}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
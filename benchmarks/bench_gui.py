@@ -0,0 +1,135 @@
+# Latency of the main window operations, run without a screen (QT_QPA_PLATFORM=offscreen)
+# Times window construction, add_vector, duplicate_vector, delete_vector, select_all_vectors, calculate_vector and
+# plot_vector, each followed by processing the events it caused (repaints etc.), and reports p50/p90/p99 and peak RSS.
+#
+# Run from the repository root:
+#   python benchmarks/bench_gui.py                     compare with benchmarks/baselines/gui.json
+#   python benchmarks/bench_gui.py --save-baseline     store this run as the new baseline
+#   python benchmarks/bench_gui.py --json results.json
+# Exits with 1 if the p50 of something is more than --tolerance (plus 1 ms) slower than the baseline.
+import argparse
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from harness import (environment, find_regressions, load_baseline, peak_rss_mb, save_baseline, summarize, time_calls,
+        write_json)
+
+BASELINE_NAME = 'gui'
+SLACK_MS = 1.0 # Differences smaller than this are timer and scheduler noise
+
+
+# Replaces all the vectors of the window in one go
+def fill(window, rows, checked=None, seed=0):
+    rng = np.random.default_rng(seed)
+    store = window.vector_store
+    window.vector_model.beginResetModel()
+    store.clear()
+    store.insert(None, rng.integers(1, 1000, rows).astype(float), rng.integers(0, 360, rows).astype(float))
+    if checked is not None:
+        store.checked[:] = checked
+    window.vector_model.endResetModel()
+
+
+def run_benchmarks(app, rows, repeats):
+    from gui.main_window import Application
+
+    results = {}
+
+    def settle(function):
+        def run():
+            function()
+            app.processEvents()
+        return run
+
+    # Window construction, until the graph is loaded and everything is drawn
+    windows = []
+    def construct():
+        window = Application()
+        app.processEvents()
+        window.init_graph()
+        app.processEvents()
+        windows.append(window)
+    results['construct_window'] = summarize(time_calls(construct, repeats))
+    for window in windows[:-1]:
+        window.close()
+        window.deleteLater()
+    window = windows[-1]
+    app.processEvents()
+
+    # add_vector, one call per new row
+    fill(window, 0)
+    results[f'add_vector_x{rows}'] = summarize(time_calls(settle(window.add_vector), rows))
+
+    # duplicate_vector with every row checked
+    results[f'duplicate_vector_{rows}_rows'] = summarize(time_calls(settle(window.duplicate_vector), repeats,
+            setup=lambda: fill(window, rows, checked=True)))
+
+    # delete_vector with every other row checked
+    every_other = np.arange(rows) % 2 == 0
+    results[f'delete_vector_{rows}_rows'] = summarize(time_calls(settle(window.delete_vector), repeats,
+            setup=lambda: fill(window, rows, checked=every_other)))
+
+    # select_all_vectors
+    results[f'select_all_{rows}_rows'] = summarize(time_calls(settle(window.select_all_vectors), repeats,
+            setup=lambda: fill(window, rows)))
+
+    # calculate_vector on filled rows
+    fill(window, rows)
+    results[f'calculate_vector_{rows}_rows'] = summarize(time_calls(settle(window.calculate_vector), repeats))
+
+    # plot_vector with a new vector every time
+    rng = np.random.default_rng(1)
+    vectors = iter(zip(rng.uniform(0, 360, repeats).round(2), rng.uniform(0, 1e4, repeats).round(2)))
+    results['plot_vector'] = summarize(time_calls(settle(lambda: window.plot_vector(*next(vectors))), repeats))
+
+    window.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the main window without a screen')
+    parser.add_argument('--rows', type=int, default=1000, help='number of vectors for the list operations')
+    parser.add_argument('--repeats', type=int, default=20, help='timed runs per benchmark')
+    parser.add_argument('--json', help="write the results as JSON to this file ('-' for stdout)")
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown of p50 against the baseline (default: 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {
+        'suite': BASELINE_NAME,
+        'rows': args.rows,
+        'repeats': args.repeats,
+        'environment': environment(),
+        'benchmarks': run_benchmarks(app, args.rows, args.repeats),
+    }
+    results['peak_rss_mb'] = peak_rss_mb()
+
+    print(f'{"benchmark":<32} {"p50 ms":>9} {"p90 ms":>9} {"p99 ms":>9} {"max ms":>9}')
+    for name, summary in results['benchmarks'].items():
+        print(f'{name:<32} {summary["p50_ms"]:>9.3f} {summary["p90_ms"]:>9.3f} {summary["p99_ms"]:>9.3f} {summary["max_ms"]:>9.3f}')
+    if results['peak_rss_mb'] is not None:
+        print(f'peak RSS: {results["peak_rss_mb"]:.1f} MB')
+
+    if args.json:
+        write_json(results, args.json)
+    if args.save_baseline:
+        save_baseline(BASELINE_NAME, results)
+        print('Saved as the new baseline')
+        return 0
+
+    regressions = find_regressions(results, load_baseline(BASELINE_NAME), tolerance=args.tolerance,
+            slack=SLACK_MS)
+    for message in regressions:
+        print(f'SLOWER: {message}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
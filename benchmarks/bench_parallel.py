@@ -0,0 +1,77 @@
+# Scaling of the multiprocess resolver in parallel.py from 1 to N worker processes
+# Times resolve_npy_parallel (workers memory map a .npy file) and resolve_parallel (arrays in shared memory).
+# The pool is started before timing, so the numbers are the steady state a long running job would see.
+# Run from the repository root: python benchmarks/bench_parallel.py --size 20000000 --workers 1 2 4 8
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import environment, peak_rss_mb, write_json
+from parallel import resolve_npy_parallel, resolve_parallel
+
+
+def best_time(function, repeats):
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel.py with different numbers of workers')
+    parser.add_argument('--size', type=int, default=20_000_000, help='number of vectors (default: 20000000)')
+    parser.add_argument('--workers', type=int, nargs='+', help='worker counts to try (default: 1 up to the number of cores)')
+    parser.add_argument('--repeats', type=int, default=3, help='runs per case, the fastest one is reported')
+    parser.add_argument('--json', help="write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args()
+    log = sys.stderr if args.json == '-' else sys.stdout
+
+    cores = os.cpu_count() or 1
+    worker_counts = args.workers or list(range(1, cores + 1))
+    rng = np.random.default_rng(0)
+    rows = np.column_stack((rng.uniform(0, 360, args.size), rng.uniform(0, 1000, args.size)))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'vectors.npy')
+        np.save(path, rows)
+        print(f'{args.size} vectors on {cores} cores', file=log)
+        print(f'{"input":<8} {"workers":>7} {"seconds":>9} {"vectors/s":>14} {"speedup":>8} {"efficiency":>10}', file=log)
+        for source in ('npy', 'shared'):
+            single = None
+            for workers in worker_counts:
+                with Pool(workers) as pool:
+                    if source == 'npy':
+                        run = lambda: resolve_npy_parallel(path, workers, pool=pool)
+                    else:
+                        run = lambda: resolve_parallel(rows, workers=workers, pool=pool)
+                    _, seconds = best_time(run, args.repeats)
+                single = single or seconds
+                results[f'{source}/{workers}'] = {
+                    'input': source,
+                    'workers': workers,
+                    'seconds': seconds,
+                    'vectors_per_sec': args.size / seconds,
+                    'speedup': single / seconds,
+                    'efficiency': single / seconds / workers,
+                }
+                result = results[f'{source}/{workers}']
+                print(f'{source:<8} {workers:>7} {seconds:>9.3f} {result["vectors_per_sec"]:>14,.0f} '
+                      f'{result["speedup"]:>7.2f}x {result["efficiency"]:>10.0%}', file=log)
+
+    if args.json:
+        write_json({'suite': 'parallel', 'size': args.size, 'cores': cores, 'environment': environment(),
+                    'benchmarks': results, 'peak_rss_mb': peak_rss_mb()}, args.json)
+
+
+if __name__ == '__main__':
+    main()
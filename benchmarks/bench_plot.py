@@ -0,0 +1,137 @@
+# Redraws per second of the resultant graph: the old clear-and-rebuild path vs the persistent blitting ResultantPlot
+# vs ResultantGraph, which draws in a background thread. For that one what matters is how long the UI thread is busy
+# per update (that is what typing has to wait for), and how many frames the worker actually drew.
+# Last, how long one tip to tail frame of N vectors takes to draw (ResultantScene, with the chain thinned out).
+# Runs without a screen: python benchmarks/bench_plot.py --redraws 200
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtWidgets import QApplication
+
+from gui.plot import ResultantArtists, ResultantScene
+from gui.render import ResultantGraph
+
+
+# What Application.plot_vector used to do on every update
+def legacy_redraw(canvas, angle, magnitude):
+    angle_rad = np.deg2rad(angle)
+    x = magnitude * np.cos(angle_rad)
+    y = magnitude * np.sin(angle_rad)
+    canvas.figure.clear()
+    ax = canvas.figure.add_subplot(111)
+    margin = 0.2 if magnitude == 0 else 0.2 * magnitude
+    ax.set_xlim(-magnitude - margin - 1, magnitude + margin + 1)
+    ax.set_ylim(-magnitude - margin - 1, magnitude + margin + 1)
+    ax.set_aspect('equal')
+    ax.axhline(0, color='white', linewidth=1)
+    ax.axvline(0, color='white', linewidth=1)
+    ax.set_title('Final Vector Graph', color='white')
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.grid(False)
+    ax.set_xticks([0, magnitude])
+    ax.set_yticks([0, magnitude])
+    ax.set_xticklabels([str(0), str(magnitude)])
+    ax.set_yticklabels([str(0), str(magnitude)])
+    ax.tick_params(axis='both', colors='white', which='both', width=0)
+    canvas.figure.patch.set_facecolor('#323232')
+    ax.set_facecolor('#323232')
+    ax.plot([0, x], [0, y], color='green', linestyle='-', linewidth=2)
+    ax.quiver(0, 0, x, y, angles='xy', scale_units='xy', scale=.9, color='green',
+            width=0.01, headwidth=7, headlength=6, headaxislength=4)
+    canvas.draw()
+
+
+# The blitting graph as a plain Qt canvas that draws in the UI thread, like the main window had before ResultantGraph
+class ResultantPlot(FigureCanvas):
+    def __init__(self, title='Final Vector Graph'):
+        self.figure = Figure()
+        super().__init__(self.figure)
+        self.artists = ResultantArtists(self.figure, title)
+        self.background = None
+        self.mpl_connect('draw_event', self.on_draw)
+
+    # A full draw happened (first show, resize...). Save the static background and put the moving parts back on top
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.figure.bbox)
+        self.artists.draw_animated()
+
+    def set_vector(self, angle, magnitude, label=None, vectors=None):
+        self.artists.set_vector(angle, magnitude, label, vectors)
+        if self.background is None:
+            self.draw_idle() # Nothing saved yet, so a normal draw is needed
+            return
+        self.restore_region(self.background)
+        self.artists.draw_animated()
+        self.blit(self.figure.bbox)
+
+
+def run(app, canvas, update, vectors):
+    canvas.setFixedSize(300, 300)
+    canvas.show()
+    app.processEvents()
+    start = time.perf_counter()
+    for angle, magnitude in vectors:
+        update(angle, magnitude)
+        app.processEvents()
+    return len(vectors) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare redraw speed of the old and new resultant graph')
+    parser.add_argument('--redraws', type=int, default=200, help='number of updates to time')
+    parser.add_argument('--chain-sizes', type=int, nargs='+', default=[100, 10_000, 100_000, 1_000_000], help='vector counts for the tip to tail frames')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = np.random.default_rng(0)
+    vectors = list(zip(rng.uniform(0, 360, args.redraws).round(2), rng.uniform(0, 1000, args.redraws).round(2)))
+
+    legacy_canvas = FigureCanvas(Figure())
+    before = run(app, legacy_canvas, lambda angle, magnitude: legacy_redraw(legacy_canvas, angle, magnitude), vectors)
+
+    plot = ResultantPlot()
+    after = run(app, plot, plot.set_vector, vectors)
+
+    graph = ResultantGraph()
+    graph.setFixedSize(300, 300)
+    graph.show()
+    drawn = []
+    graph.frame_ready.connect(lambda frame, image: drawn.append(frame))
+    graph.set_vector(0, 0)
+    while not drawn: # Wait for the worker to load matplotlib and draw its first frame
+        app.processEvents()
+    drawn.clear()
+    threaded = run(app, graph, graph.set_vector, vectors)
+    while graph.shown_frame != graph.frame:
+        app.processEvents()
+    graph.stop()
+
+    print(f'{"path":<20} {"redraws/sec":>12} {"UI ms/update":>13}')
+    print(f'{"clear + rebuild":<20} {before:>12.1f} {1000 / before:>13.3f}')
+    print(f'{"ResultantPlot blit":<20} {after:>12.1f} {1000 / after:>13.3f}')
+    print(f'{"ResultantGraph":<20} {"":>12} {1000 / threaded:>13.3f}   ({len(drawn)} of {len(vectors)} frames drawn, the rest were skipped)')
+    print(f'speedup: {after / before:.1f}x')
+
+    scene = ResultantScene()
+    scene.resize(300, 300, 100)
+    scene.render(0, 0) # First draw of the background
+    print(f'{"tip to tail vectors":<20} {"ms/frame":>12}')
+    for size in args.chain_sizes:
+        angles = rng.uniform(0, 360, size)
+        magnitudes = rng.uniform(0, 1000, size)
+        start = time.perf_counter()
+        scene.render(0, 0, vectors=(angles, magnitudes))
+        print(f'{size:<20} {(time.perf_counter() - start) * 1000:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Startup time of the app: how long until the window is on screen and until the graph has loaded
+# Cold runs start without the __pycache__ folders of this repository, warm runs reuse them
+# Run from the repository root: python benchmarks/bench_startup.py --runs 5
+# To time the packaged exe: python benchmarks/bench_startup.py --command "output/Vector Addition.exe"
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def clear_bytecode():
+    for folder, subfolders, files in os.walk(ROOT):
+        if '__pycache__' in subfolders:
+            shutil.rmtree(os.path.join(folder, '__pycache__'))
+            subfolders.remove('__pycache__')
+
+
+# Starts the app once and returns the seconds until each line printed by main.startup_probe
+def measure(command, timeout):
+    environment = dict(os.environ, VECTOR_STARTUP_PROBE='1')
+    environment.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=environment, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    times = {}
+    try:
+        for line in process.stdout:
+            times[line.strip()] = time.perf_counter() - start
+            if 'graph-ready' in times:
+                break
+        process.wait(timeout=timeout)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    if 'window-shown' not in times or 'graph-ready' not in times:
+        raise RuntimeError(f'{command} exited without reporting startup (exit code {process.returncode})')
+    return times['window-shown'], times['graph-ready']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold and warm startup time of the app')
+    parser.add_argument('--runs', type=int, default=5, help='number of warm runs')
+    parser.add_argument('--command', help='executable to start instead of "python main.py"')
+    parser.add_argument('--timeout', type=float, default=60, help='seconds to wait for one run')
+    parser.add_argument('--max-window-ms', type=float, help='exit with an error if the warm median until the window shows is slower than this')
+    args = parser.parse_args()
+
+    command = [args.command] if args.command else [sys.executable, 'main.py']
+
+    if not args.command:
+        clear_bytecode()
+    cold = measure(command, args.timeout)
+    warm = [measure(command, args.timeout) for _ in range(args.runs)]
+
+    window_median = statistics.median(run[0] for run in warm)
+    graph_median = statistics.median(run[1] for run in warm)
+    print(f'{"":<6} {"window shown":>14} {"graph ready":>14}')
+    print(f'{"cold":<6} {cold[0] * 1000:>11.0f} ms {cold[1] * 1000:>11.0f} ms')
+    print(f'{"warm":<6} {window_median * 1000:>11.0f} ms {graph_median * 1000:>11.0f} ms   (median of {args.runs})')
+
+    if args.max_window_ms is not None and window_median * 1000 > args.max_window_ms:
+        print(f'Startup regression: window took {window_median * 1000:.0f} ms, limit is {args.max_window_ms:.0f} ms')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# Throughput and accuracy of the summation modes in add.py
+# Run from the repository root: python benchmarks/bench_summation.py --size 200000
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from add import SUMMATION_MODES, component_sum
+
+
+# Near-cancelling loads: huge forces that almost cancel each other plus lots of small ones
+def make_components(size, seed=0):
+    rng = np.random.default_rng(seed)
+    large = rng.normal(0, 1e12, size // 4)
+    small = rng.normal(0, 1, size - 2 * len(large))
+    values = np.concatenate((large, -large * (1 + 1e-9), small))
+    rng.shuffle(values)
+    return values
+
+
+def time_mode(values, precision, repeats):
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = component_sum(values, precision)
+        best = min(best, time.perf_counter() - start)
+    return float(result), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the summation modes of add.py')
+    parser.add_argument('--size', type=int, default=200_000, help='number of components to add')
+    parser.add_argument('--repeats', type=int, default=5, help='runs per mode, the fastest one is reported')
+    args = parser.parse_args()
+
+    values = make_components(args.size)
+    exact = math.fsum(values)
+
+    print(f'{args.size} components, exact sum {exact!r}')
+    print(f'{"mode":<12} {"vectors/sec":>14} {"abs error":>12} {"rel error":>12}')
+    for precision in SUMMATION_MODES:
+        result, seconds = time_mode(values, precision, args.repeats)
+        error = abs(result - exact)
+        relative = error / abs(exact) if exact else error
+        print(f'{precision:<12} {args.size / seconds:>14.3e} {error:>12.3e} {relative:>12.3e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# Speed of the whole-degree trig table and the LRU cache in add.py, compared with computing cos and sin every time
+# Each case runs with its setting (USE_TRIG_TABLE or USE_TRIG_CACHE) turned off and then on
+# Run from the repository root: python benchmarks/bench_trig.py --size 1000000
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import add
+from harness import environment, write_json
+
+
+def best_time(function, repeats):
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Times function with the table (or the cache) turned off and on
+def compare(function, repeats, setting='USE_TRIG_TABLE'):
+    enabled = getattr(add, setting)
+    setattr(add, setting, False)
+    computed = best_time(function, repeats)
+    setattr(add, setting, True)
+    add.clear_trig_cache()
+    looked_up = best_time(function, repeats)
+    setattr(add, setting, enabled)
+    return {'setting': setting, 'computed_s': computed, 'looked_up_s': looked_up, 'speedup': computed / looked_up}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the trig table and cache of add.py')
+    parser.add_argument('--size', type=int, default=1_000_000, help='vectors in the batch runs')
+    parser.add_argument('--loop-size', type=int, default=100_000, help='vectors in the one-at-a-time runs')
+    parser.add_argument('--repeats', type=int, default=5, help='runs per case, the fastest one is reported')
+    parser.add_argument('--json', help="write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    whole_angles = rng.integers(0, 360, args.size).astype(np.float64)
+    wrapped_angles = rng.integers(-720, 720, args.size).astype(np.float64)
+    magnitudes = rng.uniform(0, 1000, args.size)
+    # Angles typed with one decimal repeat a lot, which is what the LRU cache is for
+    decimal_angles = (rng.integers(0, 3600, args.loop_size) / 10).tolist()
+    loop_angles = whole_angles[:args.loop_size].tolist()
+    loop_magnitudes = magnitudes[:args.loop_size].tolist()
+
+    # name: (function, setting that gets turned off and on)
+    cases = {
+        f'vector_fission_batch, {args.size} whole degrees':
+            (lambda: add.vector_fission_batch(whole_angles, magnitudes), 'USE_TRIG_TABLE'),
+        f'vector_fission_batch, {args.size} whole degrees -720..720':
+            (lambda: add.vector_fission_batch(wrapped_angles, magnitudes), 'USE_TRIG_TABLE'),
+        f'resolve_vectors, {args.size} whole degrees':
+            (lambda: add.resolve_vectors(whole_angles, magnitudes), 'USE_TRIG_TABLE'),
+        f'vector_fission loop, {args.loop_size} whole degrees':
+            (lambda: [add.vector_fission(angle, magnitude) for angle, magnitude in zip(loop_angles, loop_magnitudes)],
+             'USE_TRIG_TABLE'),
+        f'vector_fission loop, {args.loop_size} angles with 1 decimal':
+            (lambda: [add.vector_fission(angle, magnitude) for angle, magnitude in zip(decimal_angles, loop_magnitudes)],
+             'USE_TRIG_CACHE'),
+    }
+    results = {}
+    for name, (function, setting) in cases.items():
+        results[name] = compare(function, args.repeats, setting)
+        print(f'{name:<56} {setting:<15} {results[name]["computed_s"] * 1000:>9.2f} ms -> {results[name]["looked_up_s"] * 1000:>9.2f} ms'
+              f'  ({results[name]["speedup"]:.2f}x)', file=sys.stderr if args.json == '-' else sys.stdout)
+    cache_info = add.trig_cache_info()
+    print(f'LRU cache after the last run: {cache_info.hits} hits, {cache_info.misses} misses, '
+          f'{cache_info.currsize}/{cache_info.maxsize} entries', file=sys.stderr if args.json == '-' else sys.stdout)
+
+    if args.json:
+        write_json({'suite': 'trig', 'environment': environment(), 'benchmarks': results,
+                    'cache': cache_info._asdict()}, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# How long cli.py takes to add up the same vectors stored as CSV, JSON, NPY and VEC (all four VEC variants)
+# Run from the repository root: python benchmarks/bench_vecfile.py --size 1000000
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from add import vector_fission_batch
+from cli import solve_file
+from harness import environment, write_json
+from vecfile import write_vec
+
+
+def best_time(function, repeats):
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the input formats of cli.py')
+    parser.add_argument('--size', type=int, default=1_000_000, help='number of vectors (default: 1000000)')
+    parser.add_argument('--repeats', type=int, default=3, help='runs per format, the fastest one is reported')
+    parser.add_argument('--json', help="write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args()
+    log = sys.stderr if args.json == '-' else sys.stdout
+
+    rng = np.random.default_rng(0)
+    angles = rng.integers(0, 360, args.size).astype(np.float64)
+    magnitudes = rng.uniform(0, 1000, args.size).round(3)
+    x_values, y_values = vector_fission_batch(angles, magnitudes)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        files = {
+            'csv': os.path.join(folder, 'vectors.csv'),
+            'json': os.path.join(folder, 'vectors.json'),
+            'npy': os.path.join(folder, 'vectors.npy'),
+            'vec polar float64': os.path.join(folder, 'polar64.vec'),
+            'vec polar float32': os.path.join(folder, 'polar32.vec'),
+            'vec cartesian float64': os.path.join(folder, 'cartesian64.vec'),
+            'vec cartesian float32': os.path.join(folder, 'cartesian32.vec'),
+        }
+        rows = np.column_stack((angles, magnitudes))
+        np.savetxt(files['csv'], rows, delimiter=',', header='angle,magnitude', comments='', fmt='%.17g')
+        with open(files['json'], 'w', encoding='utf-8') as file:
+            json.dump(rows.tolist(), file)
+        np.save(files['npy'], rows)
+        write_vec(files['vec polar float64'], angles, magnitudes)
+        write_vec(files['vec polar float32'], angles, magnitudes, dtype='float32')
+        write_vec(files['vec cartesian float64'], x_values, y_values, layout='cartesian')
+        write_vec(files['vec cartesian float32'], x_values, y_values, layout='cartesian', dtype='float32')
+
+        print(f'{"format":<24} {"MB":>8} {"seconds":>9} {"vectors/s":>14}', file=log)
+        for name, path in files.items():
+            seconds = best_time(lambda: solve_file(path), args.repeats)
+            size_mb = os.path.getsize(path) / 1e6
+            results[name] = {'file_mb': size_mb, 'seconds': seconds, 'vectors_per_sec': args.size / seconds}
+            print(f'{name:<24} {size_mb:>8.1f} {seconds:>9.3f} {args.size / seconds:>14,.0f}', file=log)
+
+    if args.json:
+        write_json({'suite': 'vecfile', 'size': args.size, 'environment': environment(), 'benchmarks': results}, args.json)
+
+
+if __name__ == '__main__':
+    main()
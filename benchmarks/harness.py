@@ -0,0 +1,113 @@
+# Shared helpers for the benchmark scripts: timing, percentiles, memory, JSON results and baselines
+import json
+import os
+import platform
+import sys
+import time
+
+BASELINE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+
+# Calls function repeats times and returns every duration in seconds
+def time_calls(function, repeats, setup=None):
+    durations = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return float('nan')
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+# p50/p90/p99/max in milliseconds
+def summarize(durations):
+    return {
+        'count': len(durations),
+        'p50_ms': percentile(durations, 0.5) * 1000,
+        'p90_ms': percentile(durations, 0.9) * 1000,
+        'p99_ms': percentile(durations, 0.99) * 1000,
+        'max_ms': max(durations) * 1000 if durations else float('nan'),
+    }
+
+
+# Highest memory use of this process so far in MB, or None where it can't be measured
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024) # bytes on macOS
+    return peak / 1024 # kilobytes on Linux
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def write_json(data, path):
+    if path == '-':
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2)
+        file.write('\n')
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_FOLDER, f'{name}.json')
+
+
+def load_baseline(name):
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(name, results):
+    os.makedirs(BASELINE_FOLDER, exist_ok=True)
+    write_json(results, baseline_path(name))
+
+
+# Compares results['benchmarks'][name][metric] with the baseline. Returns a list of messages about everything that got
+# worse by more than tolerance (0.25 = 25%). For times lower is better, for throughput pass lower_is_better=False
+# slack is an extra absolute allowance (in the metric's units) so tiny timings that jitter by a fraction of a
+# millisecond don't count as regressions
+def find_regressions(results, baseline, metric='p50_ms', tolerance=0.25, lower_is_better=True, slack=0.0):
+    regressions = []
+    if baseline is None:
+        return regressions
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous or metric not in previous or metric not in current:
+            continue
+        if lower_is_better:
+            worse = current[metric] > previous[metric] * (1 + tolerance) + slack
+        else:
+            worse = current[metric] < previous[metric] / (1 + tolerance) - slack
+        if worse:
+            regressions.append(f'{name}: {metric} {current[metric]:.3f} vs baseline {previous[metric]:.3f} '
+                    f'({current[metric] / previous[metric] - 1:+.0%})')
+    return regressions
@@ -0,0 +1,157 @@
+# Load generator for service.py: lots of clients sending resolve requests at the same time
+# Starts the service on a free port (or uses one that is already running with --url/--unix), keeps --connections
+# keep-alive connections busy until --requests requests are done and reports throughput and latency percentiles.
+# client latency is the round trip seen by the client, server latency is the latency_ms the service reports.
+# Run from the repository root: python benchmarks/load_service.py --connections 64 --requests 5000 --vectors 100
+# Compare with batching turned off: python benchmarks/load_service.py --max-batch-vectors 1
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from harness import environment, summarize, write_json
+
+
+# Starts python service.py and returns the process and the address it printed
+def start_service(arguments):
+    process = subprocess.Popen([sys.executable, 'service.py', '--port', '0', *arguments], cwd=ROOT,
+                               stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    if not line.startswith('Listening on '):
+        process.kill()
+        raise RuntimeError(f'service.py did not start: {line.strip()}')
+    return process, line.split('Listening on ', 1)[1].strip()
+
+
+async def open_connection(address):
+    if address.startswith('unix:'):
+        return await asyncio.open_unix_connection(address[len('unix:'):])
+    parts = urlsplit(address)
+    return await asyncio.open_connection(parts.hostname, parts.port)
+
+
+def request_bytes(path, data=None):
+    body = json.dumps(data).encode('utf-8') if data is not None else b''
+    method = 'POST' if data is not None else 'GET'
+    return f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('The service closed the connection')
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    status = int(status_line.split()[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+# One client: sends requests one after the other on its own connection until the shared counter runs out
+async def client(address, payloads, remaining, results):
+    reader, writer = await open_connection(address)
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            payload = payloads[remaining[0] % len(payloads)]
+            start = time.perf_counter()
+            writer.write(payload)
+            await writer.drain()
+            status, data = await read_response(reader)
+            if status != 200:
+                raise RuntimeError(f'Request failed with {status}: {data}')
+            results.append((time.perf_counter() - start, data['latency_ms'], data['batch_size']))
+    finally:
+        writer.close()
+
+
+async def run_load(address, connections, requests, vectors, precision):
+    rng = np.random.default_rng(0)
+    # A handful of different requests, encoded up front so the client side stays cheap
+    payloads = [request_bytes('/resolve', {'vectors': np.column_stack((rng.uniform(0, 360, vectors),
+                                                                      rng.uniform(0, 100, vectors))).tolist(),
+                                           'precision': precision})
+                for _ in range(16)]
+    remaining = [requests]
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(address, payloads, remaining, results) for _ in range(connections)))
+    seconds = time.perf_counter() - start
+
+    reader, writer = await open_connection(address)
+    writer.write(request_bytes('/stats'))
+    _, stats = await read_response(reader)
+    writer.close()
+    return results, seconds, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Send lots of concurrent requests to service.py and report latency and throughput')
+    parser.add_argument('--url', help='address of a service that is already running, like http://127.0.0.1:8750')
+    parser.add_argument('--unix', help='Unix socket of a service that is already running')
+    parser.add_argument('--connections', type=int, default=32, help='concurrent clients (default: 32)')
+    parser.add_argument('--requests', type=int, default=2000, help='total number of requests (default: 2000)')
+    parser.add_argument('--vectors', type=int, default=100, help='vectors per request (default: 100)')
+    parser.add_argument('--precision', default='fast', help='precision of every request (default: fast)')
+    parser.add_argument('--batch-window-ms', type=float, default=0.0, help='passed on to the service this script starts')
+    parser.add_argument('--max-batch-vectors', type=int, help='passed on to the service this script starts, 1 turns batching off')
+    parser.add_argument('--json', help="write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args()
+    log = sys.stderr if args.json == '-' else sys.stdout
+
+    process = None
+    if args.url or args.unix:
+        address = args.url or f'unix:{args.unix}'
+    else:
+        service_arguments = ['--batch-window-ms', str(args.batch_window_ms)]
+        if args.max_batch_vectors is not None:
+            service_arguments += ['--max-batch-vectors', str(args.max_batch_vectors)]
+        process, address = start_service(service_arguments)
+    try:
+        results, seconds, stats = asyncio.run(run_load(address, args.connections, args.requests, args.vectors,
+                                                       args.precision))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    client_latency = summarize([result[0] for result in results])
+    server_latency = summarize([result[1] / 1000 for result in results])
+    batch_sizes = [result[2] for result in results]
+    summary = {
+        'requests': len(results),
+        'seconds': seconds,
+        'requests_per_sec': len(results) / seconds,
+        'vectors_per_sec': len(results) * args.vectors / seconds,
+        'mean_batch_size': sum(batch_sizes) / len(batch_sizes),
+        'client_latency': client_latency,
+        'server_latency': server_latency,
+    }
+    print(f'{len(results)} requests of {args.vectors} vectors over {args.connections} connections to {address}', file=log)
+    print(f'{summary["requests_per_sec"]:,.0f} requests/s, {summary["vectors_per_sec"]:,.0f} vectors/s, '
+          f'mean batch {summary["mean_batch_size"]:.1f} requests', file=log)
+    print(f'{"latency":<8} {"p50 ms":>9} {"p90 ms":>9} {"p99 ms":>9} {"max ms":>9}', file=log)
+    for name, latency in (('client', client_latency), ('server', server_latency)):
+        print(f'{name:<8} {latency["p50_ms"]:>9.2f} {latency["p90_ms"]:>9.2f} {latency["p99_ms"]:>9.2f} '
+              f'{latency["max_ms"]:>9.2f}', file=log)
+
+    if args.json:
+        write_json({'suite': 'service', 'connections': args.connections, 'vectors': args.vectors,
+                    'environment': environment(), 'summary': summary, 'service_stats': stats}, args.json)
+
+
+if __name__ == '__main__':
+    main()
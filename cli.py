@@ -0,0 +1,113 @@
+# Command line vector solver. No window, so it works on headless machines
+# Usage: python cli.py vectors.csv more_vectors.json -o results.csv
+# Every input file is one problem: all of its vectors are added together into one resultant
+# Only add.py and NumPy are imported here (never PyQt5 or matplotlib) so it starts quickly
+import argparse
+import csv
+import json
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from add import SUMMATION_MODES, chunk_partials, combine_partials
+from parallel import resolve_npy_parallel, resolve_vec_parallel
+from vecfile import open_vec, resolve_vec
+from vector_io import DEFAULT_CHUNK_SIZE, FORMATS, describe_error, detect_format, read_chunks
+
+
+# Splits one N x 2 chunk into components and adds them up (see chunk_partials in add.py). Returns the partial sums
+# and the number of vectors, so chunks can be combined later
+def chunk_sums(chunk, precision='fast'):
+    (x_sum, y_sum), = chunk_partials([(chunk[:, 0], chunk[:, 1])], precision)
+    return x_sum, y_sum, len(chunk)
+
+
+def _chunk_sums_star(arguments):
+    return chunk_sums(*arguments)
+
+
+# Streams a file through the math chunk by chunk. Only the partial sums are kept, never the whole file
+# With a pool, NPY and VEC files are split between the workers by rows (each one memory maps the file itself, see
+# parallel.py). Text files still have to be parsed here, so their parsed chunks get sent to the workers
+def solve_file(path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE, precision='fast', pool=None, workers=1):
+    file_format = file_format or detect_format(path)
+    if file_format == 'vec':
+        if pool is not None:
+            angle, magnitude = resolve_vec_parallel(path, workers, precision, chunk_size, pool)
+        else:
+            angle, magnitude = resolve_vec(path, chunk_size, precision)
+        return {'input': path, 'vectors': len(open_vec(path)), 'angle': angle, 'magnitude': magnitude}
+    if pool is not None and file_format == 'npy' and path != '-':
+        angle, magnitude = resolve_npy_parallel(path, workers, precision, chunk_size, pool)
+        return {'input': path, 'vectors': len(np.load(path, mmap_mode='r')), 'angle': angle, 'magnitude': magnitude}
+
+    chunks = read_chunks(path, file_format, chunk_size)
+    if pool is None:
+        partials = (chunk_sums(chunk, precision) for chunk in chunks)
+    else:
+        partials = pool.imap(_chunk_sums_star, ((chunk, precision) for chunk in chunks))
+
+    sums, count = [], 0
+    for x_sum, y_sum, length in partials:
+        sums.append((x_sum, y_sum))
+        count += length
+    angle, magnitude = combine_partials(sums)
+    return {'input': path, 'vectors': count, 'angle': angle, 'magnitude': magnitude}
+
+
+def write_results(results, output, output_format):
+    if output_format == 'json':
+        json.dump(results, output, indent=2)
+        output.write('\n')
+    else:
+        writer = csv.DictWriter(output, fieldnames=['input', 'vectors', 'angle', 'magnitude'], lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Add up vectors given as (angle, magnitude) rows without opening the GUI')
+    parser.add_argument('inputs', nargs='*', default=['-'], help="CSV, JSON, NPY or VEC files. '-' reads from stdin (default)")
+    parser.add_argument('-f', '--format', choices=FORMATS, help='input format. By default it is guessed from the file extension, stdin is CSV')
+    parser.add_argument('-o', '--output', default='-', help="where to write the resultants. '-' is stdout (default)")
+    parser.add_argument('--output-format', choices=['csv', 'json'], default='csv', help='format of the results (default: csv)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help=f'vectors per chunk (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='number of worker processes. NPY files are split between them by rows, text files by parsed chunks (default: 1)')
+    parser.add_argument('--precision', choices=SUMMATION_MODES, default='fast', help='summation mode (default: fast)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.chunk_size < 1:
+        raise SystemExit('--chunk-size must be at least 1')
+    if args.workers < 1:
+        raise SystemExit('--workers must be at least 1')
+
+    # A file that can't be read is skipped with a message, the others still get solved and the exit code is 1
+    pool = Pool(args.workers) if args.workers > 1 else None
+    results = []
+    failed = False
+    try:
+        for path in args.inputs:
+            try:
+                results.append(solve_file(path, args.format, args.chunk_size, args.precision, pool, args.workers))
+            except (OSError, ValueError) as e:
+                print(describe_error(path, e), file=sys.stderr)
+                failed = True
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if args.output == '-':
+        write_results(results, sys.stdout, args.output_format)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as output:
+            write_results(results, output, args.output_format)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
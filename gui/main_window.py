@@ -1,30 +1,44 @@
 # GUI imports (PyQt5)
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QGuiApplication
-from PyQt5.QtWidgets import QLabel, QVBoxLayout, QPushButton, QApplication, QWidget, QHBoxLayout, QSpacerItem, QSizePolicy, QLineEdit, QFrame, QScrollArea, QMessageBox
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QFont, QGuiApplication, QKeySequence
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QPushButton, QApplication, QWidget, QHBoxLayout, QSpacerItem, QLineEdit, QFrame, QFileDialog, QShortcut
+from PyQt5.QtCore import Qt, QSize, QTimer
 
 # Math imports
+import math
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
 # Other file imports
-from gui.vector import Vector
-from add import vector_addition, vector_fission
-import os, sys
+from gui.vector import VectorListView
+from gui.vector_model import VectorListModel, VALUE_ROLE, parse_value
+from vector_store import VectorStore
+from gui.resources import get_icon, get_pixmap
+from add import resolve_vectors, ResultantAccumulator
+from vecfile import load_vectors, write_vec
+from vector_io import read_csv_text
+from gui.session import SESSION_EXTENSION, load_session, save_session
+from profiling import profiled
 
 # Main Application class
 class Application(QWidget):
     def __init__(self):
         super().__init__()
 
-        # Global variables
-        self.image_path = 'images'
+        # All the vectors live in the store. The model shows them in the list, which only draws the rows that are visible
+        self.vector_store = VectorStore()
+        self.vector_model = VectorListModel(self.vector_store, self)
 
-        # Variables for vector handling
-        self.vector_instances = {}
-        self.instance_count = 0
-        self.naming_count = 0
+        # Live mode: the resultant updates while typing instead of waiting for the equals button
+        # The accumulator keeps the running sums so an edit only has to replace one vector
+        self.live_mode = False
+        self.live_accumulator = ResultantAccumulator()
+        self.live_invalid = set() # Ids of vectors that don't hold valid numbers right now
+        self.live_timer = QTimer(self) # Collects all the edits made within one frame into a single recompute and redraw
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(16) # About one frame at 60 fps
+        self.live_timer.timeout.connect(self.refresh_live_result)
+
+        self.tip_to_tail = False # The graph also shows every vector tip to tail, not just the resultant
+        self.result_shown = False # The output boxes show a result (not an error)
 
         self.is1920x1080 = False
 
@@ -52,7 +66,7 @@ class Application(QWidget):
 
         # Window details
         self.setWindowTitle("Vector Addition")
-        self.setWindowIcon(QIcon(self.get_absolute_path(f'{self.image_path}/window_icon.png')))
+        self.setWindowIcon(get_icon('window_icon.png'))
 
         # Styles
         self.setStyleSheet('background-color: #241e22; color: white;')
@@ -75,21 +89,25 @@ class Application(QWidget):
         self.canvas_container.setStyleSheet(
             "background-color: #323232; border-radius: 10px; padding: 10px;")
 
-        # Resulting Graph
-        self.figure, self.ax = plt.subplots()
-        self.final_graph = FigureCanvas(self.figure)
+        # Resulting Graph. Loading matplotlib takes a while, so the window first shows an empty placeholder and
+        # init_graph swaps in the real graph as soon as the window has been drawn once (see paintEvent).
+        # The graph is drawn in a background thread (see gui/render.py), which is also where matplotlib gets loaded
+        self.final_graph = None
+        self.pending_plot = None # The last vector plotted before the graph was ready
+        self.graph_scheduled = False
+        self.graph_placeholder = QWidget()
         
         # Set the size of the container and the canvas
         if self.is1920x1080 == True:
             self.graph_size = int(self.window_height * 0.4)
         else:
             self.graph_size = int(self.window_height * 0.3)
-        self.final_graph.setFixedSize(QSize(self.graph_size, self.graph_size))
+        self.graph_placeholder.setFixedSize(QSize(self.graph_size, self.graph_size))
 
         # Create a layout for the container
-        container_layout = QVBoxLayout()
-        container_layout.addWidget(self.final_graph)
-        self.canvas_container.setLayout(container_layout)
+        self.canvas_layout = QVBoxLayout()
+        self.canvas_layout.addWidget(self.graph_placeholder)
+        self.canvas_container.setLayout(self.canvas_layout)
         self.output_layout.addWidget(self.canvas_container, stretch=1)
         self.plot_vector(0, 0) # Plot an initial non-existant vector to show the axis lines in the container
 
@@ -107,7 +125,7 @@ class Application(QWidget):
         self.magnitude_label_layout = QHBoxLayout() # horizontal layout
 
         self.magnitude_icon = QLabel(self)
-        self.magnitude_icon.setPixmap(QPixmap(self.get_absolute_path(f'{self.image_path}/magnitude.png')))
+        self.magnitude_icon.setPixmap(get_pixmap('magnitude.png'))
         self.magnitude_icon.setFixedWidth(50)
 
         self.magnitude_output = QLineEdit("0") # Initial text of 0
@@ -130,7 +148,7 @@ class Application(QWidget):
         self.angle_label_layout = QHBoxLayout()
 
         self.angle_icon = QLabel(self)
-        self.angle_icon.setPixmap(QPixmap(self.get_absolute_path(f'{self.image_path}/angle.png')))
+        self.angle_icon.setPixmap(get_pixmap('angle.png'))
         self.angle_icon.setFixedWidth(50)
         self.angle_output = QLineEdit('0') # Initial text of 0
         self.angle_output.setStyleSheet("border: none; background-color: #323232; border-radius: 10px; padding: 0px 20px;")
@@ -165,11 +183,11 @@ class Application(QWidget):
         self.input_layout = QHBoxLayout()
         self.input_layout.setContentsMargins(15,10,15,15)
 
-        # This widget allows for scrolling. All the vectors are placed in here and they can be scrolled
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)  # Ensures the vector layout resizes with the scroll area
-        self.scroll_area.setStyleSheet("""
-            QScrollArea{
+        # This is the list of vectors. It scrolls by itself and only the visible vectors are drawn
+        self.vector_view = VectorListView()
+        self.vector_view.setModel(self.vector_model)
+        self.vector_view.setStyleSheet("""
+            QTableView{
                 border: none;
                 background-color: #252525;
                 border-radius: 15px;
@@ -203,28 +221,27 @@ class Application(QWidget):
             }
         """)
 
-        vertical_scrollbar = self.scroll_area.verticalScrollBar() # This is the scroll bar element. I need it to set the scroll speed
+        vertical_scrollbar = self.vector_view.verticalScrollBar() # This is the scroll bar element. I need it to set the scroll speed
         vertical_scrollbar.setSingleStep(10)  # Set scroll speed
         vertical_scrollbar.setPageStep(20) # Step when pressing pgup and pgdown
-        
-        # This is the widget that can be scrolled. The scroll widget is placed inside of this
-        self.vector_widget = QWidget()
-        self.vector_widget.setStyleSheet('background-color: transparent;') # Allow see through so that you can see the scroll widget
-        self.vector_layout = QVBoxLayout(self.vector_widget)
-        self.vector_layout.setContentsMargins(0,0,0,0)
+
+        # Live mode follows the model, so it sees edits, new vectors and deleted vectors
+        self.vector_model.dataChanged.connect(self.vector_rows_changed)
+        self.vector_model.rowsInserted.connect(lambda parent, first, last: self.vector_rows_changed(self.vector_model.index(first, 0), self.vector_model.index(last, 0)))
+        self.vector_model.rowsAboutToBeRemoved.connect(self.vector_rows_removed)
+        self.vector_model.rowsRemoved.connect(self.schedule_live_refresh)
+        self.vector_model.modelReset.connect(lambda: self.set_live_mode(self.live_mode)) # Big changes: scan everything again
 
         # Add two vectors to begin with
         self.add_vector()
         self.add_vector()
 
-        self.scroll_area.setWidget(self.vector_widget)  # Set the scrollable widget
-
 
         # The buttons
         self.button_layout = QVBoxLayout()
 
         self.select_all = QPushButton()
-        self.select_all.setIcon(QIcon(self.get_absolute_path(f'{self.image_path}/select_all.png')))
+        self.select_all.setIcon(get_icon('select_all.png'))
         self.select_all.setCursor(Qt.PointingHandCursor)
         self.select_all.setStyleSheet("""
             QPushButton {
@@ -242,7 +259,7 @@ class Application(QWidget):
         self.button_layout.addWidget(self.select_all)
 
         self.deselect_all = QPushButton()
-        self.deselect_all.setIcon(QIcon(self.get_absolute_path(f'{self.image_path}/deselect_all.png')))
+        self.deselect_all.setIcon(get_icon('deselect_all.png'))
         self.deselect_all.setCursor(Qt.PointingHandCursor)
         self.deselect_all.setStyleSheet("""
             QPushButton {
@@ -260,7 +277,7 @@ class Application(QWidget):
         self.button_layout.addWidget(self.deselect_all)
         
         self.add = QPushButton()
-        self.add.setIcon(QIcon(self.get_absolute_path(f'{self.image_path}/add.png')))
+        self.add.setIcon(get_icon('add.png'))
         self.add.setCursor(Qt.PointingHandCursor)
         self.add.setStyleSheet("""
             QPushButton {
@@ -278,7 +295,7 @@ class Application(QWidget):
         self.button_layout.addWidget(self.add)
 
         self.duplicate = QPushButton()
-        self.duplicate.setIcon(QIcon(self.get_absolute_path(f'{self.image_path}/duplicate.png')))
+        self.duplicate.setIcon(get_icon('duplicate.png'))
         self.duplicate.setCursor(Qt.PointingHandCursor)
         self.duplicate.setStyleSheet("""
             QPushButton {
@@ -296,7 +313,7 @@ class Application(QWidget):
         self.button_layout.addWidget(self.duplicate)
 
         self.remove = QPushButton()
-        self.remove.setIcon(QIcon(self.get_absolute_path(f'{self.image_path}/delete.png')))
+        self.remove.setIcon(get_icon('delete.png'))
         self.remove.setCursor(Qt.PointingHandCursor)
         self.remove.setStyleSheet("""
             QPushButton {
@@ -314,7 +331,7 @@ class Application(QWidget):
         self.button_layout.addWidget(self.remove)
 
         self.calculate = QPushButton()
-        self.calculate.setIcon(QIcon(self.get_absolute_path(f'{self.image_path}/equals.png')))
+        self.calculate.setIcon(get_icon('equals.png'))
         self.calculate.setCursor(Qt.PointingHandCursor)
         self.calculate.setStyleSheet("""
             QPushButton {
@@ -331,7 +348,81 @@ class Application(QWidget):
         self.calculate.clicked.connect(self.calculate_vector) # This is the callback function when clicking it
         self.button_layout.addWidget(self.calculate)
 
-        self.input_layout.addWidget(self.scroll_area, stretch=1)
+        self.live = QPushButton('LIVE')
+        self.live.setCheckable(True) # Stays pressed while live mode is on
+        self.live.setCursor(Qt.PointingHandCursor)
+        self.live.setToolTip('Update the result while typing')
+        self.live.setStyleSheet("""
+            QPushButton {
+                background-color: #323232;
+                color: white;
+                border-radius: 8px;
+                border: 1px solid #3e3e3e;
+                padding: 10px 40px;
+            }
+            QPushButton:hover {
+                background-color: #3e3e3e;   
+            }
+            QPushButton:checked {
+                background-color: #4cc2ff;
+                border: 1px solid #52c4ff;
+            }
+        """)
+        self.live.toggled.connect(self.set_live_mode) # This is the callback function when clicking it
+        self.button_layout.addWidget(self.live)
+
+        self.tip_to_tail_button = QPushButton('TIP TO TAIL')
+        self.tip_to_tail_button.setCheckable(True)
+        self.tip_to_tail_button.setCursor(Qt.PointingHandCursor)
+        self.tip_to_tail_button.setToolTip('Draw every vector tip to tail on the graph')
+        self.tip_to_tail_button.setStyleSheet("""
+            QPushButton {
+                background-color: #323232;
+                color: white;
+                border-radius: 8px;
+                border: 1px solid #3e3e3e;
+                padding: 10px 40px;
+            }
+            QPushButton:hover {
+                background-color: #3e3e3e;   
+            }
+            QPushButton:checked {
+                background-color: #4cc2ff;
+                border: 1px solid #52c4ff;
+            }
+        """)
+        self.tip_to_tail_button.toggled.connect(self.set_tip_to_tail) # This is the callback function when clicking it
+        self.button_layout.addWidget(self.tip_to_tail_button)
+
+        # Open and save, next to each other under LIVE
+        self.file_layout = QHBoxLayout()
+        for text, tip, callback in (('OPEN', 'Open a session or a vector file (Ctrl+O)', self.open_file_dialog),
+                                    ('SAVE', 'Save all the vectors (Ctrl+S)', self.save_file_dialog)):
+            button = QPushButton(text)
+            button.setCursor(Qt.PointingHandCursor)
+            button.setToolTip(tip)
+            button.setStyleSheet("""
+                QPushButton {
+                    background-color: #323232;
+                    color: white;
+                    border-radius: 8px;
+                    border: 1px solid #3e3e3e;
+                    padding: 10px 0px;
+                }
+                QPushButton:hover {
+                    background-color: #3e3e3e;   
+                }
+            """)
+            button.clicked.connect(callback)
+            self.file_layout.addWidget(button)
+        self.button_layout.addLayout(self.file_layout)
+
+        # Keyboard shortcuts. While a box is being edited Ctrl+V pastes into the box like normal
+        QShortcut(QKeySequence.Open, self, self.open_file_dialog)
+        QShortcut(QKeySequence.Save, self, self.save_file_dialog)
+        QShortcut(QKeySequence.Paste, self, self.paste_vectors)
+
+        self.input_layout.addWidget(self.vector_view, stretch=1)
         self.input_layout.addLayout(self.button_layout)
 
         self.layout.addLayout(self.input_layout) # Adds all the input elements onto the page
@@ -344,115 +435,138 @@ class Application(QWidget):
 
     # Button Methods
     def select_all_vectors(self):
-        for vector in self.vector_instances: # Iterates through every vector in the vector dictionary
-            vector_element = self.vector_instances[vector] # gets the value 
-            if not vector_element.check_element.isChecked(): # checks if the vector is not already checked
-                vector_element.widget.setStyleSheet('background-color: #0b57a3; border-radius: 10px;') # visually changes the appearence
-                vector_element.checked = True # Sets the checked variable of the class to TRUE
-                vector_element.check_element.setChecked(True) # Visually changes the element to be checked
+        self.vector_model.set_all_checked(True) # One change for all the vectors
                 
     def deselect_all_vectors(self):
-        for vector in self.vector_instances: # Iterates through every vector in the vector dictionary
-            vector_element = self.vector_instances[vector] # gets the value 
-            if vector_element.check_element.isChecked(): # checks if the vector is already checked
-                vector_element.widget.setStyleSheet('background-color: #2f2f2f; border-radius: 10px;') # visually changes the appearence
-                vector_element.checked = False # Sets the checked variable of the class to False
-                vector_element.check_element.setChecked(False) # Visually changes the element to not be checked
+        self.vector_model.set_all_checked(False)
 
+    @profiled
     def add_vector(self, index=None, initial_magnitude=None, initial_angle=None):
-        # Saves a Vector Class into the vector dictionary. A string is passed into the class to specify the name of the vector (Vector 1, 2, 5....)
-        # The naming count is used to make sure duplicate vector names aren't created in the dictionary
-        self.vector_instances[f'Vector {self.naming_count + 1}'] = Vector(f'Vector {self.instance_count + 1}')
-        # Get the vector object
-        vector = self.vector_instances[f'Vector {self.naming_count + 1}']
-        # Calls the init function to initialize the gui and show it
-        vector.init_vector()
-
-        # Prevents the vector from stretching out to fit the space
-        vector.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        vector.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-
-        # This is used when duplicating vectors 
-        if initial_magnitude != None and initial_magnitude != False:
-            vector.magnitude_input.setText(str(initial_magnitude))
-        
-        if initial_angle != None and initial_magnitude != False:
-            vector.angle_input.setText(str(initial_angle))
+        # This is used when duplicating vectors. Missing values leave the boxes empty
+        magnitude = parse_value(initial_magnitude)
+        angle = parse_value(initial_angle)
 
-        # If a specific index hasn't been supplied.. aka... duplicate function not being called, it sets it to the last index of the list
+        # If a specific index hasn't been supplied.. aka... duplicate function not being called, it is added at the end
         if not index:
-            index = len(self.vector_instances) - 1
-
-        self.vector_layout.insertWidget(index, vector)
-        self.instance_count += 1
-        self.naming_count += 1
-
+            index = None
+        self.vector_model.insert_vector(index, magnitude, angle)
 
     def delete_vector(self):
-        vectors_to_delete = []
-        for vector in self.vector_instances:
-            vector_element = self.vector_instances[vector]
-            if vector_element.checked == True:
-                self.vector_layout.removeWidget(vector_element) # Removes from layout
-                vector_element.deleteLater() # Deletes the object from memory
-                vectors_to_delete.append(vector) # Appends to list to delete from list later. It will throw error if updating list size during iteration
-        
-        # Deletes the vector from the list
-        for vector in vectors_to_delete:
-            del self.vector_instances[vector]
-
-        self.instance_count -= len(vectors_to_delete)
-        self.rename_vectors() # Makes sure the vectors are in numerical order
-
-    def rename_vectors(self):
-        count = 1
-        for vector in self.vector_instances:
-            vector_element = self.vector_instances[vector]
-            vector_element.name_element.setText(f'Vector {count}')
-            count += 1
+        # The list isn't redrawn until everything is deleted
+        self.vector_view.setUpdatesEnabled(False)
+        self.vector_model.remove_checked()
+        self.vector_view.setUpdatesEnabled(True)
 
     def duplicate_vector(self):
-        vectors_to_dupe = {}
-        for vector in self.vector_instances:
-            vector_element = self.vector_instances[vector]
-            if vector_element.checked == True:
-                list_of_vectors = list(self.vector_instances.keys())
-                index = list_of_vectors.index(vector)
-                vectors_to_dupe[index] = vector_element # Appends to list to add to vector list later. It will throw error if updating list size during iteration
-
-        # Adds to vector list
-        for index, vector in vectors_to_dupe.items():
-            self.add_vector(index + 1, vector.magnitude_input.text(), vector.angle_input.text())
+        self.vector_view.setUpdatesEnabled(False)
+        self.vector_model.duplicate_checked()
+        self.vector_view.setUpdatesEnabled(True)
 
+    # Fills the vector list from a VEC, NPY, CSV or JSON file of (angle, magnitude) rows. Returns how many were loaded
+    @profiled
+    def load_vector_file(self, path, replace=True):
+        try:
+            angles, magnitudes = load_vectors(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(e) # Printing out the exact error to the console
+            self.error_text('Could not open file')
+            return 0
+        self.vector_view.setUpdatesEnabled(False)
+        self.vector_model.load_vectors(magnitudes, angles, replace)
+        self.vector_view.setUpdatesEnabled(True)
+        return len(angles)
+
+    # Session and file methods. Everything is read first and then goes into the list in one go (see load_vectors)
+    def open_file_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Open vectors', '', 'Sessions and vector files (*.json *.vec *.csv *.npy);;All files (*)')
+        if path:
+            self.open_file(path)
+
+    # Sessions always replace the list, vector files can be added to it instead with replace=False
+    def open_file(self, path, replace=True):
+        if path.lower().endswith(SESSION_EXTENSION):
+            return self.load_session_file(path)
+        return self.load_vector_file(path, replace)
+
+    # Puts everything back the way it was saved: the vectors, which ones are checked and live mode
+    def load_session_file(self, path):
+        try:
+            session = load_session(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(e) # Printing out the exact error to the console
+            self.error_text('Could not open file')
+            return 0
+        self.vector_view.setUpdatesEnabled(False)
+        self.vector_model.load_vectors(session['magnitudes'], session['angles'], replace=True, checked=session['checked'])
+        self.vector_view.setUpdatesEnabled(True)
+        self.live.setChecked(session['live_mode'])
+        return len(session['angles'])
+
+    def save_file_dialog(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Save vectors', 'session.json', 'Sessions (*.json);;VEC files (*.vec);;CSV files (*.csv)')
+        if path:
+            self.save_file(path)
+
+    # The extension picks the format. Only sessions remember the empty boxes, the check boxes and live mode
+    def save_file(self, path):
+        store = self.vector_store
+        try:
+            # Vector files only get the filled in vectors, an empty box (NaN) would make every resultant NaN
+            filled = ~(np.isnan(store.angles) | np.isnan(store.magnitudes))
+            if path.lower().endswith('.vec'):
+                write_vec(path, store.angles[filled], store.magnitudes[filled])
+            elif path.lower().endswith('.csv'):
+                np.savetxt(path, np.column_stack((store.angles[filled], store.magnitudes[filled])), delimiter=',', header='angle,magnitude', comments='', fmt='%.17g')
+            else:
+                save_session(path, store, self.live_mode)
+        except (OSError, ValueError) as e:
+            print(e)
+            self.error_text('Could not save file')
+            return False
+        return True
+
+    # Ctrl+V with rows copied from a spreadsheet or a CSV file adds them all at the end of the list
+    @profiled
+    def paste_vectors(self):
+        try:
+            chunks = list(read_csv_text(QApplication.clipboard().text()))
+        except (ValueError, IndexError) as e:
+            print(e)
+            return self.error_text('Could not paste vectors')
+        if not chunks:
+            return 0
+        rows = np.concatenate(chunks)
+        self.vector_view.setUpdatesEnabled(False)
+        self.vector_model.load_vectors(rows[:, 1], rows[:, 0])
+        self.vector_view.setUpdatesEnabled(True)
+        return len(rows)
+
+    @profiled
     def calculate_vector(self):
-        xvalues = []
-        yvalues = []
-
         # Simple error checking
-        if len(self.vector_instances) == 0:
+        if self.vector_model.rowCount() == 0:
             return self.error_text('No vectors to add')
-        elif len(self.vector_instances) == 1:
+        elif self.vector_model.rowCount() == 1:
             return self.error_text('Need atleast 2 vectors')
-        
-        for vector in self.vector_instances:
-            vector_element = self.vector_instances[vector]
-            try:
-                magnitude = float(vector_element.magnitude_input.text())
-                angle = float(vector_element.angle_input.text())
-            except:
-                return self.error_text('Enter valid values') # If any given input is blank, it will error here
-
-            try: 
-                x, y = vector_fission(angle, magnitude) # Turns the vector into components <x, y>
-                xvalues.append(x)
-                yvalues.append(y)
-            except Exception as e:
-                self.error_text(str(e))
-
-        # All components are added to a seperate x and y list and then fused together
-        
+
+        magnitudes = self.vector_store.magnitudes
+        angles = self.vector_store.angles
+        if np.isnan(magnitudes).any() or np.isnan(angles).any():
+            return self.error_text('Enter valid values') # Some box is blank
+
+        # All the vectors are split into <x, y> components and added together in one batch
         try:
-            result_angle, result_magnitude = vector_addition(xvalues, yvalues) # Adds all the vectors and returns the result
+            result_angle, result_magnitude = resolve_vectors(angles, magnitudes) # Adds all the vectors and returns the result
+            self.show_result(result_angle, result_magnitude)
+        except Exception as e:
+           self.error_text(str(e))
+
+    # Displays a resultant in the output boxes and on the graph
+    @profiled
+    def show_result(self, result_angle, result_magnitude):
+        try:
+            # The graph gets the exact numbers, it picks its own scale
+            plot_angle, plot_magnitude = result_angle, result_magnitude
 
             result_angle = round(result_angle, 2) # Round to 2 decimal places
             result_magnitude = round(result_magnitude, 2) # Round to 2 decimal places
@@ -462,7 +576,8 @@ class Application(QWidget):
             self.magnitude_output.setText(str(result_magnitude)) # Sets gui text to the result
             self.angle_output.setText(str(result_angle)) # Sets gui text to the result
 
-            self.plot_vector(result_angle, result_magnitude) # Plots the vector on the graph
+            self.plot_vector(plot_angle, plot_magnitude) # Plots the vector on the graph
+            self.result_shown = True
 
             # Ensures the error styles are not displayed (red background and small text)
             self.magnitude_output.setStyleSheet("border: none; background-color: #323232; border-radius: 10px; padding: 0px 20px;")
@@ -470,6 +585,77 @@ class Application(QWidget):
         except Exception as e:
            self.error_text(str(e))
 
+    # Tip to tail mode: draws the result again so the graph switches right away
+    def set_tip_to_tail(self, enabled):
+        self.tip_to_tail = enabled
+        if self.live_mode:
+            self.schedule_live_refresh()
+        elif self.result_shown:
+            self.calculate_vector()
+
+    # Live mode methods
+    def set_live_mode(self, enabled):
+        self.live_mode = enabled
+        self.live_accumulator.clear()
+        self.live_invalid.clear()
+        if not enabled:
+            self.live_timer.stop()
+            return
+        # Scan all the vectors once. After this, every edit only touches its own vector
+        valid = ~(np.isnan(self.vector_store.magnitudes) | np.isnan(self.vector_store.angles))
+        self.live_accumulator.add_many(self.vector_store.ids[valid].tolist(), self.vector_store.angles[valid], self.vector_store.magnitudes[valid])
+        self.live_invalid.update(self.vector_store.ids[~valid].tolist())
+        self.schedule_live_refresh()
+
+    # Called whenever vectors change or are added. Only those vectors are replaced in the running sums
+    def vector_rows_changed(self, top_left, bottom_right, roles=None):
+        if not self.live_mode:
+            return
+        if roles and not set(roles) & {Qt.EditRole, VALUE_ROLE}:
+            return # Just checked or unchecked, the values are the same
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            key = int(self.vector_store.ids[row])
+            magnitude = self.vector_store.magnitudes[row]
+            angle = self.vector_store.angles[row]
+            if math.isnan(magnitude) or math.isnan(angle):
+                self.live_forget(key)
+                self.live_invalid.add(key)
+            elif key in self.live_accumulator.components:
+                self.live_accumulator.update(key, angle, magnitude)
+            else:
+                self.live_invalid.discard(key)
+                self.live_accumulator.add(angle, magnitude, key)
+        self.schedule_live_refresh()
+
+    def vector_rows_removed(self, parent, first, last):
+        if not self.live_mode:
+            return
+        for key in self.vector_store.ids[first:last + 1]:
+            self.live_forget(int(key))
+
+    def live_forget(self, key):
+        self.live_invalid.discard(key)
+        if key in self.live_accumulator.components:
+            self.live_accumulator.remove(key)
+
+    # Edits made while the timer is running are picked up by the refresh that is already scheduled
+    def schedule_live_refresh(self, *args):
+        if self.live_mode and not self.live_timer.isActive():
+            self.live_timer.start()
+
+    @profiled
+    def refresh_live_result(self):
+        if not self.live_mode:
+            return
+        # Same checks as the equals button
+        if self.vector_model.rowCount() == 0:
+            return self.error_text('No vectors to add')
+        elif self.vector_model.rowCount() == 1:
+            return self.error_text('Need atleast 2 vectors')
+        elif self.live_invalid:
+            return self.error_text('Enter valid values')
+        self.show_result(*self.live_accumulator.resultant())
+
     # Scientific notation function
     def sci_notation(self, value):
         if abs(value) >= 1e8 or abs(value) < 1e-8:
@@ -478,89 +664,61 @@ class Application(QWidget):
             formatted_text = value
         return formatted_text
 
+    # The first time the window is drawn, the graph gets loaded right after
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.graph_placeholder is not None and not self.graph_scheduled:
+            self.graph_scheduled = True
+            QTimer.singleShot(0, self.init_graph)
+
+    # Puts the real graph where the placeholder was. Its drawing thread starts with the first plot
+    def init_graph(self):
+        if self.final_graph is not None:
+            return
+        from gui.render import ResultantGraph
+
+        # It is built once, plot_vector only sends it the new vector
+        self.final_graph = ResultantGraph()
+        self.final_graph.setFixedSize(QSize(self.graph_size, self.graph_size))
+        self.canvas_layout.replaceWidget(self.graph_placeholder, self.final_graph)
+        self.graph_placeholder.deleteLater()
+        self.graph_placeholder = None
+
+        if self.pending_plot is not None:
+            self.plot_vector(*self.pending_plot)
+            self.pending_plot = None
+
     # Graphing function
+    @profiled
     def plot_vector(self, angle, magnitude, initial=False):
         try:
             float(angle)
             float(magnitude)
         except Exception as e:
             return self.error_text(str(e))
+
+        if self.final_graph is None:
+            # The graph isn't loaded yet. init_graph plots the latest vector once it is
+            self.pending_plot = (angle, magnitude, initial)
+            return
         
         # Initial value means there is nothing to plot. It is just setting up the coordinate system and labels so its not blank
-        try:
-            if initial==True:
-                magnitude = 0
-                angle = 0
-
-            angle_rad = np.deg2rad(angle) # Convert the angle from degrees to radians
-            x = magnitude * np.cos(angle_rad) # The cosine of the angle gives the horizontal component
-            y = magnitude * np.sin(angle_rad) # The sine of the angle gives the vertical component
+        if initial==True:
+            magnitude = 0
+            angle = 0
 
-            # Clear previous plot
-            self.final_graph.figure.clear()
+        # In tip to tail mode the graph gets every vector too. Copies, because it reads them in its own thread
+        vectors = None
+        if self.tip_to_tail and not initial:
+            vectors = (self.vector_store.angles.copy(), self.vector_store.magnitudes.copy())
 
-            # Create a new subplot
-            self.ax = self.final_graph.figure.add_subplot(111)
-
-            # Set axis limits with additional margin
-            if magnitude == 0:
-                margin = 0.2
-            else:
-                margin = 0.2 * magnitude
-            # this prevents the labels from going offscreen. It puts them in the correct place
-            self.ax.set_xlim(-magnitude - margin - 1, magnitude + margin + 1)
-            self.ax.set_ylim(-magnitude - margin - 1, magnitude + margin + 1)
-
-            # Set aspect ratio to be equal
-            self.ax.set_aspect('equal')
-
-            # Draw X and Y axes (coordinate plane)
-            self.ax.axhline(0, color='white', linewidth=1)
-            self.ax.axvline(0, color='white', linewidth=1)
-
-            self.ax.set_title('Final Vector Graph', color='white') # Nice title
-
-            # Hide spines (This is a box outline along the graph. It doesn't look good)
-            self.ax.spines['top'].set_visible(False)
-            self.ax.spines['right'].set_visible(False)
-            self.ax.spines['left'].set_visible(False)
-            self.ax.spines['bottom'].set_visible(False)
-
-            # Remove grid lines
-            self.ax.grid(False) # These grid lines are for charts. Not needed here
-
-            # Set ticks and labels
-            self.ax.set_xticks([0, magnitude])
-            self.ax.set_yticks([0, magnitude])
-            self.ax.set_xticklabels([str(0), str(magnitude)])
-            self.ax.set_yticklabels([str(0), str(magnitude)])
-            self.ax.tick_params(axis='both', colors='white', which='both', width=0)  # Hide tick lines
-
-            # Set background color for the axes and figure
-            self.figure.patch.set_facecolor('#323232')
-            self.ax.set_facecolor('#323232')
-
-            # Draw the updated plot
-            # Arrow and line
-            self.ax.plot([0, x], [0, y], color='green', linestyle='-', linewidth=2)
-            self.ax.quiver(0, 0, x, y, angles='xy', scale_units='xy', scale=.9, color='green',  # Quiver is an arrow
-                    width=0.01, headwidth=7, headlength=6, headaxislength=4)  # I played around with these values to draw a nice arrow
-
-            self.final_graph.draw()
-        except Exception as e:
-            # In case of error.
-            # This specific error occurs when the number is very large. Not sure why
-            # I handle it gracefully by displaying an error box
-            msg_box = QMessageBox()
-            msg_box.setIcon(QMessageBox.Information)
-            msg_box.setText(f"Cannot graph vector for large numbers")
-            msg_box.setWindowTitle("Information")
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.exec_()
-            print(e) # Printing out the exact error to the console
+        # Any number can be graphed (huge ones get a scale like x10^12, NaN and infinity just show as text),
+        # so there is no error to handle here anymore
+        self.final_graph.set_vector(float(angle), float(magnitude), vectors=vectors)
 
     # Function to set the output text when the user did not input values correctly
     def error_text(self, text):
+        self.result_shown = False
         self.magnitude_output.setStyleSheet("border: none; background-color: #7b200e; border-radius: 10px; padding: 0px 20px; font-size: 21px")
         self.angle_output.setStyleSheet("border: none; background-color: #7b200e; border-radius: 10px; padding: 0px 20px; font-size: 21px")
 
@@ -569,6 +727,12 @@ class Application(QWidget):
 
         self.plot_vector(0, 0, initial=True) # Plots dummy vector
 
+    # Stops the graph's drawing thread
+    def closeEvent(self, event):
+        if self.final_graph is not None:
+            self.final_graph.stop()
+        super().closeEvent(event)
+
     # This removes focus from output line edits when clicking off of them. PyQt5 does not do this by deault
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -576,13 +740,3 @@ class Application(QWidget):
                 self.magnitude_output.setFocus(False) # Remove focus
                 self.angle_output.setFocus(False)
         super().mousePressEvent(event) # Call the super function made by the library
-
-    # This is needed so that the exe works. Otherwise it wont be able to find the images
-    def get_absolute_path(self, file_name):
-        try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-            base_path = sys._MEIPASS
-        except Exception:
-            base_path = os.path.abspath(".")
-
-        return os.path.join(base_path, file_name)
\ No newline at end of file
@@ -0,0 +1,252 @@
+# The big resultant graph in the main window
+# The axes, title, colors and coordinate lines are set up once. After that an update only moves the line, the arrow
+# and the two tick labels and blits them over a saved copy of the background, instead of clearing the whole figure
+# and drawing everything again.
+#
+# To make that possible the graph is drawn in "normalized" units: the axis limits are always -1 to 1 and the vector is
+# scaled to fit, exactly like the old plot did by setting the limits to the magnitude plus a margin.
+#
+# Tip to tail mode also draws every input vector, each one starting where the one before it ended, so the resultant
+# closes the polygon. The whole chain is one LineCollection over the running sums of the components (not one artist
+# per vector). With lots of vectors the chain has far more corners than the graph has pixels, so it is thinned out
+# first (see decimate_path) and 100k vectors draw as fast as a few thousand.
+#
+# Any size of number can be drawn: the tick shows the value brought into 1 to 1000 with a power of ten that is a
+# multiple of 3 (engineering notation), and that power is shown once as a scale label in the corner, like "×10³ (k)"
+# (the prefix in brackets is only a reminder of its name). So the real value is always tick × corner label.
+# NaN and infinity just show as text with no arrow.
+#
+# ResultantArtists is the drawing itself and works on any figure. ResultantScene draws it with plain Agg into a
+# picture in memory. Nothing in here imports Qt, so it can run in a background thread (see gui/render.py).
+import math
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from add import vector_fission_batch
+
+BACKGROUND_COLOR = '#323232'
+VECTOR_COLOR = 'green'
+PATH_COLOR = '#2589d8' # Same blue as the lines in the vector list
+PATH_LENGTH = 1 / 1.2 # The chain fills the same part of the axes as a resultant does
+MAX_PATH_POINTS = 4000 # Corners of the chain that get drawn, more than that is thinned out
+MAX_ARROW_HEADS = 100 # Every input vector gets an arrow head when there are only a few of them
+PREFIXES = {-24: 'y', -21: 'z', -18: 'a', -15: 'f', -12: 'p', -9: 'n', -6: 'µ', -3: 'm', 0: '',
+            3: 'k', 6: 'M', 9: 'G', 12: 'T', 15: 'P', 18: 'E', 21: 'Z', 24: 'Y'}
+
+
+# How much of the half axis the vector takes up. The old plot used limits of magnitude + 20% margin + 1
+# Written as 1 / (1.2 + 1 / magnitude) so huge magnitudes can't overflow, it just gets closer and closer to 1 / 1.2
+def normalized_length(magnitude):
+    magnitude = abs(magnitude)
+    if magnitude == 0:
+        return 0.0
+    return 1 / (1.2 + 1 / magnitude)
+
+
+# values / 10 ** exponent, in two steps so it works for exponents where 10 ** exponent itself over or underflows
+def scale_down(values, exponent):
+    half = exponent // 2
+    return values / 10.0 ** half / 10.0 ** (exponent - half)
+
+
+# The power of ten (a multiple of 3) that brings value into 1 to 1000, and its prefix ('' past yocto/yotta)
+def engineering_scale(value):
+    value = abs(float(value))
+    if value == 0 or not math.isfinite(value):
+        return 0, ''
+    exponent = math.floor(math.log10(value) / 3) * 3
+    # log10 can be a tiny bit off right at a power of ten
+    if scale_down(value, exponent) >= 1000:
+        exponent += 3
+    elif scale_down(value, exponent) < 1:
+        exponent -= 3
+    return exponent, PREFIXES.get(exponent, '')
+
+
+# Thins out a long path to about max_points corners, keeping its shape: the points are split into buckets and only the
+# leftmost, rightmost, lowest and highest point of every bucket are kept (in order), so spikes don't disappear the way
+# they would by just taking every n-th point. The first and last points always stay
+def decimate_path(x_points, y_points, max_points=MAX_PATH_POINTS):
+    count = len(x_points)
+    if count <= max_points:
+        return x_points, y_points
+    size = math.ceil(count / (max_points // 4))
+    buckets = count // size
+    end = buckets * size
+    x_buckets = x_points[:end].reshape(buckets, size)
+    y_buckets = y_points[:end].reshape(buckets, size)
+    picks = np.stack((x_buckets.argmin(axis=1), x_buckets.argmax(axis=1), y_buckets.argmin(axis=1), y_buckets.argmax(axis=1)), axis=1)
+    picks += np.arange(0, end, size)[:, np.newaxis]
+    # unique also sorts, so the points stay in path order. The leftover points after the last full bucket stay as they are
+    indices = np.unique(np.concatenate(([0], picks.ravel(), np.arange(end, count), [count - 1])))
+    return x_points[indices], y_points[indices]
+
+
+# The axes and the moving parts of the graph
+class ResultantArtists:
+    def __init__(self, figure, title='Final Vector Graph'):
+        self.ax = figure.add_subplot(111)
+        self.ax.set_xlim(-1, 1)
+        self.ax.set_ylim(-1, 1)
+        self.ax.set_aspect('equal')
+
+        # Draw X and Y axes (coordinate plane)
+        self.ax.axhline(0, color='white', linewidth=1)
+        self.ax.axvline(0, color='white', linewidth=1)
+        self.ax.set_title(title, color='white')
+
+        # Hide spines, grid and the real ticks. The tick labels are our own text artists (below) so they can be blitted
+        for spine in self.ax.spines.values():
+            spine.set_visible(False)
+        self.ax.grid(False)
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+
+        # Set background color for the axes and figure
+        figure.patch.set_facecolor(BACKGROUND_COLOR)
+        self.ax.set_facecolor(BACKGROUND_COLOR)
+
+        # The moving parts. animated=True keeps them out of the normal draw, they are drawn on top of the saved background
+        self.line, = self.ax.plot([0, 0], [0, 0], color=VECTOR_COLOR, linestyle='-', linewidth=2, animated=True)
+        self.arrow = self.ax.quiver(0, 0, 0, 0, angles='xy', scale_units='xy', scale=.9, color=VECTOR_COLOR,
+                width=0.01, headwidth=7, headlength=6, headaxislength=4, animated=True)
+
+        # Tick labels at 0 and at the magnitude, just outside the bottom and left edge of the axes
+        x_ticks = self.ax.get_xaxis_transform() # x in data units, y in axes units
+        y_ticks = self.ax.get_yaxis_transform() # x in axes units, y in data units
+        self.x_zero_label = self.ax.text(0, -0.03, '0', transform=x_ticks, color='white', ha='center', va='top', animated=True)
+        self.x_label = self.ax.text(0, -0.03, '0', transform=x_ticks, color='white', ha='center', va='top', animated=True)
+        self.y_zero_label = self.ax.text(-0.03, 0, '0', transform=y_ticks, color='white', ha='right', va='center', animated=True)
+        self.y_label = self.ax.text(-0.03, 0, '0', transform=y_ticks, color='white', ha='right', va='center', animated=True)
+        # The scale of the numbers, like "×10³ (k)", in the top right corner. Empty when there is no scale
+        self.scale_label = self.ax.text(0.99, 0.99, '', transform=self.ax.transAxes, color='#aaaaaa', fontsize=9,
+                ha='right', va='top', animated=True)
+        for label in (self.x_zero_label, self.x_label, self.y_zero_label, self.y_label):
+            label.set_clip_on(False)
+
+        # Tip to tail chain, empty unless there are vectors to show. Drawn under the resultant
+        self.path = LineCollection([], colors=PATH_COLOR, linewidths=1.5, animated=True)
+        self.ax.add_collection(self.path)
+        self.heads = None # Quiver with the arrow heads of the input vectors, made again for every chain
+        self.animated_artists = [self.path, self.line, self.arrow, self.x_zero_label, self.x_label, self.y_zero_label,
+                self.y_label, self.scale_label]
+
+    def draw_animated(self):
+        if self.heads is not None:
+            self.ax.draw_artist(self.heads)
+        for artist in self.animated_artists:
+            self.ax.draw_artist(artist)
+
+    # The magnitude ticks at tick (normalized units) and the scale label for exponent
+    def set_ticks(self, tick, text, exponent=0, prefix=''):
+        self.x_label.set_x(tick)
+        self.x_label.set_text(text)
+        self.y_label.set_y(tick)
+        self.y_label.set_text(text)
+        # A tiny vector puts its tick right on top of the 0
+        self.x_zero_label.set_visible(tick > 0.1)
+        self.y_zero_label.set_visible(tick > 0.1)
+        if exponent == 0:
+            self.scale_label.set_text('')
+        else:
+            self.scale_label.set_text(rf'$\times10^{{{exponent}}}$' + (f' ({prefix})' if prefix else ''))
+
+    # Moves the vector. label is the text shown at the magnitude tick, by default the magnitude in its scale
+    # vectors can be (angles, magnitudes) of the input vectors to draw them tip to tail, None shows only the resultant
+    def set_vector(self, angle, magnitude, label=None, vectors=None):
+        if self.heads is not None:
+            self.heads.remove()
+            self.heads = None
+        if vectors is not None:
+            return self.set_chain(*vectors)
+        self.path.set_segments([])
+        angle = float(angle)
+        magnitude = float(magnitude)
+        if not (math.isfinite(angle) and math.isfinite(magnitude)):
+            # No arrow for that, the tick just says what the number is
+            self.line.set_data([0, 0], [0, 0])
+            self.arrow.set_UVC(0, 0)
+            return self.set_ticks(PATH_LENGTH, str(label if label is not None else magnitude))
+
+        # The length comes from the real magnitude, so the arrow doesn't jump when the scale label changes
+        length = normalized_length(magnitude) * math.copysign(1, magnitude)
+        angle_rad = math.radians(angle)
+        x = length * math.cos(angle_rad) # The cosine of the angle gives the horizontal component
+        y = length * math.sin(angle_rad) # The sine of the angle gives the vertical component
+
+        self.line.set_data([0, x], [0, y])
+        self.arrow.set_UVC(x, y)
+        if label is not None:
+            return self.set_ticks(abs(length), str(label)) # The caller's own text, so no scale label
+        exponent, prefix = engineering_scale(magnitude)
+        scaled = scale_down(magnitude, exponent) # 1 to 1000 (or 0)
+        self.set_ticks(abs(length), f'{scaled:.4g}', exponent, prefix)
+
+    # Tip to tail: the running sums of the components are the corners of the chain and the last one is the resultant.
+    # Unlike a single resultant the chain is scaled linearly, so the vectors keep their sizes relative to each other
+    def set_chain(self, angle_degrees, magnitudes):
+        angle_degrees = np.asarray(angle_degrees, dtype=np.float64)
+        magnitudes = np.asarray(magnitudes, dtype=np.float64)
+        valid = np.isfinite(angle_degrees) & np.isfinite(magnitudes)
+        # Scaled by the biggest vector first, so adding up huge vectors can't overflow
+        exponent, _ = engineering_scale(np.max(np.abs(magnitudes[valid]), initial=0.0))
+        x_values, y_values = vector_fission_batch(angle_degrees[valid], scale_down(magnitudes[valid], exponent))
+        x_points = np.concatenate(([0.0], np.cumsum(x_values)))
+        y_points = np.concatenate(([0.0], np.cumsum(y_values)))
+
+        # Then the units are picked so the furthest corner of the chain is 1 to 1000
+        extent = max(np.max(np.abs(x_points)), np.max(np.abs(y_points)))
+        extent_exponent, _ = engineering_scale(extent)
+        extent = scale_down(extent, extent_exponent)
+        exponent += extent_exponent
+        scale = PATH_LENGTH / extent if extent > 0 and math.isfinite(extent) else 0.0
+        x_points *= scale
+        y_points *= scale
+
+        if len(x_values) <= MAX_ARROW_HEADS:
+            self.heads = self.ax.quiver(x_points[:-1], y_points[:-1], np.diff(x_points), np.diff(y_points), angles='xy',
+                    scale_units='xy', scale=1, color=PATH_COLOR, width=0.006, headwidth=6, headlength=6,
+                    headaxislength=5, animated=True)
+        x_path, y_path = decimate_path(x_points, y_points)
+        points = np.column_stack((x_path, y_path))
+        self.path.set_segments(np.stack((points[:-1], points[1:]), axis=1))
+
+        # The resultant goes from the start of the chain to its end. It is scaled so it reaches the tip exactly
+        self.line.set_data([0, x_points[-1]], [0, y_points[-1]])
+        self.arrow.set_UVC(x_points[-1] * 0.9, y_points[-1] * 0.9)
+
+        # The ticks show how big the furthest corner of the chain is
+        prefix = PREFIXES.get(exponent, '')
+        self.set_ticks(PATH_LENGTH, f'{extent:.4g}', exponent, prefix)
+
+
+# The graph drawn with Agg into memory. render returns the RGBA pixels
+class ResultantScene:
+    def __init__(self, title='Final Vector Graph'):
+        self.figure = Figure()
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.artists = ResultantArtists(self.figure, title)
+        self.background = None
+
+    # Size in pixels. Changing it means the background has to be drawn again
+    def resize(self, width, height, dpi):
+        if (width, height, dpi) != (*self.canvas.get_width_height(), self.figure.dpi):
+            self.figure.set_dpi(dpi)
+            self.figure.set_size_inches(width / dpi, height / dpi)
+            self.background = None
+
+    # Width, height and the pixels of the graph with the vector in it (a buffer that the next render overwrites)
+    def render(self, angle, magnitude, label=None, vectors=None):
+        self.artists.set_vector(angle, magnitude, label, vectors)
+        if self.background is None:
+            self.canvas.draw() # Everything except the moving parts
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        else:
+            self.canvas.restore_region(self.background)
+        self.artists.draw_animated()
+        width, height = self.canvas.get_width_height()
+        return width, height, self.canvas.buffer_rgba()
+
@@ -0,0 +1,108 @@
+# The resultant graph, drawn in a background thread
+# Drawing with matplotlib takes milliseconds (and much longer the first time, when matplotlib gets imported), and that
+# used to happen right inside the signal handlers, so typing had to wait for the graph. Now the UI thread only hands
+# the newest vector to a worker thread. The worker draws it with Agg (see ResultantScene in gui/plot.py) into a
+# QImage and sends it back, and the widget just paints that picture.
+# The worker only ever has room for one waiting vector: a newer one replaces it. So when vectors come in faster than
+# they can be drawn, the frames in between are skipped and the graph catches up with the newest one, instead of
+# drawing every old frame one after the other. A frame that arrives after a newer one was already shown is dropped.
+import threading
+
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import QRect, pyqtSignal
+
+from profiling import profiled, span
+
+BACKGROUND_COLOR = QColor('#323232')
+
+
+class ResultantGraph(QWidget):
+    frame_ready = pyqtSignal(int, QImage) # Sent from the worker thread, Qt delivers it in the UI thread
+
+    def __init__(self, title='Final Vector Graph', parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.vector = (0.0, 0.0, None, None) # The newest (angle, magnitude, label, vectors)
+        self.pixmap = None # The newest finished frame
+        self.frame = 0 # Number of the newest vector asked for
+        self.shown_frame = 0 # Number of the frame in self.pixmap
+
+        self.request = None # The vector waiting to be drawn: (frame, angle, magnitude, label, vectors, width, height, dpi)
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.thread = None
+        self.frame_ready.connect(self.show_frame)
+
+    # Shows angle and magnitude (see ResultantArtists.set_vector in gui/plot.py), but returns right away. The graph
+    # changes once the frame is drawn
+    # vectors (angles, magnitudes) are read by the worker thread later, so pass arrays that won't change (copies)
+    def set_vector(self, angle, magnitude, label=None, vectors=None):
+        self.vector = (float(angle), float(magnitude), label, vectors)
+        self.frame += 1
+        ratio = self.devicePixelRatioF()
+        with self.condition:
+            self.request = (self.frame, *self.vector, round(self.width() * ratio), round(self.height() * ratio), 100 * ratio)
+            self.condition.notify()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.render_loop, name='graph-render', daemon=True)
+            self.thread.start()
+
+    # Runs in the worker thread
+    def render_loop(self):
+        from gui.plot import ResultantScene # matplotlib is only ever loaded in this thread
+        scene = ResultantScene(self.title)
+        while True:
+            with self.condition:
+                while self.request is None and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                request, self.request = self.request, None
+            frame, angle, magnitude, label, vectors, width, height, dpi = request
+            with span('render_frame', 'gui.render', frame=frame, vectors=0 if vectors is None else len(vectors[0])):
+                try:
+                    scene.resize(max(width, 1), max(height, 1), dpi)
+                    width, height, pixels = scene.render(angle, magnitude, label, vectors)
+                except Exception as e:
+                    # The old frame stays on screen. The thread has to keep going for the next vector
+                    print(e)
+                    continue
+                # copy, because the scene draws the next frame into the same memory
+                image = QImage(pixels, width, height, QImage.Format_RGBA8888).copy()
+                image.setDevicePixelRatio(dpi / 100)
+            try:
+                self.frame_ready.emit(frame, image)
+            except RuntimeError: # The widget has been deleted
+                return
+
+    @profiled
+    def show_frame(self, frame, image):
+        if frame < self.shown_frame:
+            return # Older than what is already on screen
+        self.shown_frame = frame
+        self.pixmap = QPixmap.fromImage(image)
+        self.update()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND_COLOR)
+        if self.pixmap is not None:
+            # The picture was drawn for this size, it only gets scaled while a frame for a new size is on its way
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+            painter.drawPixmap(QRect(0, 0, self.width(), self.height()), self.pixmap)
+        painter.end()
+
+    # A new size needs a new picture. Until it arrives the old one gets stretched
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.thread is not None:
+            self.set_vector(*self.vector)
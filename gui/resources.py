@@ -0,0 +1,29 @@
+# Images used by the gui
+# Every image is read from disk once and then shared, no matter how many widgets or rows use it
+import os, sys
+from functools import lru_cache
+
+from PyQt5.QtGui import QPixmap, QIcon
+
+IMAGE_PATH = 'images'
+
+
+# This is needed so that the exe works. Otherwise it wont be able to find the images
+def get_absolute_path(file_name):
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+
+    return os.path.join(base_path, file_name)
+
+
+@lru_cache(maxsize=None)
+def get_pixmap(name):
+    return QPixmap(get_absolute_path(f'{IMAGE_PATH}/{name}'))
+
+
+@lru_cache(maxsize=None)
+def get_icon(name):
+    return QIcon(get_pixmap(name))
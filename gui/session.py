@@ -0,0 +1,60 @@
+# Saving and opening sessions: every vector in the list (empty boxes too), which ones are checked and whether live
+# mode is on. Nothing in here uses Qt, it only reads and writes the arrays of a VectorStore.
+# A session is a JSON file that is also a normal vector file, so cli.py can read it:
+#   {"version": 1, "live_mode": false, "vectors": [[angle, magnitude], ...], "checked": [false, ...]}
+# Empty boxes are saved as null. cli.py stops at those with an error naming the vector (just like "=" in the GUI
+# asks for valid values), so fill them in or delete them first.
+import json
+import os
+
+import numpy as np
+
+SESSION_VERSION = 1
+SESSION_EXTENSION = '.json'
+
+
+# Numbers for JSON, with NaN (an empty box) as None
+def _json_values(values):
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def save_session(path, store, live_mode=False):
+    session = {
+        'version': SESSION_VERSION,
+        'live_mode': bool(live_mode),
+        'vectors': [list(pair) for pair in zip(_json_values(store.angles), _json_values(store.magnitudes))],
+        'checked': store.checked.tolist(),
+    }
+    # Written next to the old file first and then swapped in, so a crash while saving can't eat the old session
+    temporary_path = path + '.saving'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(session, file)
+    os.replace(temporary_path, path)
+
+
+# Returns a dict with angles, magnitudes and checked (NumPy arrays) and live_mode
+def load_session(path):
+    with open(path, encoding='utf-8') as file:
+        session = json.load(file)
+    if isinstance(session, list): # A plain list of vectors works too
+        session = {'vectors': session}
+    if not isinstance(session, dict) or session.get('version', SESSION_VERSION) > SESSION_VERSION:
+        raise ValueError(f'{path}: not a session this program understands')
+    try:
+        pairs = [(item['angle'], item['magnitude']) if isinstance(item, dict) else tuple(item) for item in session.get('vectors', [])]
+        rows = np.array(pairs, dtype=np.float64) # None turns into NaN
+    except (KeyError, TypeError, ValueError):
+        rows = None
+    if rows is not None and rows.shape == (0,):
+        rows = rows.reshape(0, 2)
+    if rows is None or rows.ndim != 2 or rows.shape[1] != 2:
+        raise ValueError(f'{path}: "vectors" must be a list of [angle, magnitude] pairs')
+    checked = np.array(session.get('checked', []), dtype=bool)
+    if checked.shape != (len(rows),):
+        checked = np.zeros(len(rows), dtype=bool)
+    return {
+        'angles': rows[:, 0].copy(),
+        'magnitudes': rows[:, 1].copy(),
+        'checked': checked,
+        'live_mode': bool(session.get('live_mode', False)),
+    }
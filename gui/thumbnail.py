@@ -0,0 +1,56 @@
+# Small vector preview drawn straight with QPainter
+# This used to be a whole matplotlib figure per vector, which is a lot of memory and time for a 100 x 100 picture.
+# It draws the same thing: white axes through the middle, a blue line and a green arrow head
+import math
+
+from PyQt5.QtGui import QPainter, QColor, QPen, QPolygonF
+from PyQt5.QtCore import Qt, QPointF
+
+BACKGROUND_COLOR = QColor('#323232')
+AXIS_PEN = QPen(QColor('white'), 1)
+LINE_PEN = QPen(QColor('#2589d8'), 2, Qt.SolidLine, Qt.RoundCap)
+ARROW_COLOR = QColor('green')
+
+PLOT_FRACTION = 0.78 # Part of the widget used by the axes, the rest is empty border like matplotlib's margins
+LINE_LENGTH = 1 / 1.2 # The old plot had limits of +-1.2 * magnitude, so the vector always reached 1 / 1.2 of the way out
+ARROW_LENGTH = LINE_LENGTH / 0.9 # The quiver arrow was drawn with scale=0.9, so it sticks out a little past the line
+HEAD_LENGTH = 8
+HEAD_WIDTH = 10
+
+
+# Draws the preview of one vector into rect
+def paint_vector_thumbnail(painter, rect, angle, magnitude):
+    painter.save()
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    painter.fillRect(rect, BACKGROUND_COLOR)
+
+    center = QPointF(rect.center())
+    half_size = min(rect.width(), rect.height()) * PLOT_FRACTION / 2
+
+    # Axes
+    painter.setPen(AXIS_PEN)
+    painter.drawLine(QPointF(center.x() - half_size, center.y()), QPointF(center.x() + half_size, center.y()))
+    painter.drawLine(QPointF(center.x(), center.y() - half_size), QPointF(center.x(), center.y() + half_size))
+
+    if magnitude and math.isfinite(magnitude) and math.isfinite(angle):
+        # Only the direction matters, the size is always scaled to fit. A negative magnitude points the other way
+        angle_rad = math.radians(angle)
+        direction_x = math.cos(angle_rad) * math.copysign(1, magnitude)
+        direction_y = -math.sin(angle_rad) * math.copysign(1, magnitude) # Screen y goes down
+
+        line_tip = QPointF(center.x() + direction_x * half_size * LINE_LENGTH, center.y() + direction_y * half_size * LINE_LENGTH)
+        arrow_tip = QPointF(center.x() + direction_x * half_size * ARROW_LENGTH, center.y() + direction_y * half_size * ARROW_LENGTH)
+
+        painter.setPen(LINE_PEN)
+        painter.drawLine(center, line_tip)
+
+        # Arrow head: a triangle with its point at the tip
+        base = QPointF(arrow_tip.x() - direction_x * HEAD_LENGTH, arrow_tip.y() - direction_y * HEAD_LENGTH)
+        normal_x, normal_y = -direction_y * HEAD_WIDTH / 2, direction_x * HEAD_WIDTH / 2
+        head = QPolygonF([arrow_tip, QPointF(base.x() + normal_x, base.y() + normal_y), QPointF(base.x() - normal_x, base.y() - normal_y)])
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(ARROW_COLOR)
+        painter.drawPolygon(head)
+
+    painter.restore()
+
@@ -1,213 +1,243 @@
-# PyQt5 imports
-from PyQt5.QtGui import QPixmap, QIntValidator
-from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget, QHBoxLayout, QLineEdit, QCheckBox
-from PyQt5.QtCore import Qt, QSize
-
-# Math imports
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-
-import os, sys
-
-# Vector class
-class Vector(QWidget):
-    def __init__(self, name):
-        super().__init__()
-
-        # Name of the label
-        self.name = name
-
-        # Checked state
-        self.checked = False
-
-    def init_vector(self):
-        # Main layout
-        self.widget_layout = QVBoxLayout()
-
-        # Main widget with the main layout
-        self.widget = QWidget()
-        self.widget.setLayout(self.widget_layout)
-
-        self.widget.setStyleSheet(
-            "background-color: #2f2f2f; border-radius: 15px; border: 3px solid #323232"
-        )
-
-        # Pointing cursor. When clicking this element, it highlights it
-        self.setCursor(Qt.PointingHandCursor)
-
-        # Top and bottom layouts
-        self.top_layout = QHBoxLayout()
-        self.bottom_layout = QHBoxLayout()
-
-        # This is the name. We use self.name variable here
-        self.name_element = QLabel(self.name)
-        self.name_element.setStyleSheet('border: none;') # Turns off the default border
-        self.top_layout.addWidget(self.name_element, stretch=1) # This allows it to take up space
-
-        # Checkbox for when clicking the element
-        self.check_element = QCheckBox()
-        self.check_element.setStyleSheet('border: none;')
-        self.check_element.setAttribute(Qt.WA_TransparentForMouseEvents, True) # No mouse events
-
-        self.top_layout.addWidget(self.check_element)
-        
-        self.left_layout = QVBoxLayout()
-
-        # Graph container
-        self.canvas_container = QWidget(self)
-        self.canvas_container.setStyleSheet(
-            "background-color: #323232; border-radius: 10px; padding: 10px; border: none;")
-        self.canvas_container.setAttribute(Qt.WA_TransparentForMouseEvents, True) # No mouse events
-
-        # Graph
-        self.figure, self.ax = plt.subplots()
-        self.final_graph = FigureCanvas(self.figure)
-        
-        # Set the size of the container and the canvas
-        self.graph_size = int(100)
-        self.final_graph.setFixedSize(QSize(self.graph_size, self.graph_size))
-
-        container_layout = QVBoxLayout()
-        container_layout.addWidget(self.final_graph)
-        self.canvas_container.setLayout(container_layout)
-        self.left_layout.addWidget(self.canvas_container, stretch=2)
-
-        self.right_layout = QVBoxLayout()
-
-        self.magnitude_input_layout = QHBoxLayout()
-        self.magnitude_icon = QLabel()
-        self.magnitude_icon.setPixmap(QPixmap(self.get_absolute_path('images/magnitude.png')))
-        self.magnitude_icon.setStyleSheet('border: none;')
-        self.magnitude_icon.setFixedWidth(40)
+# The vector list
+# Every vector used to be its own QWidget with layouts, labels, line edits and a graph. Now the vectors are rows in
+# VectorListModel and this file draws them: the delegate paints the card of each visible row (name, checkbox, preview
+# graph and the two input boxes) and only the row that is being typed in gets real QLineEdits.
+from PyQt5.QtGui import QIntValidator, QPainter, QColor, QPen, QPainterPath
+from PyQt5.QtWidgets import (QVBoxLayout, QWidget, QLineEdit, QTableView, QStyledItemDelegate, QAbstractItemView,
+        QAbstractItemDelegate, QStyleOptionButton, QStyle, QApplication, QHeaderView)
+from PyQt5.QtCore import Qt, QSize, QRect, QRectF, QEvent
+
+from gui.resources import get_pixmap
+from gui.thumbnail import paint_vector_thumbnail
+from gui.vector_model import MAGNITUDE_COLUMN, ANGLE_COLUMN, VALUE_ROLE
+
+ROW_HEIGHT = 170
+GRAPH_SIZE = 100
+FIELD_HEIGHT = 38
+FIELD_GAP = 12
+
+CARD_COLOR = QColor('#2f2f2f')
+CARD_BORDER = QPen(QColor('#323232'), 3)
+CHECKED_CARD_COLOR = QColor('#0b57a3')
+GRAPH_CONTAINER_COLOR = QColor('#323232')
+FIELD_COLOR = QColor('#232323')
+FIELD_BORDER = QPen(QColor('#202020'), 2)
+TEXT_COLOR = QColor('white')
+PLACEHOLDER_COLOR = QColor(255, 255, 255, 128)
+
+FIELD_STYLE = 'border-radius: 6px; background-color: #232323; padding: 10px 15px; border: 2px solid #202020'
+
+
+# Where everything goes inside one row. Both painting and editing use this so they always line up
+class CardLayout:
+    def __init__(self, rect):
+        self.card = rect.adjusted(15, 5, -15, -5)
+        self.name = QRect(self.card.left() + 14, self.card.top() + 10, self.card.width() - 60, 20)
+        self.check = QRect(self.card.right() - 30, self.card.top() + 12, 16, 16)
+        self.graph_container = QRect(self.card.left() + 12, self.card.top() + 36, GRAPH_SIZE + 20, GRAPH_SIZE + 20)
+        self.graph = self.graph_container.adjusted(10, 10, -10, -10)
+
+        right = self.graph_container.right() + 12
+        field_left = right + 45
+        field_width = max(self.card.right() - 12 - field_left, 40)
+        top = self.graph_container.center().y() - FIELD_HEIGHT - FIELD_GAP // 2
+        self.magnitude_icon = QRect(right, top, 40, FIELD_HEIGHT)
+        self.magnitude_field = QRect(field_left, top, field_width, FIELD_HEIGHT)
+        self.angle_icon = QRect(right, top + FIELD_HEIGHT + FIELD_GAP, 40, FIELD_HEIGHT)
+        self.angle_field = QRect(field_left, top + FIELD_HEIGHT + FIELD_GAP, field_width, FIELD_HEIGHT)
+        self.fields = self.magnitude_field.united(self.angle_field)
+
+
+# The two input boxes of the row that is being edited
+class VectorEditor(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground) # Only the boxes are visible, the card shows through
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(FIELD_GAP)
 
         self.magnitude_input = QLineEdit()
         self.magnitude_input.setPlaceholderText('Magnitude')
-        self.magnitude_input.setStyleSheet('border-radius: 6px; border: none; background-color: #232323; padding: 10px 15px; border: 2px solid #202020')
+        self.magnitude_input.setStyleSheet(FIELD_STYLE)
         self.magnitude_input.setValidator(QIntValidator()) # Make sure numbers only are entered in here
-        self.magnitude_input.textChanged.connect(self.plot_vector) # Plot vector every time text is changed
-
-        self.magnitude_input_layout.addWidget(self.magnitude_icon)
-        self.magnitude_input_layout.addWidget(self.magnitude_input)
-
-        self.angle_input_layout = QHBoxLayout()
-        self.angle_icon = QLabel()
-        self.angle_icon.setPixmap(QPixmap(self.get_absolute_path('images/angle.png')))
-        self.angle_icon.setStyleSheet('border: none;')
-        self.angle_icon.setFixedWidth(40)
+        self.magnitude_input.setFixedHeight(FIELD_HEIGHT)
 
         self.angle_input = QLineEdit()
         self.angle_input.setPlaceholderText('Angle')
-        self.angle_input.setStyleSheet('border-radius: 6px; border: none; background-color: #232323; padding: 10px 15px; border: 2px solid #202020')
-        self.angle_input.setValidator(QIntValidator()) # Make sure numbers only are entered in ehre
-        self.angle_input.textChanged.connect(self.plot_vector) # Plot vector every time text is changed
-        
-        self.angle_input_layout.addWidget(self.angle_icon)
-        self.angle_input_layout.addWidget(self.angle_input)
-
-        self.right_layout.addLayout(self.magnitude_input_layout)
-        self.right_layout.addLayout(self.angle_input_layout)
-
-
-        self.bottom_layout.addLayout(self.left_layout)
-        self.bottom_layout.addLayout(self.right_layout)
-
-        self.widget_layout.addLayout(self.top_layout)
-        self.widget_layout.addLayout(self.bottom_layout)
-
-        self.plot_vector(initial=True) # Plot the initial vector
-
-        main_layout = QVBoxLayout()
-        main_layout.setContentsMargins(15,5,15,5)
-        main_layout.addWidget(self.widget)
-        self.setLayout(main_layout)
-
-
-    # When clicking this element, it toggles the checked state. When checked, various actions can be performed on it such as deleting and duplicating
+        self.angle_input.setStyleSheet(FIELD_STYLE)
+        self.angle_input.setValidator(QIntValidator()) # Make sure numbers only are entered in here
+        self.angle_input.setFixedHeight(FIELD_HEIGHT)
+
+        layout.addWidget(self.magnitude_input)
+        layout.addWidget(self.angle_input)
+        self.setFocusProxy(self.magnitude_input)
+
+    def focus_field(self, column):
+        field = self.magnitude_input if column == MAGNITUDE_COLUMN else self.angle_input
+        field.setFocus(Qt.MouseFocusReason)
+
+
+class VectorDelegate(QStyledItemDelegate):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.magnitude_pixmap = get_pixmap('magnitude.png')
+        self.angle_pixmap = get_pixmap('angle.png')
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    # Which input box (column) is at pos, or None if it is somewhere else on the card
+    def field_at(self, rect, pos):
+        layout = CardLayout(rect)
+        if layout.magnitude_field.contains(pos):
+            return MAGNITUDE_COLUMN
+        if layout.angle_field.contains(pos):
+            return ANGLE_COLUMN
+        return None
+
+    def paint(self, painter, option, index):
+        layout = CardLayout(option.rect)
+        magnitude = index.siblingAtColumn(MAGNITUDE_COLUMN).data(VALUE_ROLE)
+        angle = index.siblingAtColumn(ANGLE_COLUMN).data(VALUE_ROLE)
+        checked = index.data(Qt.CheckStateRole) == Qt.Checked
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, True)
+
+        # Card
+        card = QPainterPath()
+        card.addRoundedRect(QRectF(layout.card), 15, 15)
+        if checked:
+            painter.fillPath(card, CHECKED_CARD_COLOR)
+        else:
+            painter.fillPath(card, CARD_COLOR)
+            painter.strokePath(card, CARD_BORDER)
+
+        # Name and checkbox
+        painter.setPen(TEXT_COLOR)
+        painter.drawText(layout.name, Qt.AlignLeft | Qt.AlignVCenter, f'Vector {index.row() + 1}')
+
+        check_option = QStyleOptionButton()
+        check_option.rect = layout.check
+        check_option.state = QStyle.State_Enabled | (QStyle.State_On if checked else QStyle.State_Off)
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_IndicatorCheckBox, check_option, painter, option.widget)
+
+        # Preview graph. Empty boxes show just the axes
+        container = QPainterPath()
+        container.addRoundedRect(QRectF(layout.graph_container), 10, 10)
+        painter.fillPath(container, GRAPH_CONTAINER_COLOR)
+        valid = magnitude == magnitude and angle == angle # NaN is not equal to itself
+        paint_vector_thumbnail(painter, layout.graph, angle if valid else 0, magnitude if valid else 0)
+
+        # Input boxes (the real line edits only exist while editing)
+        self.paint_icon(painter, layout.magnitude_icon, self.magnitude_pixmap)
+        self.paint_icon(painter, layout.angle_icon, self.angle_pixmap)
+        self.paint_field(painter, layout.magnitude_field, index.siblingAtColumn(MAGNITUDE_COLUMN).data(), 'Magnitude')
+        self.paint_field(painter, layout.angle_field, index.siblingAtColumn(ANGLE_COLUMN).data(), 'Angle')
+
+        painter.restore()
+
+    # Left aligned and vertically centered, like the icon labels used to be
+    def paint_icon(self, painter, rect, pixmap):
+        painter.drawPixmap(rect.left(), rect.top() + (rect.height() - pixmap.height()) // 2, pixmap)
+
+    def paint_field(self, painter, rect, text, placeholder):
+        field = QPainterPath()
+        field.addRoundedRect(QRectF(rect).adjusted(1, 1, -1, -1), 6, 6)
+        painter.fillPath(field, FIELD_COLOR)
+        painter.strokePath(field, FIELD_BORDER)
+        painter.setPen(TEXT_COLOR if text else PLACEHOLDER_COLOR)
+        painter.drawText(rect.adjusted(17, 0, -17, 0), Qt.AlignLeft | Qt.AlignVCenter, text or placeholder)
+
+    # Editing
+    def createEditor(self, parent, option, index):
+        editor = VectorEditor(parent)
+        # Send every keystroke to the model right away so the preview and live mode update while typing
+        editor.magnitude_input.textChanged.connect(lambda: self.commitData.emit(editor))
+        editor.angle_input.textChanged.connect(lambda: self.commitData.emit(editor))
+        editor.magnitude_input.installEventFilter(self)
+        editor.angle_input.installEventFilter(self)
+        return editor
+
+    def setEditorData(self, editor, index):
+        for field, column in ((editor.magnitude_input, MAGNITUDE_COLUMN), (editor.angle_input, ANGLE_COLUMN)):
+            text = index.siblingAtColumn(column).data(Qt.EditRole)
+            if field.text() != text:
+                field.blockSignals(True)
+                field.setText(text)
+                field.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index.siblingAtColumn(MAGNITUDE_COLUMN), editor.magnitude_input.text(), Qt.EditRole)
+        model.setData(index.siblingAtColumn(ANGLE_COLUMN), editor.angle_input.text(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(CardLayout(option.rect).fields)
+
+    # Enter or Escape finishes editing, and so does clicking anywhere outside the two boxes
+    def eventFilter(self, watched, event):
+        if isinstance(watched, QLineEdit) and isinstance(watched.parentWidget(), VectorEditor):
+            editor = watched.parentWidget()
+            if event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Escape):
+                self.commitData.emit(editor)
+                self.closeEditor.emit(editor, QAbstractItemDelegate.NoHint)
+                return True
+            if event.type() == QEvent.FocusOut and event.reason() != Qt.PopupFocusReason:
+                focus = QApplication.focusWidget()
+                if focus is None or not editor.isAncestorOf(focus):
+                    self.commitData.emit(editor)
+                    self.closeEditor.emit(editor, QAbstractItemDelegate.NoHint)
+            return False
+        return super().eventFilter(watched, event)
+
+
+# A table with one visible column: the card. The angle column is only there for the model, the card shows both values.
+# The rows all have the same fixed height, so the header can work out which rows are visible without asking the model
+# about every row. That is what keeps scrolling and adding fast with a huge number of vectors.
+class VectorListView(QTableView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(VectorDelegate(self))
+        self.setSelectionMode(QAbstractItemView.NoSelection) # Checking vectors is done by clicking, see below
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers) # Editing starts from mousePressEvent
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setShowGrid(False)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.horizontalHeader().hide()
+        self.horizontalHeader().setStretchLastSection(True)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+
+    def setModel(self, model):
+        super().setModel(model)
+        self.setColumnHidden(ANGLE_COLUMN, True)
+
+    # Clicking an input box starts typing in it, clicking anywhere else on the card checks or unchecks the vector
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
-            if not self.check_element.isChecked(): # Check it
-                self.widget.setStyleSheet('background-color: #0b57a3; border-radius: 10px;')
-                self.checked = True  # Emit the custom signal
-                self.check_element.setChecked(True)
-            else: # Check off
-                self.widget.setStyleSheet('background-color: #2f2f2f; border-radius: 10px;')
-                self.checked = False  # Emit the custom signal
-                self.check_element.setChecked(False)
-
-
-    # Graphing function. This is a repeat function from the other file but I couldn't figure out how to incorporate them together. (shrug)
-    def plot_vector(self, initial=False):
-        if (not self.magnitude_input.text() == '' and not self.angle_input.text() == '' and not self.angle_input.text() == '-' and not self.magnitude_input.text() == '-') or initial==True: # Makes sure valid input is coming from the text boxes
-            if initial == True: # Initial means it is not actually plotting anything. Its just plotting the axes
-                magnitude = 0
-                angle = 0
-            else:
-                magnitude = float(self.magnitude_input.text()) # Grab the magnitude from the input
-                angle = float(self.angle_input.text()) # Grab the angle from the input
-            try:
-                angle_rad = np.deg2rad(angle) # Convert from degress to radians
-                x = magnitude * np.cos(angle_rad) # Use trig
-                y = magnitude * np.sin(angle_rad) # Use trig
-
-                # Clear previous plot
-                self.final_graph.figure.clear()
-
-                # Create a new subplot
-                self.ax = self.final_graph.figure.add_subplot(111)
-
-                if magnitude == 0:
-                    margin = 0.2
+            index = self.indexAt(event.pos())
+            if index.isValid():
+                column = self.itemDelegate().field_at(self.visualRect(index), event.pos())
+                if column is None:
+                    self.model().toggle_checked(index.row())
                 else:
-                    margin = 0.2 * magnitude
-                self.ax.set_xlim(-magnitude - margin, magnitude + margin)
-                self.ax.set_ylim(-magnitude - margin, magnitude + margin)
-
-                # Set aspect ratio to be equal
-                self.ax.set_aspect('equal')
-
-                # Draw X and Y axes
-                self.ax.axhline(0, color='white', linewidth=1)
-                self.ax.axvline(0, color='white', linewidth=1)
-
-                # Hide spines (don't look good)
-                self.ax.spines['top'].set_visible(False)
-                self.ax.spines['right'].set_visible(False)
-                self.ax.spines['left'].set_visible(False)
-                self.ax.spines['bottom'].set_visible(False)
-
-                # Remove grid lines
-                self.ax.grid(False)
-
-                # Remove ticks
-                self.ax.set_xticks([])
-                self.ax.set_yticks([])
-
-                self.ax.tick_params(axis='both', colors='white', which='both', width=0)  # Hide tick lines
-
-                
-                # Set background color for the axes and figure
-                self.figure.patch.set_facecolor('#323232')
-                self.ax.set_facecolor('#323232')
-
-                # Arrow and line
-                self.ax.plot([0, x], [0, y], color='#2589d8', linestyle='-', linewidth=2)
-                self.ax.quiver(0, 0, x, y, angles='xy', scale_units='xy', scale=0.9, color='green', 
-                        width=0.012, headwidth=10, headlength=8, headaxislength=6)
-
-
-                # Draw the updated plot
-                self.final_graph.draw()
-            except Exception as e:
-                print(e)
-
-
-    # This is needed so that the exe works. Otherwise it wont be able to find the images
-    def get_absolute_path(self, file_name):
-        try:
-            # PyInstaller creates a temp folder and stores path in _MEIPASS
-            base_path = sys._MEIPASS
-        except Exception:
-            base_path = os.path.abspath(".")
-
-        return os.path.join(base_path, file_name)
\ No newline at end of file
+                    self.edit_vector(index, column)
+                return
+        super().mousePressEvent(event)
+
+    def edit_vector(self, index, column=MAGNITUDE_COLUMN):
+        self.setCurrentIndex(index)
+        self.edit(index)
+        editor = self.indexWidget(index)
+        if editor is not None:
+            editor.focus_field(column)
+
+    # The angle column is hidden, but a change in it has to repaint the card too
+    def dataChanged(self, top_left, bottom_right, roles=[]):
+        super().dataChanged(top_left.siblingAtColumn(0), bottom_right.siblingAtColumn(0), roles)
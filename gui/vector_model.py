@@ -0,0 +1,179 @@
+# Qt model for the vector list
+# The vectors themselves are in a VectorStore (NumPy arrays, see vector_store.py). This class only lets the list view
+# look at the store and tells the view when something changed. The view only asks for the rows that are on screen,
+# so the window stays fast even with a huge number of vectors.
+# Column 0 is the magnitude and column 1 is the angle. An empty (or half typed, like '-') box is stored as NaN.
+import math
+
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from vector_store import VectorStore
+
+MAGNITUDE_COLUMN = 0
+ANGLE_COLUMN = 1
+ID_ROLE = Qt.UserRole + 1 # A number that stays with the vector forever, even when rows around it are added or removed
+VALUE_ROLE = Qt.UserRole + 2 # The value as a float (NaN when the box is empty)
+
+# Bulk changes that touch more separate places than this reset the whole model instead of telling the view about
+# every place one by one. A reset is one signal no matter how many vectors changed
+MAX_SEPARATE_CHANGES = 32
+
+
+# How a stored value shows up in the text box
+def format_value(value):
+    if math.isnan(value):
+        return ''
+    if value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# Text from a box into a stored value. Anything that isn't a number yet (empty, '-') becomes NaN
+def parse_value(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class VectorListModel(QAbstractTableModel):
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else VectorStore()
+
+    # Qt model methods
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 2
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return f'Vector {section + 1}'
+        return ['Magnitude', 'Angle'][section]
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        values = self.store.magnitudes if column == MAGNITUDE_COLUMN else self.store.angles
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return format_value(values[row])
+        if role == VALUE_ROLE:
+            return float(values[row])
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.store.checked[row] else Qt.Unchecked
+        if role == ID_ROLE:
+            return int(self.store.ids[row])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+        if role == Qt.CheckStateRole:
+            self.store.checked[row] = value == Qt.Checked
+            self.dataChanged.emit(index.siblingAtColumn(0), index.siblingAtColumn(1), [Qt.CheckStateRole])
+            return True
+        if role in (Qt.EditRole, VALUE_ROLE):
+            number = value if role == VALUE_ROLE else parse_value(value)
+            values = self.store.magnitudes if column == MAGNITUDE_COLUMN else self.store.angles
+            if values[row] == number or (math.isnan(values[row]) and math.isnan(number)):
+                return True # Nothing changed
+            values[row] = number
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole, VALUE_ROLE])
+            return True
+        return False
+
+    # Vector list methods
+
+    # Adds a vector at row (the end by default) and returns the row it ended up in
+    def insert_vector(self, row=None, magnitude=math.nan, angle=math.nan):
+        if row is None or row > len(self.store):
+            row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.insert(row, magnitude, angle)
+        self.endInsertRows()
+        return row
+
+    def remove_vector(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.store.delete_rows([row])
+        self.endRemoveRows()
+
+    # Bulk methods. Each one changes the store in one go and sends the view as few signals as possible
+
+    def set_all_checked(self, checked):
+        if len(self.store) == 0:
+            return
+        self.store.checked[:] = checked
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self.store) - 1, 1), [Qt.CheckStateRole])
+
+    # Deletes every checked vector and returns how many were deleted
+    def remove_checked(self):
+        mask = self.store.checked.copy()
+        runs = contiguous_runs(mask)
+        if len(runs) > MAX_SEPARATE_CHANGES:
+            self.beginResetModel()
+            self.store.delete(mask)
+            self.endResetModel()
+        else:
+            # Back to front so the rows of the runs that are still to go don't move
+            for first, last in reversed(runs):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                self.store.delete_rows(np.arange(first, last + 1))
+                self.endRemoveRows()
+        return int(np.count_nonzero(mask))
+
+    # Puts a copy of every checked vector right after it and returns how many copies were made
+    def duplicate_checked(self):
+        rows = np.flatnonzero(self.store.checked)
+        if len(rows) > MAX_SEPARATE_CHANGES:
+            self.beginResetModel()
+            self.store.duplicate(self.store.checked.copy())
+            self.endResetModel()
+        else:
+            for row in rows[::-1]:
+                self.beginInsertRows(QModelIndex(), row + 1, row + 1)
+                self.store.insert(row + 1, self.store.magnitudes[row], self.store.angles[row])
+                self.endInsertRows()
+        return len(rows)
+
+    # Puts a whole batch of vectors (from a file for example) into the list. With replace=True the old ones go away
+    # It is one reset whatever the size, so the view and live mode catch up once instead of once per vector
+    # Returns the ids of the new vectors
+    def load_vectors(self, magnitudes, angles, replace=False, checked=False):
+        self.beginResetModel()
+        if replace:
+            self.store.clear()
+        ids = self.store.insert(None, magnitudes, angles)
+        self.store.checked[len(self.store) - len(ids):] = checked
+        self.endResetModel()
+        return ids
+
+    def set_checked(self, row, checked):
+        self.setData(self.index(row, 0), Qt.Checked if checked else Qt.Unchecked, Qt.CheckStateRole)
+
+    def toggle_checked(self, row):
+        self.set_checked(row, not self.store.checked[row])
+
+
+# (first, last) rows of every block of True values in mask
+def contiguous_runs(mask):
+    edges = np.diff(np.concatenate(([False], mask, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return list(zip(starts.tolist(), ends.tolist()))
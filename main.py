@@ -1,12 +1,44 @@
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent, QTimer
 
 from gui.main_window import Application
 
 
+# Used by benchmarks/bench_startup.py (also works on the exe): prints a line when the window has been drawn and
+# another one when the first frame of the graph is on screen, then quits. Only active when VECTOR_STARTUP_PROBE is set
+class StartupProbe(QObject):
+    def __init__(self, app, window):
+        super().__init__(window)
+        self.app = app
+        self.window = window
+        self.window_shown = False
+        window.installEventFilter(self)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_graph)
+        self.timer.start(1)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and not self.window_shown:
+            self.window_shown = True
+            print('window-shown', flush=True)
+        return False
+
+    def check_graph(self):
+        if self.window_shown and self.window.final_graph is not None and self.window.final_graph.pixmap is not None:
+            print('graph-ready', flush=True)
+            self.app.quit()
+
+
 # This file just runs the gui
+# Sessions and vector files given on the command line (python main.py vectors.vec) are opened right away
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = Application()
+    for path in app.arguments()[1:]:
+        window.open_file(path, replace=False)
+    if os.environ.get('VECTOR_STARTUP_PROBE'):
+        probe = StartupProbe(app, window)
     sys.exit(app.exec_())
@@ -0,0 +1,141 @@
+# Resolving one huge problem on several cores
+# The vectors are split into shards and every worker process adds up the components of its own shards. Only the small
+# lists of partial sums come back, and those get added exactly at the end, so the resultant is worked out once.
+# The vectors themselves are never pickled and sent to the workers:
+#   resolve_npy_parallel / resolve_vec_parallel: every worker memory maps the .npy or .vec file itself and reads only
+#   its own rows
+#   resolve_parallel: arrays that are already in memory get written once into a temporary .npy file, which the workers
+#   memory map the same way. On Linux it goes in /dev/shm, so it is really shared memory and never touches the disk.
+#   /dev/shm is often small (64 MB in a Docker container) and a memory map that runs out of room there kills the
+#   process with SIGBUS instead of raising an error, so when it doesn't have the room the normal temp folder is used
+# Shards are always whole chunks, and every chunk is summed the same way no matter which worker gets it, so the
+# answer is exactly the same for 1 worker or 64 (and the same as `python cli.py` without -j).
+# Like cli.py, nothing from PyQt5 or matplotlib is imported here.
+import math
+import os
+import tempfile
+from multiprocessing import Pool
+
+import numpy as np
+
+from add import chunk_partials, combine_partials
+from vecfile import open_vec, vec_partials
+from vector_io import DEFAULT_CHUNK_SIZE
+
+SHARDS_PER_WORKER = 4 # More shards than workers, so a worker that finishes early can pick up another one
+SHARED_FOLDER = '/dev/shm' if os.path.isdir('/dev/shm') else None # None is the normal temp folder
+SHARED_FOLDER_MARGIN = 64 * 1024 * 1024 # Room left over in SHARED_FOLDER for everything else that uses it
+
+
+# (start, stop) rows of every shard. Every shard starts on a chunk boundary
+def shard_bounds(count, shards, chunk_size=DEFAULT_CHUNK_SIZE):
+    chunks = math.ceil(count / chunk_size)
+    shards = max(1, min(shards, chunks))
+    edges = [min(round(chunks * shard / shards) * chunk_size, count) for shard in range(shards + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+# (angles, magnitudes) of every chunk between start and stop, as float64 like the chunks cli.py reads
+def column_chunks(angle_degrees, magnitudes, start, stop, chunk_size=DEFAULT_CHUNK_SIZE):
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        yield (np.asarray(angle_degrees[chunk_start:chunk_stop], dtype=np.float64),
+               np.asarray(magnitudes[chunk_start:chunk_stop], dtype=np.float64))
+
+
+# Where the shared copy of size bytes goes: SHARED_FOLDER if it has room for it, otherwise the normal temp folder
+def _temporary_folder(size):
+    if SHARED_FOLDER is not None:
+        stats = os.statvfs(SHARED_FOLDER)
+        if stats.f_bavail * stats.f_frsize >= size + SHARED_FOLDER_MARGIN:
+            return SHARED_FOLDER
+    return tempfile.gettempdir()
+
+
+# Worker function. It only gets a path and a few numbers, never the vectors
+
+def _npy_shard(task):
+    path, start, stop, chunk_size, precision = task
+    rows = np.load(path, mmap_mode='r')
+    return chunk_partials(column_chunks(rows[:, 0], rows[:, 1], start, stop, chunk_size), precision)
+
+
+def _vec_shard(task):
+    path, start, stop, chunk_size, precision = task
+    return vec_partials(open_vec(path), start, stop, chunk_size, precision)
+
+
+def _run_shards(worker, tasks, workers, pool):
+    if pool is not None:
+        return pool.map(worker, tasks, chunksize=1)
+    if workers > 1:
+        with Pool(min(workers, len(tasks))) as new_pool:
+            return new_pool.map(worker, tasks, chunksize=1)
+    return [worker(task) for task in tasks]
+
+
+def _combine(shard_results):
+    return combine_partials([partial for shard in shard_results for partial in shard])
+
+
+def _worker_count(workers):
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+    return workers
+
+
+# Resultant (angle, magnitude) of an N x 2 .npy file of (angle, magnitude) rows
+# A pool can be passed in to reuse its processes, otherwise one is started (and stopped) just for this
+def resolve_npy_parallel(path, workers=None, precision='fast', chunk_size=DEFAULT_CHUNK_SIZE, pool=None):
+    workers = _worker_count(workers)
+    rows = np.load(path, mmap_mode='r')
+    if rows.ndim != 2 or rows.shape[1] != 2:
+        raise ValueError(f'{path}: expected an N x 2 array of (angle, magnitude) rows, got shape {rows.shape}')
+    count = len(rows)
+    del rows
+    tasks = [(path, start, stop, chunk_size, precision)
+             for start, stop in shard_bounds(count, workers * SHARDS_PER_WORKER, chunk_size)]
+    return _combine(_run_shards(_npy_shard, tasks, workers, pool))
+
+
+# Same for a VEC file (see vecfile.py), polar or cartesian
+def resolve_vec_parallel(path, workers=None, precision='fast', chunk_size=DEFAULT_CHUNK_SIZE, pool=None):
+    workers = _worker_count(workers)
+    tasks = [(path, start, stop, chunk_size, precision)
+             for start, stop in shard_bounds(len(open_vec(path)), workers * SHARDS_PER_WORKER, chunk_size)]
+    return _combine(_run_shards(_vec_shard, tasks, workers, pool))
+
+
+# Resultant (angle, magnitude) of vectors that are already in memory. Same arguments as vector_fission_batch
+def resolve_parallel(angle_degrees, magnitudes=None, workers=None, precision='fast', chunk_size=DEFAULT_CHUNK_SIZE,
+                     pool=None):
+    workers = _worker_count(workers)
+    if magnitudes is None:
+        rows = np.asarray(angle_degrees)
+        if rows.ndim != 2 or rows.shape[1] != 2:
+            raise ValueError('Expected an N x 2 array of (angle, magnitude) rows')
+        angle_degrees, magnitudes = rows[:, 0], rows[:, 1]
+    angle_degrees = np.ravel(angle_degrees)
+    magnitudes = np.ravel(magnitudes)
+    if angle_degrees.shape != magnitudes.shape:
+        raise ValueError('Angles and magnitudes must have the same shape')
+    count = len(angle_degrees)
+    if workers == 1 and pool is None:
+        # Nothing to share, so no need to copy anything
+        return combine_partials(chunk_partials(column_chunks(angle_degrees, magnitudes, 0, count, chunk_size), precision))
+
+    with tempfile.TemporaryDirectory(dir=_temporary_folder(count * 16)) as folder:
+        path = os.path.join(folder, 'vectors.npy')
+        rows = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(count, 2))
+        if hasattr(os, 'posix_fallocate'):
+            # The file is sparse until it is written. Taking all the room now makes a full disk an OSError here
+            # instead of a SIGBUS halfway through filling the memory map
+            with open(path, 'r+b') as file:
+                os.posix_fallocate(file.fileno(), 0, os.path.getsize(path))
+        rows[:, 0] = angle_degrees
+        rows[:, 1] = magnitudes
+        rows.flush()
+        del rows # Windows can't delete the folder while the file is still mapped
+        return resolve_npy_parallel(path, workers, precision, chunk_size, pool)
@@ -0,0 +1,167 @@
+# Timing spans for finding out where the time goes
+# Set VECTOR_PROFILE before starting anything (the GUI, cli.py, service.py, a benchmark) and every function marked
+# with @profiled and every `with span(...)` block gets timed. When the program exits, a table with the count and
+# total/mean/max time of every span is printed to stderr, and all the spans are written as a Chrome trace. Open it at
+# chrome://tracing or https://ui.perfetto.dev to see the timeline, one row per thread (the graph has its own thread).
+#   VECTOR_PROFILE=1 python main.py                 -> vector_trace.json
+#   VECTOR_PROFILE=session.json python main.py      -> session.json
+#
+# Without VECTOR_PROFILE, @profiled gives back the function itself, so marked functions cost exactly nothing, and
+# span() hands out one shared object that does nothing. Whether profiling is on is decided once, at import.
+# Only the standard library is used, so anything can import this.
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+PROFILE_VARIABLE = 'VECTOR_PROFILE'
+DEFAULT_TRACE_PATH = 'vector_trace.json'
+MAX_EVENTS = 1_000_000 # Spans kept for the trace. After that only the totals keep counting
+
+_setting = os.environ.get(PROFILE_VARIABLE, '')
+ENABLED = _setting not in ('', '0')
+TRACE_PATH = DEFAULT_TRACE_PATH if _setting in ('1', 'true') else _setting
+
+_ORIGIN = time.perf_counter_ns()
+_lock = threading.Lock()
+_events = [] # (name, category, start_ns, end_ns, thread id, args)
+_totals = {} # name -> [count, total_ns, max_ns]
+_threads = {} # thread id -> name
+
+
+def _record(name, category, start, end, args=None):
+    duration = end - start
+    thread = threading.get_ident()
+    with _lock:
+        if len(_events) < MAX_EVENTS:
+            _events.append((name, category, start, end, thread, args))
+        totals = _totals.get(name)
+        if totals is None:
+            _totals[name] = [1, duration, duration]
+        else:
+            totals[0] += 1
+            totals[1] += duration
+            if duration > totals[2]:
+                totals[2] = duration
+        if thread not in _threads:
+            _threads[thread] = threading.current_thread().name
+
+
+class _Span:
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        _record(self.name, self.category, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# Times a block: with span('parse', rows=len(rows)): ...
+# The keyword arguments show up in the trace viewer when the span is clicked
+def span(name, category='app', **args):
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name, category, args or None)
+
+
+# Times every call of a function. Works as @profiled or @profiled(name='...')
+# The span is called after the function's qualified name (like Application.plot_vector) and grouped by module
+def profiled(function=None, name=None):
+    def decorate(function):
+        if not ENABLED:
+            return function
+        label = name or function.__qualname__
+        category = function.__module__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _record(label, category, start, time.perf_counter_ns())
+        return wrapper
+
+    if function is not None:
+        return decorate(function)
+    return decorate
+
+
+# {name: {count, total_ms, mean_ms, max_ms}}, slowest total first
+def summary():
+    with _lock:
+        totals = {name: list(values) for name, values in _totals.items()}
+    ordered = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+    return {name: {'count': count, 'total_ms': total / 1e6, 'mean_ms': total / count / 1e6, 'max_ms': longest / 1e6}
+            for name, (count, total, longest) in ordered}
+
+
+def clear():
+    with _lock:
+        _events.clear()
+        _totals.clear()
+
+
+# Writes every span as a complete ("X") event of the Chrome trace event format
+def write_chrome_trace(path):
+    with _lock:
+        events = list(_events)
+        threads = dict(_threads)
+    process = os.getpid()
+    trace = [{'name': 'thread_name', 'ph': 'M', 'pid': process, 'tid': thread, 'args': {'name': thread_name}}
+             for thread, thread_name in threads.items()]
+    for name, category, start, end, thread, args in events:
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': (start - _ORIGIN) / 1000, 'dur': (end - start) / 1000,
+                 'pid': process, 'tid': thread}
+        if args:
+            event['args'] = args
+        trace.append(event)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, file)
+
+
+def print_summary(output=None):
+    output = output or sys.stderr
+    print(f'{"span":<40} {"count":>8} {"total ms":>10} {"mean ms":>9} {"max ms":>9}', file=output)
+    for name, totals in summary().items():
+        print(f'{name[:40]:<40} {totals["count"]:>8} {totals["total_ms"]:>10.2f} {totals["mean_ms"]:>9.3f} '
+              f'{totals["max_ms"]:>9.3f}', file=output)
+
+
+def _write_at_exit():
+    if not _totals:
+        return
+    print_summary()
+    try:
+        write_chrome_trace(TRACE_PATH)
+        print(f'Trace written to {TRACE_PATH}', file=sys.stderr)
+    except OSError as e:
+        print(f'Could not write the trace: {e}', file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(_write_at_exit)
@@ -0,0 +1,296 @@
+# The resolver as a long running local service with a small HTTP/JSON API
+# Starting Python and importing NumPy takes far longer than adding up a few thousand vectors, so when lots of small
+# jobs come in it is much quicker to keep one process running and send it the vectors.
+# Requests that arrive at about the same time are worked out as one batch: all of their vectors go through
+# vector_fission_batch and vector_addition_batch together, with CSR offsets so every request still gets its own
+# resultant (see resolve_vectors in add.py). While one batch is being worked out in a thread, the next requests pile
+# up and become the next batch, so the busier it gets the bigger (and cheaper per request) the batches get.
+# Only asyncio and NumPy, no web framework. Like cli.py, nothing from PyQt5 or matplotlib is imported.
+#
+# Start:  python service.py --port 8750        or  python service.py --unix /tmp/vectors.sock
+# Use:    curl -d '{"vectors": [[0, 5], [90, 5]]}' http://127.0.0.1:8750/resolve
+#         {"angle": 45.0, "magnitude": 7.0710678118654755, "vectors": 2, "batch_size": 1, "latency_ms": 0.21}
+# A request can give its vectors as "vectors" ([angle, magnitude] pairs) or as "angles" and "magnitudes" lists, plus
+# an optional "precision" (fast, compensated or exact). latency_ms is the time from the request being read to its
+# result being ready, batch_size is how many requests were worked out together with it.
+# NaN or infinite vectors get a 400. A resultant too big for a float comes back as null.
+# GET /stats returns how many requests, vectors and batches there have been so far.
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+from add import SUMMATION_MODES, resolve_vectors
+from profiling import profiled
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8750
+MAX_BATCH_VECTORS = 1_000_000 # A batch stops taking requests after this many vectors (it always takes at least one)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# The vectors of one request as an N x 2 array of (angle, magnitude) rows, and its precision
+def parse_problem(data):
+    if isinstance(data, list):
+        data = {'vectors': data}
+    if not isinstance(data, dict):
+        raise ValueError('Expected a JSON object with "vectors"')
+    try:
+        if 'vectors' in data:
+            rows = np.array(data['vectors'], dtype=np.float64)
+            if rows.size == 0:
+                rows = rows.reshape(0, 2)
+        elif 'angles' in data and 'magnitudes' in data:
+            angles = np.array(data['angles'], dtype=np.float64)
+            magnitudes = np.array(data['magnitudes'], dtype=np.float64)
+            if angles.ndim != 1 or angles.shape != magnitudes.shape:
+                raise ValueError('"angles" and "magnitudes" must be lists of the same length')
+            rows = np.column_stack((angles, magnitudes))
+        else:
+            raise ValueError('Expected "vectors" or "angles" and "magnitudes"')
+    except TypeError:
+        raise ValueError('Vectors must be numbers')
+    if rows.ndim != 2 or rows.shape[1] != 2:
+        raise ValueError('"vectors" must be a list of [angle, magnitude] pairs')
+    # Python's json reads NaN and Infinity, but they have no resultant (and aren't JSON anyway)
+    if not np.isfinite(rows).all():
+        raise ValueError('Vectors must be finite numbers')
+    precision = data.get('precision', 'fast')
+    if precision not in SUMMATION_MODES:
+        raise ValueError(f'Unknown precision {precision!r}, expected one of {list(SUMMATION_MODES)}')
+    return rows, precision
+
+
+# Resultant (angle, magnitude) of every problem (N x 2 arrays) in one vectorized pass
+@profiled
+def resolve_batch(problems, precision='fast'):
+    offsets = np.concatenate(([0], np.cumsum([len(rows) for rows in problems])))
+    rows = np.concatenate(problems) if problems else np.empty((0, 2))
+    angles, magnitudes = resolve_vectors(rows, offsets=offsets, precision=precision)
+    return list(zip(angles.tolist(), magnitudes.tolist()))
+
+
+# Collects requests and works them out in batches, one batch at a time in a worker thread
+# batch_window (seconds) waits a little before every batch so more requests can join, 0 just takes whatever is
+# already waiting. max_batch_vectors=1 turns batching off (every request is its own batch)
+class ResolveBatcher:
+    def __init__(self, batch_window=0.0, max_batch_vectors=MAX_BATCH_VECTORS):
+        self.batch_window = batch_window
+        self.max_batch_vectors = max_batch_vectors
+        self.pending = [] # (rows, precision, future)
+        self.requests = 0
+        self.vectors = 0
+        self.batches = 0
+        self._wakeup = None
+        self._task = None
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    # Returns (angle, magnitude, batch_size) once the batch with this request has been worked out
+    async def resolve(self, rows, precision='fast'):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((rows, precision, future))
+        self._wakeup.set()
+        return await future
+
+    # Takes requests from the front of the queue until the batch is full
+    def _take(self):
+        count = 0
+        vectors = 0
+        for rows, _, _ in self.pending:
+            if count and vectors + len(rows) > self.max_batch_vectors:
+                break
+            count += 1
+            vectors += len(rows)
+        batch, self.pending = self.pending[:count], self.pending[count:]
+        if self.pending:
+            self._wakeup.set()
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            if self.batch_window:
+                await asyncio.sleep(self.batch_window)
+            self._wakeup.clear()
+            # Requests whose client already went away don't need working out
+            batch = [item for item in self._take() if not item[2].done()]
+            if not batch:
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            # Every precision is its own pass (almost always there is only one)
+            for precision in {precision for _, precision, _ in batch}:
+                group = [(rows, future) for rows, item_precision, future in batch if item_precision == precision]
+                self.vectors += sum(len(rows) for rows, _ in group)
+                try:
+                    results = await loop.run_in_executor(None, resolve_batch, [rows for rows, _ in group], precision)
+                except Exception as error:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(error)
+                    continue
+                for (_, future), (angle, magnitude) in zip(group, results):
+                    if not future.done():
+                        future.set_result((angle, magnitude, len(batch)))
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None # The client closed the connection
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, 'Malformed request line')
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HttpError(400, 'Bad Content-Length')
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, f'Requests can be at most {MAX_BODY_BYTES} bytes')
+    body = await reader.readexactly(length) if length else b''
+    # HTTP/1.1 keeps the connection open unless asked not to, HTTP/1.0 closes it unless asked to keep it
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+    return method, target, body, keep_alive
+
+
+# Finite vectors can still add up to more than a float holds. That comes back as null, NaN and Infinity aren't JSON
+def _json_number(value):
+    return value if math.isfinite(value) else None
+
+
+def _response(status, data, keep_alive):
+    body = json.dumps(data, allow_nan=False).encode('utf-8')
+    head = (f'HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\nConnection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+    return head.encode('latin-1') + body
+
+
+class ResolverService:
+    def __init__(self, batch_window=0.0, max_batch_vectors=MAX_BATCH_VECTORS):
+        self.batcher = ResolveBatcher(batch_window, max_batch_vectors)
+        self.started = time.time()
+
+    async def respond(self, method, target, body):
+        path = target.split('?', 1)[0]
+        if path == '/resolve':
+            if method != 'POST':
+                raise HttpError(405, 'Use POST for /resolve')
+            start = time.perf_counter()
+            try:
+                rows, precision = parse_problem(json.loads(body))
+            except ValueError as error: # Bad JSON is a ValueError too
+                raise HttpError(400, str(error))
+            angle, magnitude, batch_size = await self.batcher.resolve(rows, precision)
+            return {'angle': _json_number(angle), 'magnitude': _json_number(magnitude), 'vectors': len(rows), 'batch_size': batch_size,
+                    'latency_ms': (time.perf_counter() - start) * 1000}
+        if path == '/stats':
+            batcher = self.batcher
+            return {'requests': batcher.requests, 'vectors': batcher.vectors, 'batches': batcher.batches,
+                    'mean_batch_size': batcher.requests / batcher.batches if batcher.batches else 0.0,
+                    'uptime_s': time.time() - self.started}
+        raise HttpError(404, f'Nothing at {path}')
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, target, body, keep_alive = request
+                    status, data = 200, await self.respond(method, target, body)
+                except HttpError as error:
+                    status, data = error.status, {'error': str(error)}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as error:
+                    status, data = 500, {'error': str(error)}
+                writer.write(_response(status, data, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Starts listening on a TCP port or a Unix socket and returns the asyncio server
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        self.batcher.start()
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_connection, unix_path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def stop(self):
+        await self.batcher.stop()
+
+
+async def serve(args):
+    service = ResolverService(args.batch_window_ms / 1000, args.max_batch_vectors)
+    server = await service.start(args.host, args.port, args.unix)
+    if args.unix:
+        address = f'unix:{args.unix}'
+    else:
+        host, port = server.sockets[0].getsockname()[:2]
+        address = f'http://{host}:{port}'
+    # The load generator reads this line to find out where the service is (handy with --port 0)
+    print(f'Listening on {address}', file=sys.stderr, flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the vector resolver as a local HTTP/JSON service')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'address to listen on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'TCP port, 0 picks a free one (default: {DEFAULT_PORT})')
+    parser.add_argument('--unix', help='listen on this Unix socket instead of a TCP port')
+    parser.add_argument('--batch-window-ms', type=float, default=0.0, help='wait this long before every batch so more requests can join (default: 0)')
+    parser.add_argument('--max-batch-vectors', type=int, default=MAX_BATCH_VECTORS, help=f'vectors per batch, 1 turns batching off (default: {MAX_BATCH_VECTORS})')
+    args = parser.parse_args(argv)
+    if args.max_batch_vectors < 1:
+        raise SystemExit('--max-batch-vectors must be at least 1')
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
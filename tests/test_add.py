@@ -0,0 +1,188 @@
+# The math in add.py
+# Run from the repository root: python -m pytest tests
+import math
+import random
+
+import numpy as np
+import pytest
+
+from add import ResultantAccumulator, component_sum, resolve_vectors, resultant_angle_magnitude, vector_addition, \
+        vector_addition_batch, vector_fission_batch
+
+
+# Resultant Engine
+
+# (x, y) of the resultant and the angle it should come out as
+DIRECTIONS = [
+    ((1, 0), 0), ((1, 1), 45), ((0, 1), 90), ((-1, 1), 135),
+    ((-1, 0), 180), ((-1, -1), 225), ((0, -1), 270), ((1, -1), 315),
+]
+
+
+@pytest.mark.parametrize('components, angle', DIRECTIONS)
+def test_axes_and_quadrants(components, angle):
+    x_value, y_value = components
+    resultant_angle, magnitude = vector_addition([x_value], [y_value])
+    assert resultant_angle == pytest.approx(angle)
+    assert magnitude == pytest.approx(math.hypot(x_value, y_value))
+
+
+def test_axes_and_quadrants_elementwise():
+    x_values = [x_value for (x_value, _), _ in DIRECTIONS]
+    y_values = [y_value for (_, y_value), _ in DIRECTIONS]
+    angles, magnitudes = resultant_angle_magnitude(x_values, y_values)
+    np.testing.assert_allclose(angles, [angle for _, angle in DIRECTIONS])
+    np.testing.assert_allclose(magnitudes, np.hypot(x_values, y_values))
+
+
+# x = 0 used to divide by zero in the old arctan(y / x)
+def test_straight_up_and_down():
+    assert vector_addition([0, 0], [3, 4]) == (90.0, 7.0)
+    assert vector_addition([0.0], [-2.0]) == (270.0, 2.0)
+
+
+def test_zero_vector_points_at_zero_degrees():
+    assert vector_addition([], []) == (0.0, 0.0)
+    assert vector_addition([5, -5], [5, -5]) == (0.0, 0.0)
+    # -0.0 would make atan2 say 180 degrees
+    assert vector_addition([-0.0], [-0.0]) == (0.0, 0.0)
+    assert vector_addition([-0.0], [0.0]) == (0.0, 0.0)
+    angles, magnitudes = resultant_angle_magnitude([0.0, -0.0, -0.0], [0.0, 0.0, -0.0])
+    assert angles.tolist() == [0.0, 0.0, 0.0]
+    assert magnitudes.tolist() == [0.0, 0.0, 0.0]
+
+
+# A tiny negative angle is almost 360 and rounds up to exactly 360, which has to come out as 0
+def test_angle_is_always_below_360():
+    angle, _ = vector_addition([1.0], [-1e-20])
+    assert 0 <= angle < 360
+    angles, _ = resultant_angle_magnitude([1.0, 1.0], [-1e-20, -1e-300])
+    assert np.all((angles >= 0) & (angles < 360))
+
+
+# Batch Vector Functions
+
+def test_fission_batch_takes_rows_or_columns():
+    rows = np.array([[0, 5], [90, 5]])
+    x_values, y_values = vector_fission_batch(rows)
+    np.testing.assert_allclose(x_values, [5, 0], atol=1e-12)
+    np.testing.assert_allclose(y_values, [0, 5], atol=1e-12)
+    for columns in zip(vector_fission_batch(rows[:, 0], rows[:, 1]), (x_values, y_values)):
+        np.testing.assert_array_equal(*columns)
+    with pytest.raises(ValueError):
+        vector_fission_batch([0, 90], [5])
+
+
+# Offsets work like CSR: problem i is rows offsets[i] to offsets[i + 1], an empty one is the zero vector
+def test_segments_with_an_empty_one():
+    angles = [0, 90, 180, 45]
+    magnitudes = [5, 5, 2, 1]
+    result_angles, result_magnitudes = resolve_vectors(angles, magnitudes, offsets=[0, 2, 2, 3, 4])
+    np.testing.assert_allclose(result_angles, [45, 0, 180, 45])
+    np.testing.assert_allclose(result_magnitudes, [math.sqrt(50), 0, 2, 1])
+    for precision in ('compensated', 'exact'):
+        other_angles, other_magnitudes = resolve_vectors(angles, magnitudes, offsets=[0, 2, 2, 3, 4], precision=precision)
+        np.testing.assert_allclose(other_angles, result_angles)
+        np.testing.assert_allclose(other_magnitudes, result_magnitudes)
+
+
+@pytest.mark.parametrize('offsets', [[1, 4], [0, 3], [0, 3, 2, 4], []])
+def test_bad_offsets(offsets):
+    with pytest.raises(ValueError):
+        vector_addition_batch([1, 2, 3, 4], [1, 2, 3, 4], offsets=offsets)
+
+
+# Summation modes
+
+def test_summation_modes_when_big_loads_cancel():
+    values = [1e16, 1.0, -1e16, 1.0]
+    assert component_sum(values, 'exact') == 2.0
+    assert component_sum(values, 'compensated') == 2.0
+    with pytest.raises(ValueError):
+        component_sum(values, 'sloppy')
+
+
+def test_summation_modes_agree_on_ordinary_numbers():
+    values = np.random.default_rng(0).uniform(-100, 100, 10_001)
+    exact = math.fsum(values)
+    assert component_sum(values, 'exact') == exact
+    assert component_sum(values, 'compensated') == pytest.approx(exact, rel=0, abs=1e-12)
+    assert component_sum(values, 'fast') == pytest.approx(exact, rel=1e-12)
+    assert component_sum([], 'compensated') == 0.0
+
+
+# Running Resultant
+
+# The batch used to be folded in as one rounded sum, so taking one of its vectors out again didn't cancel exactly
+def test_add_many_then_update_matches_a_fresh_resolve():
+    accumulator = ResultantAccumulator()
+    accumulator.add_many([0, 1], [0, 90], [5, 5])
+    accumulator.update(1, 180, 5)
+    expected = resolve_vectors([0, 180], [5, 5])
+    assert accumulator.resultant() == pytest.approx(expected)
+    assert accumulator.resultant()[0] == pytest.approx(90)
+
+    one_by_one = ResultantAccumulator()
+    one_by_one.add(0, 5, key=0)
+    one_by_one.add(90, 5, key=1)
+    one_by_one.update(1, 180, 5)
+    assert accumulator.resultant() == pytest.approx(one_by_one.resultant())
+
+
+def test_extend_then_add_matches_a_fresh_resolve():
+    accumulator = ResultantAccumulator()
+    accumulator.extend([0, 90], [5, 5])
+    accumulator.add(180, 5)
+    assert accumulator.resultant() == pytest.approx(resolve_vectors([0, 90, 180], [5, 5, 5]))
+    assert len(accumulator) == 3
+
+
+@pytest.mark.parametrize('keys, angles', [([0, 1], [0, 90, 180]), ([0, 1, 2], [0, 90])])
+def test_add_many_needs_one_key_per_vector(keys, angles):
+    accumulator = ResultantAccumulator()
+    with pytest.raises(ValueError, match='one key per vector'):
+        accumulator.add_many(keys, angles, [5] * len(angles))
+    # Nothing was added
+    assert len(accumulator) == 0
+    assert accumulator.components_sum() == (0.0, 0.0)
+
+
+def test_add_many_rejects_keys_that_are_taken():
+    accumulator = ResultantAccumulator()
+    accumulator.add(0, 5, key='a')
+    with pytest.raises(KeyError):
+        accumulator.add_many(['a', 'b'], [0, 90], [5, 5])
+    with pytest.raises(KeyError):
+        accumulator.add_many(['b', 'b'], [0, 90], [5, 5])
+    assert len(accumulator) == 1
+
+
+# Random batches with huge and tiny magnitudes, then random updates: the batch path has to stay at least as close to
+# the exact sum as adding the vectors one by one
+@pytest.mark.parametrize('seed', range(20))
+def test_add_many_is_as_accurate_as_add(seed):
+    rng = random.Random(seed)
+    for _ in range(25):
+        keys = list(range(rng.randint(1, 30)))
+        angles = [rng.choice([0, 90, 180, 270, rng.uniform(0, 360)]) for _ in keys]
+        magnitudes = [rng.choice([5, 1e10, 1e-5, rng.uniform(0, 100)]) for _ in keys]
+        batch = ResultantAccumulator()
+        batch.add_many(keys, angles, magnitudes)
+        one_by_one = ResultantAccumulator()
+        for key, angle, magnitude in zip(keys, angles, magnitudes):
+            one_by_one.add(angle, magnitude, key=key)
+        for _ in range(10):
+            key = rng.choice(keys)
+            angle = rng.choice([0, 90, 180, rng.uniform(0, 360)])
+            magnitude = rng.choice([5, rng.uniform(0, 10)])
+            batch.update(key, angle, magnitude)
+            one_by_one.update(key, angle, magnitude)
+        for axis in (0, 1):
+            exact = math.fsum(components[axis] for components in one_by_one.components.values())
+            batch_error = abs(batch.components_sum()[axis] - exact)
+            assert batch_error <= abs(one_by_one.components_sum()[axis] - exact)
+            assert batch_error <= 1e-15 * max(1.0, abs(exact))
+        for key in keys:
+            batch.remove(key)
+        assert len(batch) == 0
+        assert batch.components_sum() == pytest.approx((0.0, 0.0), abs=1e-20)
@@ -0,0 +1,49 @@
+# Resolving on several cores gives exactly the same answer as one
+# Run from the repository root: python -m pytest tests
+import tempfile
+
+import numpy as np
+import pytest
+
+import parallel
+from add import resolve_vectors
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, 360, 50_000), rng.uniform(0, 100, 50_000)
+
+
+def test_same_answer_for_any_number_of_workers(vectors):
+    serial = parallel.resolve_parallel(*vectors, workers=1, chunk_size=4096)
+    assert parallel.resolve_parallel(*vectors, workers=2, chunk_size=4096) == serial
+    assert serial == pytest.approx(resolve_vectors(*vectors))
+
+
+# When /dev/shm doesn't have the room the shared copy goes to the normal temp folder
+def test_falls_back_to_the_temp_folder(monkeypatch, vectors):
+    if parallel.SHARED_FOLDER is not None:
+        assert parallel._temporary_folder(16) == parallel.SHARED_FOLDER
+    monkeypatch.setattr(parallel, 'SHARED_FOLDER_MARGIN', 1 << 62)
+    assert parallel._temporary_folder(16) == tempfile.gettempdir()
+    serial = parallel.resolve_parallel(*vectors, workers=1, chunk_size=4096)
+    assert parallel.resolve_parallel(*vectors, workers=2, chunk_size=4096) == serial
+
+
+# cli.py, vecfile.py and parallel.py all add chunks with add.chunk_partials and combine them with combine_partials
+def test_same_answer_as_the_serial_cli(tmp_path, vectors):
+    from cli import solve_file
+    from vecfile import resolve_vec, write_vec
+
+    npy_path = str(tmp_path / 'vectors.npy')
+    np.save(npy_path, np.column_stack(vectors))
+    expected = parallel.resolve_parallel(*vectors, workers=1, chunk_size=4096)
+    serial = solve_file(npy_path, chunk_size=4096)
+    assert (serial['angle'], serial['magnitude']) == expected
+    assert parallel.resolve_npy_parallel(npy_path, workers=2, chunk_size=4096) == expected
+
+    vec_path = str(tmp_path / 'vectors.vec')
+    write_vec(vec_path, *vectors)
+    assert resolve_vec(vec_path, chunk_size=4096) == expected
+    assert parallel.resolve_vec_parallel(vec_path, workers=2, chunk_size=4096) == expected
@@ -0,0 +1,37 @@
+# Saving and opening GUI sessions
+# Run from the repository root: python -m pytest tests
+import json
+import math
+
+import numpy as np
+import pytest
+
+from gui.session import load_session, save_session
+from vector_store import VectorStore
+
+
+def test_round_trip_with_empty_boxes(tmp_path):
+    store = VectorStore()
+    store.insert(magnitudes=[5, math.nan, 3], angles=[0, 90, math.nan])
+    store.checked[:] = [True, False, True]
+    path = str(tmp_path / 'session.json')
+    save_session(path, store, live_mode=True)
+    session = load_session(path)
+    np.testing.assert_array_equal(session['angles'], [0, 90, math.nan])
+    np.testing.assert_array_equal(session['magnitudes'], [5, math.nan, 3])
+    assert session['checked'].tolist() == [True, False, True]
+    assert session['live_mode'] is True
+
+
+def test_empty_session(tmp_path):
+    path = tmp_path / 'session.json'
+    path.write_text('{"version": 1, "vectors": []}')
+    assert len(load_session(str(path))['angles']) == 0
+
+
+@pytest.mark.parametrize('vectors', [[[0, 5, 1], [90, 5, 1]], [[0, 5, 1, 2]], [[0, 5], [90]], [5], [{'angle': 1}]])
+def test_rows_that_are_not_pairs(tmp_path, vectors):
+    path = tmp_path / 'session.json'
+    path.write_text(json.dumps({'version': 1, 'vectors': vectors}))
+    with pytest.raises(ValueError, match='pairs'):
+        load_session(str(path))
@@ -0,0 +1,121 @@
+# Writing and reading back VEC files
+# Run from the repository root: python -m pytest tests
+import numpy as np
+import pytest
+
+from add import resolve_vectors, vector_fission_batch
+from vecfile import HEADER_SIZE, VecWriter, convert_to_vec, load_vectors, open_vec, resolve_vec, write_vec
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, 360, 1000), rng.uniform(0, 100, 1000)
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float64'])
+def test_polar_round_trip(tmp_path, vectors, dtype):
+    angles, magnitudes = vectors
+    path = str(tmp_path / 'vectors.vec')
+    write_vec(path, angles, magnitudes, dtype=dtype)
+    vec = open_vec(path)
+    assert (len(vec), vec.layout, vec.dtype) == (1000, 'polar', np.dtype(dtype))
+    np.testing.assert_array_equal(vec.columns[0], angles.astype(dtype))
+    np.testing.assert_array_equal(vec.columns[1], magnitudes.astype(dtype))
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float64'])
+def test_cartesian_round_trip(tmp_path, vectors, dtype):
+    x_values, y_values = vector_fission_batch(*vectors)
+    path = str(tmp_path / 'vectors.vec')
+    write_vec(path, x_values, y_values, layout='cartesian', dtype=dtype)
+    vec = open_vec(path)
+    assert (len(vec), vec.layout, vec.dtype) == (1000, 'cartesian', np.dtype(dtype))
+    np.testing.assert_array_equal(vec.columns[0], x_values.astype(dtype))
+    np.testing.assert_array_equal(vec.columns[1], y_values.astype(dtype))
+    # Both layouts add up to the same resultant
+    angle, magnitude = resolve_vec(path, chunk_size=128)
+    expected_angle, expected_magnitude = resolve_vectors(*vectors)
+    tolerance = 1e-3 if dtype == 'float32' else 1e-9
+    assert angle == pytest.approx(expected_angle, abs=tolerance)
+    assert magnitude == pytest.approx(expected_magnitude, rel=tolerance)
+
+
+def test_writing_in_chunks(tmp_path, vectors):
+    angles, magnitudes = vectors
+    path = str(tmp_path / 'vectors.vec')
+    with VecWriter(path) as writer:
+        for start in range(0, 1000, 300):
+            writer.write(angles[start:start + 300], magnitudes[start:start + 300])
+    loaded_angles, loaded_magnitudes = load_vectors(path)
+    np.testing.assert_array_equal(loaded_angles, angles)
+    np.testing.assert_array_equal(loaded_magnitudes, magnitudes)
+    assert sorted(item.name for item in tmp_path.iterdir()) == ['vectors.vec'] # No temporary files left over
+
+
+def test_empty_file(tmp_path):
+    path = str(tmp_path / 'empty.vec')
+    write_vec(path, [], [])
+    vec = open_vec(path)
+    assert len(vec) == 0
+    assert list(vec.chunks()) == []
+    assert resolve_vec(path) == (0.0, 0.0)
+
+
+def test_truncated_file(tmp_path, vectors):
+    path = tmp_path / 'vectors.vec'
+    write_vec(str(path), *vectors)
+    data = path.read_bytes()
+    path.write_bytes(data[:-8])
+    with pytest.raises(ValueError, match='shorter'):
+        open_vec(str(path))
+    path.write_bytes(data[:HEADER_SIZE - 1])
+    with pytest.raises(ValueError, match='not a VEC file'):
+        open_vec(str(path))
+
+
+def test_not_a_vec_file(tmp_path):
+    path = tmp_path / 'vectors.vec'
+    path.write_bytes(b'angle,magnitude\n0,5\n'.ljust(HEADER_SIZE * 2, b'\n'))
+    with pytest.raises(ValueError, match='not a VEC file'):
+        open_vec(str(path))
+
+
+# An error halfway through leaves the old file as it was
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / 'vectors.vec')
+    write_vec(path, [0, 90], [5, 5])
+    with pytest.raises(RuntimeError):
+        with VecWriter(path) as writer:
+            writer.write([180], [1])
+            raise RuntimeError('stop')
+    np.testing.assert_array_equal(load_vectors(path)[0], [0, 90])
+    assert sorted(item.name for item in tmp_path.iterdir()) == ['vectors.vec']
+
+
+# Writing over the file the vectors were loaded from, like saving in the GUI, with the old file still memory mapped
+def test_overwrite_while_mapped(tmp_path):
+    path = str(tmp_path / 'vectors.vec')
+    write_vec(path, [0, 90], [5, 5])
+    angles, magnitudes = open_vec(path).polar()
+    write_vec(path, angles * 2, magnitudes)
+    np.testing.assert_array_equal(angles, [0, 90])
+    np.testing.assert_array_equal(load_vectors(path)[0], [0, 180])
+
+
+def test_convert_csv(tmp_path):
+    source = tmp_path / 'vectors.csv'
+    source.write_text('angle,magnitude\n0,5\n90,5\n')
+    destination = str(tmp_path / 'vectors.vec')
+    assert convert_to_vec(str(source), destination, layout='cartesian') == 2
+    angle, magnitude = resolve_vec(destination)
+    assert angle == pytest.approx(45)
+    assert magnitude == pytest.approx(50 ** 0.5)
+
+
+def test_convert_refuses_to_overwrite_its_source(tmp_path):
+    source = tmp_path / 'vectors.csv'
+    source.write_text('0,5\n90,5\n')
+    with pytest.raises(ValueError):
+        convert_to_vec(str(source), str(source))
+    assert source.read_text() == '0,5\n90,5\n'
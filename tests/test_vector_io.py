@@ -0,0 +1,86 @@
+# Reading vector files, and the errors for files that can't be read
+# Run from the repository root: python -m pytest tests
+import numpy as np
+import pytest
+
+from cli import main
+from vector_io import read_chunks, read_csv_text
+
+
+def read(path, file_format=None):
+    chunks = list(read_chunks(str(path), file_format))
+    return np.concatenate(chunks) if chunks else np.empty((0, 2))
+
+
+def test_csv_with_and_without_header(tmp_path):
+    path = tmp_path / 'vectors.csv'
+    path.write_text('magnitude,angle\n5,0\n5,90\n')
+    np.testing.assert_array_equal(read(path), [[0, 5], [90, 5]])
+    path.write_text('0,5\n\n90,5\n')
+    np.testing.assert_array_equal(read(path), [[0, 5], [90, 5]])
+
+
+def test_pasted_tab_separated_text():
+    np.testing.assert_array_equal(np.concatenate(list(read_csv_text('0\t5\n90\t5\n'))), [[0, 5], [90, 5]])
+
+
+def test_json_pairs_and_objects(tmp_path):
+    path = tmp_path / 'vectors.json'
+    path.write_text('{"vectors": [[0, 5], {"angle": 90, "magnitude": 5}]}')
+    np.testing.assert_array_equal(read(path), [[0, 5], [90, 5]])
+    path.write_text('[]')
+    assert read(path).shape == (0, 2)
+
+
+def test_short_csv_row(tmp_path):
+    path = tmp_path / 'vectors.csv'
+    path.write_text('0,5\n90\n')
+    with pytest.raises(ValueError, match='line 2'):
+        read(path)
+
+
+def test_csv_cell_that_is_not_a_number(tmp_path):
+    path = tmp_path / 'vectors.csv'
+    path.write_text('angle,magnitude\n0,5\n90,abc\n')
+    with pytest.raises(ValueError, match='line 3'):
+        read(path)
+
+
+@pytest.mark.parametrize('text', [
+    '[{"angle": 1}]', # Missing key
+    '[[0, 5, 1], [90, 5, 1]]', # Three numbers a row, used to be read as 3 vectors
+    '[[0, 5, 1, 2]]', # Used to be read as 2 vectors
+    '[[0, 5], [90]]',
+    '[0, 5]',
+    '[5]',
+])
+def test_json_that_is_not_pairs(tmp_path, text):
+    path = tmp_path / 'vectors.json'
+    path.write_text(text)
+    with pytest.raises(ValueError, match='pairs'):
+        read(path)
+
+
+def test_cli_reports_bad_files_and_keeps_going(tmp_path, capsys):
+    good = tmp_path / 'good.csv'
+    good.write_text('0,5\n90,5\n')
+    bad = tmp_path / 'bad.json'
+    bad.write_text('[[0, 5, 1]]')
+    missing = tmp_path / 'missing.csv'
+    assert main([str(missing), str(bad), str(good)]) == 1
+    output = capsys.readouterr()
+    assert f'{missing}: No such file or directory' in output.err
+    assert f'{bad}: expected a list of [angle, magnitude] pairs' in output.err
+    assert output.out.splitlines() == ['input,vectors,angle,magnitude', f'{good},2,45.0,7.0710678118654755']
+
+
+# Empty boxes from a GUI session (null) or NaN have no resultant, so they are an error instead of a NaN answer
+def test_empty_vectors(tmp_path):
+    path = tmp_path / 'vectors.csv'
+    path.write_text('0,5\nnan,5\n')
+    with pytest.raises(ValueError, match='line 2'):
+        read(path)
+    path = tmp_path / 'session.json'
+    path.write_text('{"version": 1, "vectors": [[0, 5], [90, null]], "checked": [false, false]}')
+    with pytest.raises(ValueError, match='vector 2 is empty'):
+        read(path)
@@ -0,0 +1,109 @@
+# VectorStore against a plain Python list of (id, magnitude, angle, checked) rows doing the same thing
+# Run from the repository root: python -m pytest tests
+import math
+import random
+
+import numpy as np
+import pytest
+
+from vector_store import VectorStore
+
+
+def check(store, reference):
+    assert len(store) == len(reference)
+    assert store.ids.tolist() == [row[0] for row in reference]
+    np.testing.assert_array_equal(store.magnitudes, [row[1] for row in reference])
+    np.testing.assert_array_equal(store.angles, [row[2] for row in reference])
+    assert store.checked.tolist() == [row[3] for row in reference]
+    for row, (vector_id, *_) in enumerate(reference):
+        assert store.row_of(vector_id) == row
+    ids = [row[0] for row in reference]
+    assert store.rows_of(ids).tolist() == list(range(len(reference)))
+
+
+def test_insert_appends_and_gives_new_ids():
+    store = VectorStore()
+    assert store.insert(magnitudes=[1, 2], angles=[10, 20]).tolist() == [0, 1]
+    assert store.insert().tolist() == [2]
+    assert store.insert(0, magnitudes=5, angles=50).tolist() == [3]
+    check(store, [(3, 5, 50, False), (0, 1, 10, False), (1, 2, 20, False), (2, math.nan, math.nan, False)])
+
+
+def test_duplicate_puts_unchecked_copies_after_their_rows():
+    store = VectorStore()
+    store.insert(magnitudes=[1, 2, 3], angles=[10, 20, 30])
+    store.checked[:] = [True, False, True]
+    assert store.duplicate([True, False, True]).tolist() == [3, 4]
+    check(store, [(0, 1, 10, True), (3, 1, 10, False), (1, 2, 20, False), (2, 3, 30, True), (4, 3, 30, False)])
+
+
+def test_delete_keeps_order_and_forgets_ids():
+    store = VectorStore()
+    store.insert(magnitudes=[1, 2, 3, 4], angles=[10, 20, 30, 40])
+    assert store.delete([False, True, False, True]) == 2
+    check(store, [(0, 1, 10, False), (2, 3, 30, False)])
+    with pytest.raises(KeyError):
+        store.row_of(1)
+    with pytest.raises(KeyError):
+        store.rows_of([0, 3])
+    assert store.delete([False, False]) == 0
+
+
+def test_ids_are_never_reused():
+    store = VectorStore()
+    store.insert(magnitudes=[1, 2], angles=[0, 0])
+    store.clear()
+    assert store.insert(magnitudes=3, angles=0).tolist() == [2]
+    with pytest.raises(KeyError):
+        store.row_of(0)
+
+
+def test_bad_masks_and_rows():
+    store = VectorStore()
+    store.insert(magnitudes=[1, 2], angles=[0, 0])
+    with pytest.raises(ValueError):
+        store.delete([True])
+    with pytest.raises(ValueError):
+        store.duplicate([True, False, True])
+    with pytest.raises(IndexError):
+        store.insert(-1)
+
+
+# Lots of random inserts, duplicates and deletes, growing past the starting capacity a few times
+@pytest.mark.parametrize('seed', range(20))
+def test_random_operations_match_a_list(seed):
+    rng = random.Random(seed)
+    store = VectorStore()
+    reference = []
+    next_id = 0
+    for _ in range(200):
+        operation = rng.choice(['append', 'insert', 'insert', 'duplicate', 'delete', 'check'])
+        if operation in ('append', 'insert'):
+            count = rng.randint(1, 5)
+            row = None if operation == 'append' else rng.randint(0, len(reference))
+            magnitudes = [rng.uniform(0, 100) for _ in range(count)]
+            angles = [rng.uniform(0, 360) for _ in range(count)]
+            new_ids = store.insert(row, magnitudes, angles)
+            assert new_ids.tolist() == list(range(next_id, next_id + count))
+            position = len(reference) if row is None else row
+            reference[position:position] = [(next_id + i, magnitudes[i], angles[i], False) for i in range(count)]
+            next_id += count
+        elif operation == 'duplicate':
+            mask = [rng.random() < 0.3 for _ in reference]
+            store.duplicate(mask)
+            copied = []
+            for row, copy in zip(reference, mask):
+                copied.append(row)
+                if copy:
+                    copied.append((next_id, row[1], row[2], False))
+                    next_id += 1
+            reference = copied
+        elif operation == 'delete':
+            mask = [rng.random() < 0.2 for _ in reference]
+            assert store.delete(mask) == sum(mask)
+            reference = [row for row, remove in zip(reference, mask) if not remove]
+        else:
+            checked = [rng.random() < 0.5 for _ in reference]
+            store.checked[:] = checked
+            reference = [(row[0], row[1], row[2], flag) for row, flag in zip(reference, checked)]
+        check(store, reference)
@@ -0,0 +1,210 @@
+# VEC: a small binary file format for lots of vectors
+# Text files spend most of their time being parsed. A VEC file is just a header and then the numbers exactly like
+# they sit in memory, so it can be memory mapped: NumPy reads the pages it needs straight from the file, nothing gets
+# parsed or copied up front, and files bigger than the RAM work fine chunk by chunk.
+#
+# Layout (everything little endian):
+#   bytes 0-63   header: b'VECF', version (uint16), layout (uint8), bytes per number (uint8), vector count (uint64),
+#                then zeros up to byte 64 so the numbers start nicely aligned
+#   column 1     count numbers: the angles (polar layout) or the X components (cartesian layout)
+#   column 2     count numbers: the magnitudes (polar) or the Y components (cartesian)
+# The numbers are float32 or float64.
+#
+# Convert a CSV/JSON/NPY file: python vecfile.py vectors.csv -o vectors.vec [--layout cartesian] [--dtype float32]
+import argparse
+import os
+import shutil
+import struct
+import sys
+
+import numpy as np
+
+from add import chunk_partials, combine_partials, resultant_angle_magnitude, vector_fission_batch
+from vector_io import DEFAULT_CHUNK_SIZE, FORMATS, describe_error, detect_format, read_chunks
+
+MAGIC = b'VECF'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBQ')
+HEADER_SIZE = 64
+LAYOUTS = ('polar', 'cartesian')
+DTYPES = {'float32': np.dtype('<f4'), 'float64': np.dtype('<f8')}
+
+
+def _dtype_for(itemsize):
+    for dtype in DTYPES.values():
+        if dtype.itemsize == itemsize:
+            return dtype
+    raise ValueError(f'Numbers must be 4 or 8 bytes, not {itemsize}')
+
+
+def _header(layout, dtype, count):
+    return HEADER.pack(MAGIC, VERSION, LAYOUTS.index(layout), dtype.itemsize, count).ljust(HEADER_SIZE, b'\0')
+
+
+# Writes a VEC file a chunk at a time, so the whole data set never has to be in memory
+# The first column goes into a temporary file next to path and the second one into another, which is appended when
+# the writer is closed (that is when the count is known and the header gets filled in). Only then is the finished
+# file swapped in for path, so a crash or an error halfway can't eat the old file (or a memory map of it)
+#   with VecWriter('vectors.vec') as writer:
+#       writer.write(angles, magnitudes)
+class VecWriter:
+    def __init__(self, path, layout='polar', dtype='float64'):
+        if layout not in LAYOUTS:
+            raise ValueError(f'Unknown layout {layout!r}, expected one of {LAYOUTS}')
+        if dtype not in DTYPES:
+            raise ValueError(f'Unknown dtype {dtype!r}, expected one of {tuple(DTYPES)}')
+        self.path = path
+        self.layout = layout
+        self.dtype = DTYPES[dtype]
+        self.count = 0
+        self._temporary_path = path + '.writing'
+        self._file = open(self._temporary_path, 'wb')
+        self._second_path = path + '.column2'
+        self._second_file = open(self._second_path, 'wb')
+        self._file.write(_header(layout, self.dtype, 0))
+
+    def write(self, first, second):
+        first = np.ascontiguousarray(first, dtype=self.dtype).ravel()
+        second = np.ascontiguousarray(second, dtype=self.dtype).ravel()
+        if first.shape != second.shape:
+            raise ValueError('Both columns must have the same length')
+        self._file.write(first.tobytes())
+        self._second_file.write(second.tobytes())
+        self.count += len(first)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._second_file.close()
+        with open(self._second_path, 'rb') as second_file:
+            shutil.copyfileobj(second_file, self._file, 1 << 20)
+        os.remove(self._second_path)
+        self._file.seek(0)
+        self._file.write(_header(self.layout, self.dtype, self.count))
+        self._file.close()
+        os.replace(self._temporary_path, self.path)
+
+    # Throws the half written file away
+    def abort(self):
+        self._file.close()
+        self._second_file.close()
+        for path in (self._temporary_path, self._second_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        if exception_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_vec(path, first, second, layout='polar', dtype='float64'):
+    with VecWriter(path, layout, dtype) as writer:
+        writer.write(first, second)
+
+
+# An open VEC file. columns are read only memory maps, slicing them doesn't copy anything
+class VecFile:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+            raise ValueError(f'{path}: not a VEC file')
+        _, version, layout, itemsize, count = HEADER.unpack_from(header)
+        if version > VERSION:
+            raise ValueError(f'{path}: VEC version {version} is newer than this program understands ({VERSION})')
+        if layout >= len(LAYOUTS):
+            raise ValueError(f'{path}: unknown layout {layout}')
+        self.layout = LAYOUTS[layout]
+        self.dtype = _dtype_for(itemsize)
+        self.count = count
+        if os.path.getsize(path) < HEADER_SIZE + 2 * count * itemsize:
+            raise ValueError(f'{path}: the file is shorter than its header says, it was probably cut off')
+        if count == 0:
+            self.columns = (np.empty(0, self.dtype), np.empty(0, self.dtype)) # memmap can't map 0 bytes
+        else:
+            self.columns = tuple(np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER_SIZE + column * count * itemsize,
+                                           shape=(count,)) for column in range(2))
+
+    def __len__(self):
+        return self.count
+
+    # (first, second) column slices of chunk_size vectors at a time
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE, start=0, stop=None):
+        stop = self.count if stop is None else stop
+        for chunk_start in range(start, stop, chunk_size):
+            chunk_stop = min(chunk_start + chunk_size, stop)
+            yield self.columns[0][chunk_start:chunk_stop], self.columns[1][chunk_start:chunk_stop]
+
+    # Angles and magnitudes of every vector as float64 arrays in memory (for the GUI)
+    def polar(self):
+        first, second = (np.asarray(column, dtype=np.float64) for column in self.columns)
+        if self.layout == 'cartesian':
+            return resultant_angle_magnitude(first, second)
+        return first, second
+
+
+def open_vec(path):
+    return VecFile(path)
+
+
+# Partial (x, y) sums of every chunk between start and stop (see chunk_partials in add.py). Polar chunks are split in
+# their own float type, cartesian chunks already are components
+def vec_partials(vec, start=0, stop=None, chunk_size=DEFAULT_CHUNK_SIZE, precision='fast'):
+    return chunk_partials(vec.chunks(chunk_size, start, stop), precision, polar=vec.layout == 'polar')
+
+
+# Resultant (angle, magnitude) of a whole VEC file, one chunk in memory at a time
+def resolve_vec(path, chunk_size=DEFAULT_CHUNK_SIZE, precision='fast'):
+    return combine_partials(vec_partials(open_vec(path), chunk_size=chunk_size, precision=precision))
+
+
+# Angles and magnitudes of every vector in a file as float64 arrays, for filling the GUI's vector list in one go
+# VEC files are read straight from the memory map, other formats go through vector_io
+def load_vectors(path, file_format=None):
+    file_format = file_format or detect_format(path)
+    if file_format == 'vec':
+        return open_vec(path).polar()
+    chunks = list(read_chunks(path, file_format))
+    rows = np.concatenate(chunks) if chunks else np.empty((0, 2))
+    return rows[:, 0].copy(), rows[:, 1].copy()
+
+
+# Streams any file vector_io can read (CSV, JSON, NPY, VEC) into a new VEC file. Returns how many vectors were written
+def convert_to_vec(source, destination, file_format=None, layout='polar', dtype='float64', chunk_size=DEFAULT_CHUNK_SIZE):
+    if source != '-' and os.path.exists(source) and os.path.exists(destination) and os.path.samefile(source, destination):
+        raise ValueError(f'{destination} is the file being converted, pick another output file')
+    with VecWriter(destination, layout, dtype) as writer:
+        for chunk in read_chunks(source, file_format, chunk_size):
+            if layout == 'cartesian':
+                writer.write(*vector_fission_batch(chunk))
+            else:
+                writer.write(chunk[:, 0], chunk[:, 1])
+        return writer.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert a CSV, JSON or NPY file of (angle, magnitude) rows into a VEC file')
+    parser.add_argument('input', help="file to convert, '-' reads CSV from stdin")
+    parser.add_argument('-o', '--output', required=True, help='VEC file to write')
+    parser.add_argument('-f', '--format', choices=FORMATS, help='input format. By default it is guessed from the file extension')
+    parser.add_argument('--layout', choices=LAYOUTS, default='polar', help='store angle/magnitude or X/Y columns (default: polar)')
+    parser.add_argument('--dtype', choices=list(DTYPES), default='float64', help='number type (default: float64)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help=f'vectors per chunk (default: {DEFAULT_CHUNK_SIZE})')
+    args = parser.parse_args(argv)
+    try:
+        count = convert_to_vec(args.input, args.output, args.format, args.layout, args.dtype, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(describe_error(args.input, e), file=sys.stderr)
+        return 1
+    print(f'Wrote {count} vectors to {args.output}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# Reading vectors from files for the command line solver
+# Every reader yields chunks: N x 2 float64 arrays of (angle, magnitude) rows
+# Nothing in here touches PyQt5 or matplotlib, so it can be used on machines without a screen
+import csv
+import io
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+FORMATS = ('csv', 'json', 'npy', 'vec')
+DEFAULT_CHUNK_SIZE = 65536
+
+
+# Figures out the format from the file extension. stdin ('-') has no extension so it needs to be given
+def detect_format(path, default='csv'):
+    if path == '-':
+        return default
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in FORMATS:
+        return extension
+    return default
+
+
+def _open_text(path):
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    return open(path, newline='', encoding='utf-8')
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+# CSV: either a header with 'angle' and 'magnitude' columns (any order, other columns are ignored)
+# or no header at all, then the first column is the angle and the second is the magnitude
+def read_csv_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    file = _open_text(path)
+    try:
+        yield from _csv_row_chunks(csv.reader(file), chunk_size)
+    finally:
+        if path != '-':
+            file.close()
+
+
+# Same for text that is already in memory, like something pasted from a spreadsheet. Spreadsheets copy cells with
+# tabs between them, so tabs (or semicolons) work as well as commas
+def read_csv_text(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    if '\t' in text:
+        delimiter = '\t'
+    elif ';' in text and ',' not in text:
+        delimiter = ';'
+    else:
+        delimiter = ','
+    return _csv_row_chunks(csv.reader(io.StringIO(text), delimiter=delimiter), chunk_size)
+
+
+# rows is a csv.reader, its line_num says which line of the file a bad row is on
+def _csv_row_chunks(rows, chunk_size):
+    angle_column, magnitude_column = 0, 1
+    first_row = True
+    chunk = []
+    for row in rows:
+        if not any(cell.strip() for cell in row):
+            continue
+        if first_row:
+            first_row = False
+            if not _is_number(row[0]): # Header row
+                header = [name.strip().lower() for name in row]
+                if 'angle' in header and 'magnitude' in header:
+                    angle_column = header.index('angle')
+                    magnitude_column = header.index('magnitude')
+                continue
+        if len(row) <= max(angle_column, magnitude_column):
+            raise ValueError(f'line {rows.line_num}: expected an angle and a magnitude, got {len(row)} column(s)')
+        try:
+            angle, magnitude = float(row[angle_column]), float(row[magnitude_column])
+        except ValueError:
+            raise ValueError(f'line {rows.line_num}: {row[angle_column]!r}, {row[magnitude_column]!r} is not an angle and a magnitude')
+        # NaN is an empty box in the GUI. It has no resultant, everything added to it would just be NaN too
+        if math.isnan(angle) or math.isnan(magnitude):
+            raise ValueError(f'line {rows.line_num}: the vector is empty (NaN)')
+        chunk.append((angle, magnitude))
+        if len(chunk) >= chunk_size:
+            yield np.array(chunk, dtype=np.float64)
+            chunk = []
+    if chunk:
+        yield np.array(chunk, dtype=np.float64)
+
+
+# JSON: a list of [angle, magnitude] pairs or of {"angle": ..., "magnitude": ...} objects,
+# optionally wrapped in {"vectors": [...]}
+def read_json_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    file = _open_text(path)
+    try:
+        data = json.load(file)
+    finally:
+        if path != '-':
+            file.close()
+    if isinstance(data, dict):
+        data = data.get('vectors', [])
+    message = 'expected a list of [angle, magnitude] pairs or {"angle", "magnitude"} objects'
+    try:
+        pairs = [(item['angle'], item['magnitude']) if isinstance(item, dict) else tuple(item) for item in data]
+        array = np.array(pairs, dtype=np.float64)
+    except (KeyError, TypeError, ValueError): # ValueError: rows of different lengths
+        raise ValueError(message)
+    # No reshape, that would quietly pair up the numbers of rows with 3 or 4 values the wrong way
+    if array.shape == (0,):
+        array = array.reshape(0, 2)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(message)
+    empty = np.flatnonzero(np.isnan(array).any(axis=1)) # null turns into NaN, like the empty boxes of a GUI session
+    if len(empty):
+        raise ValueError(f'vector {empty[0] + 1} is empty (null or NaN)')
+    for start in range(0, len(array), chunk_size):
+        yield array[start:start + chunk_size]
+
+
+# NPY: an N x 2 array of (angle, magnitude) rows. It is memory mapped, so only one chunk is in memory at a time
+def read_npy_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    if path == '-':
+        array = np.load(io.BytesIO(sys.stdin.buffer.read()))
+    else:
+        array = np.load(path, mmap_mode='r')
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f'{path}: expected an N x 2 array of (angle, magnitude) rows, got shape {array.shape}')
+    for start in range(0, len(array), chunk_size):
+        yield np.asarray(array[start:start + chunk_size], dtype=np.float64)
+
+
+# VEC: the binary format from vecfile.py. Memory mapped like NPY, and cartesian (X, Y) files get turned into
+# (angle, magnitude) rows here. To add them up, vecfile.resolve_vec is quicker because it skips that step
+def read_vec_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    from vecfile import open_vec # vecfile imports this module, so it can only be imported once it is needed
+    from add import resultant_angle_magnitude
+    if path == '-':
+        raise ValueError('VEC files are memory mapped, so they can not be read from stdin')
+    vec = open_vec(path)
+    for first, second in vec.chunks(chunk_size):
+        first = np.asarray(first, dtype=np.float64)
+        second = np.asarray(second, dtype=np.float64)
+        if vec.layout == 'cartesian':
+            first, second = resultant_angle_magnitude(first, second)
+        yield np.column_stack((first, second))
+
+
+READERS = {
+    'csv': read_csv_chunks,
+    'json': read_json_chunks,
+    'npy': read_npy_chunks,
+    'vec': read_vec_chunks,
+}
+
+
+# One line about what went wrong with a file, for printing: 'vectors.csv: line 3: ...'
+# Most errors from the readers above already start with the path, OSError says it in its own way
+def describe_error(path, error):
+    if isinstance(error, OSError) and error.strerror:
+        return f'{path}: {error.strerror}'
+    message = str(error)
+    return message if message.startswith(f'{path}:') else f'{path}: {message}'
+
+
+def read_chunks(path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    file_format = file_format or detect_format(path)
+    if file_format not in READERS:
+        raise ValueError(f'Unknown format {file_format!r}, expected one of {FORMATS}')
+    return READERS[file_format](path, chunk_size)
@@ -0,0 +1,175 @@
+# The data behind the vector list, without anything from Qt
+# Magnitudes, angles, checked flags and ids sit in contiguous NumPy arrays in list order. The arrays have spare room at
+# the end (like a Python list) so adding vectors doesn't copy everything every time.
+# Every vector gets an id when it is added. Ids never change and are never reused, so they can be used to find a
+# vector again after rows around it were added or removed.
+import math
+
+import numpy as np
+
+MINIMUM_CAPACITY = 16
+
+
+class VectorStore:
+    def __init__(self, capacity=MINIMUM_CAPACITY):
+        capacity = max(int(capacity), MINIMUM_CAPACITY)
+        self._magnitudes = np.empty(capacity, dtype=np.float64)
+        self._angles = np.empty(capacity, dtype=np.float64)
+        self._checked = np.zeros(capacity, dtype=bool)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+        self.next_id = 0
+
+        # id -> row. Rebuilt only when it is needed after rows moved, so lookups are O(1) most of the time
+        self._id_rows = np.full(capacity, -1, dtype=np.intp)
+        self._id_rows_valid = True
+
+    def __len__(self):
+        return self.size
+
+    # Views of the used part of the arrays. Writing into them writes into the store
+    @property
+    def magnitudes(self):
+        return self._magnitudes[:self.size]
+
+    @property
+    def angles(self):
+        return self._angles[:self.size]
+
+    @property
+    def checked(self):
+        return self._checked[:self.size]
+
+    @property
+    def ids(self):
+        return self._ids[:self.size]
+
+    def _reserve(self, size):
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('_magnitudes', '_angles', '_checked', '_ids'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    # Finding vectors by id
+    def _update_id_rows(self):
+        if self._id_rows_valid:
+            return
+        self._id_rows = np.full(max(self.next_id, MINIMUM_CAPACITY), -1, dtype=np.intp)
+        self._id_rows[self.ids] = np.arange(self.size)
+        self._id_rows_valid = True
+
+    # The lookup table has spare room too, so appending one vector at a time stays cheap
+    def _append_id_rows(self, first_row, new_ids):
+        if self.next_id > len(self._id_rows):
+            grown = np.full(max(self.next_id, 2 * len(self._id_rows)), -1, dtype=np.intp)
+            grown[:len(self._id_rows)] = self._id_rows
+            self._id_rows = grown
+        self._id_rows[new_ids] = np.arange(first_row, first_row + len(new_ids))
+
+    def row_of(self, vector_id):
+        self._update_id_rows()
+        if not 0 <= vector_id < len(self._id_rows) or self._id_rows[vector_id] < 0:
+            raise KeyError(f'No vector with id {vector_id}')
+        return int(self._id_rows[vector_id])
+
+    def rows_of(self, vector_ids):
+        self._update_id_rows()
+        vector_ids = np.asarray(vector_ids, dtype=np.int64)
+        if np.any((vector_ids < 0) | (vector_ids >= len(self._id_rows))) or np.any(self._id_rows[vector_ids] < 0):
+            raise KeyError('Some of the ids are not in the store')
+        return self._id_rows[vector_ids]
+
+    # Adding vectors
+
+    # Inserts any number of vectors before row (at the end by default). Missing values are NaN (empty boxes)
+    # Returns the ids of the new vectors
+    def insert(self, row=None, magnitudes=math.nan, angles=math.nan, count=None):
+        magnitudes = np.asarray(magnitudes, dtype=np.float64)
+        angles = np.asarray(angles, dtype=np.float64)
+        if count is None:
+            count = max(magnitudes.size, angles.size) if magnitudes.ndim or angles.ndim else 1
+        if row is None or row > self.size:
+            row = self.size
+        if row < 0:
+            raise IndexError(f'Row {row} is out of range')
+
+        self._reserve(self.size + count)
+        end = self.size + count
+        # Move everything after row back to make a gap (NumPy handles the overlap)
+        for array in (self._magnitudes, self._angles, self._checked, self._ids):
+            array[row + count:end] = array[row:self.size]
+
+        new_ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        self._magnitudes[row:row + count] = magnitudes
+        self._angles[row:row + count] = angles
+        self._checked[row:row + count] = False
+        self._ids[row:row + count] = new_ids
+
+        self.next_id += count
+        self.size = end
+        if row == end - count and self._id_rows_valid:
+            # Appending doesn't move any rows, so the lookup table only needs the new ids
+            self._append_id_rows(row, new_ids)
+        else:
+            self._id_rows_valid = False
+        return new_ids
+
+    # Puts a copy of every row where mask is True right after that row. Returns the ids of the copies
+    def duplicate(self, mask):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self.size,):
+            raise ValueError(f'Mask must have one entry per vector ({self.size})')
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        # Each row shows up once, or twice if it is being copied. Everything is gathered in one go
+        source_rows = np.repeat(np.arange(self.size), mask.astype(np.intp) + 1)
+        is_copy = np.zeros(len(source_rows), dtype=bool)
+        is_copy[np.flatnonzero(mask) + np.arange(1, count + 1)] = True
+
+        self._reserve(self.size + count)
+        size = len(source_rows)
+        for array in (self._magnitudes, self._angles, self._checked):
+            array[:size] = array[:self.size][source_rows]
+        self._ids[:size] = self._ids[:self.size][source_rows]
+        new_ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        self._ids[:size][is_copy] = new_ids
+        self._checked[:size][is_copy] = False # Copies start unchecked
+
+        self.next_id += count
+        self.size = size
+        self._id_rows_valid = False
+        return new_ids
+
+    # Removing vectors
+
+    # Removes every row where mask is True. The rows that are left keep their order
+    def delete(self, mask):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self.size,):
+            raise ValueError(f'Mask must have one entry per vector ({self.size})')
+        keep = ~mask
+        remaining = int(np.count_nonzero(keep))
+        if remaining == self.size:
+            return 0
+        for array in (self._magnitudes, self._angles, self._checked, self._ids):
+            array[:remaining] = array[:self.size][keep]
+        removed = self.size - remaining
+        self.size = remaining
+        self._id_rows_valid = False
+        return removed
+
+    def delete_rows(self, rows):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[np.asarray(rows, dtype=np.intp)] = True
+        return self.delete(mask)
+
+    def clear(self):
+        self.size = 0
+        self._id_rows_valid = False